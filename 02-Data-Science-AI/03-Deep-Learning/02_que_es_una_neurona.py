@@ -48,11 +48,26 @@ Matemáticamente:
     - b = sesgo (bias)
     - f = función de activación
 
+INSTALACIÓN:
+    pip install numpy   (solo para Neurona.predecir_lote)
+
 ================================================================================
 """
 
 import math
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# NumPy y activaciones.py solo hacen falta para Neurona.predecir_lote: el
+# resto del archivo es Python puro y funciona sin ellos
+try:
+    import numpy as np
+
+    # Las mismas activaciones sobre arrays enteros (ver activaciones.py)
+    from activaciones import obtener_activacion
+except ImportError:
+    np = None
 
 # ==============================================================================
 # PASO 1: SUMA PONDERADA (Sin función de activación)
@@ -194,7 +209,10 @@ def activacion_sigmoide(x):
 
     Problema: "Vanishing gradient" en valores extremos.
     """
-    return 1 / (1 + math.exp(-x))
+    # Para x muy negativo, math.exp(-x) desborda (OverflowError con x < -709).
+    # Usamos la identidad σ(x) = ½ · (1 + tanh(x/2)), la misma que
+    # activaciones.sigmoide: tanh nunca desborda, satura en ±1
+    return 0.5 * (1 + math.tanh(0.5 * x))
 
 
 def activacion_relu(x):
@@ -244,6 +262,18 @@ def activacion_tanh(x):
     return math.tanh(x)
 
 
+# Tabla de despacho: nombre → función. Añadir una activación nueva es
+# añadir una entrada, sin tocar la clase Neurona.
+# Es la versión ESCALAR (un número, solo math) de activaciones.ACTIVACIONES:
+# este archivo se puede ejecutar sin NumPy. Con NumPy, el ejemplo de
+# predecir_lote comprueba que las dos tablas dan los mismos valores.
+FUNCIONES_ACTIVACION = {
+    "escalon": activacion_escalon,
+    "sigmoide": activacion_sigmoide,
+    "relu": activacion_relu,
+    "tanh": activacion_tanh,
+}
+
 # Demostración de las funciones de activación
 print("\nComparación de funciones de activación:")
 print("-" * 50)
@@ -319,16 +349,11 @@ class Neurona:
         Returns:
             float: Valor después de la activación
         """
-        if self.funcion_activacion == "escalon":
-            return activacion_escalon(x)
-        elif self.funcion_activacion == "sigmoide":
-            return activacion_sigmoide(x)
-        elif self.funcion_activacion == "relu":
-            return activacion_relu(x)
-        elif self.funcion_activacion == "tanh":
-            return activacion_tanh(x)
-        else:
-            raise ValueError(f"Función desconocida: {self.funcion_activacion}")
+        try:
+            funcion = FUNCIONES_ACTIVACION[self.funcion_activacion]
+        except KeyError:
+            raise ValueError(f"Función desconocida: {self.funcion_activacion}") from None
+        return funcion(x)
 
     def calcular_salida(self, entradas):
         """
@@ -360,6 +385,49 @@ class Neurona:
 
         return self.ultima_salida
 
+    def predecir_lote(self, X, tam_bloque=65536, hilos=None):
+        """
+        Calcula la salida para MUCHAS muestras a la vez, sin bucle de Python.
+
+        Toda la suma ponderada de un bloque es un producto matriz-vector
+        (X · pesos) y la activación se aplica al array entero. No modifica
+        ultima_suma ni ultima_salida.
+
+        Args:
+            X: Array (n_muestras, n_entradas), una fila por muestra
+            tam_bloque: Filas por bloque, para acotar la memoria
+            hilos: Hilos que procesan bloques a la vez (NumPy libera el GIL)
+
+        Returns:
+            np.ndarray: (n_muestras,) con la salida de cada muestra
+        """
+        if np is None:
+            raise ImportError("predecir_lote necesita NumPy (pip install numpy) "
+                              "y activaciones.py")
+        X = np.asarray(X, dtype=float)
+        if X.ndim != 2 or X.shape[1] != self.n_entradas:
+            raise ValueError(
+                f"Se esperaba un array (n, {self.n_entradas}), se recibió {X.shape}"
+            )
+        activacion = obtener_activacion(self.funcion_activacion).funcion
+        pesos = np.asarray(self.pesos, dtype=float)
+        salida = np.empty(len(X))
+
+        def procesar(inicio):
+            bloque = salida[inicio:inicio + tam_bloque]
+            np.matmul(X[inicio:inicio + tam_bloque], pesos, out=bloque)
+            bloque += self.sesgo
+            activacion(bloque, out=bloque)
+
+        inicios = range(0, len(X), tam_bloque)
+        if hilos is None or hilos <= 1:
+            for inicio in inicios:
+                procesar(inicio)
+        else:
+            with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+                list(ejecutor.map(procesar, inicios))
+        return salida
+
     def __str__(self):
         """Representación en texto de la neurona."""
         return (
@@ -433,6 +501,34 @@ for caso in casos_and:
     print(f"  {caso[0]} AND {caso[1]} = {int(salida)}  (suma: {suma:.2f})")
 
 
+# Muchas muestras a la vez: predecir_lote
+if np is None:
+    print("\n(predecir_lote necesita NumPy: pip install numpy)")
+else:
+    print("\nLa misma neurona sobre 1.000.000 de combinaciones aleatorias:")
+    X_and = np.random.default_rng(0).integers(0, 2, size=(1_000_000, 2))
+
+    inicio = time.perf_counter()
+    salidas_bucle = [neurona_and.calcular_salida(fila) for fila in X_and[:100_000].tolist()]
+    t_bucle = (time.perf_counter() - inicio) * 10
+    inicio = time.perf_counter()
+    salidas_lote = neurona_and.predecir_lote(X_and)
+    t_lote = time.perf_counter() - inicio
+
+    assert salidas_lote[:100_000].tolist() == salidas_bucle
+    print(f"  calcular_salida en un bucle: {t_bucle:.2f} s (estimado)")
+    print(f"  predecir_lote:               {t_lote:.3f} s ({t_bucle / t_lote:.0f}x)")
+    print(f"  Salidas a 1: {int(salidas_lote.sum()):,} (≈ 1/4, solo el caso 1 AND 1)")
+
+    # Las activaciones escalares de este archivo y las de activaciones.py
+    # (las que usa predecir_lote) deben coincidir, también en los extremos
+    extremos = [-1000.0, -40.0, -2.0, -0.5, 0.0, 0.5, 2.0, 40.0, 1000.0]
+    for nombre, funcion in FUNCIONES_ACTIVACION.items():
+        vectorizada = obtener_activacion(nombre).funcion(np.array(extremos))
+        assert np.allclose([funcion(x) for x in extremos], vectorizada, rtol=0, atol=1e-15)
+    print(f"  {', '.join(FUNCIONES_ACTIVACION)}: mismos valores que activaciones.py")
+
+
 # ==============================================================================
 # LIMITACIONES DE UNA SOLA NEURONA
 # ==============================================================================
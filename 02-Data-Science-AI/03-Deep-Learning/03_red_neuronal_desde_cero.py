@@ -64,10 +64,9 @@ random.seed(42)
 
 def sigmoide(x):
     """Función sigmoide: σ(x) = 1 / (1 + e^(-x))"""
-    # Evitamos overflow para valores muy negativos
-    if x < -500:
-        return 0.0
-    return 1 / (1 + math.exp(-x))
+    # math.exp(-x) desborda con x < -709. La identidad ½ · (1 + tanh(x/2))
+    # es la misma función, nunca desborda y es la de activaciones.sigmoide
+    return 0.5 * (1 + math.tanh(0.5 * x))
 
 
 def derivada_sigmoide(x):
@@ -571,6 +570,7 @@ print("""
    - El error disminuye gradualmente
 
 PRÓXIMOS PASOS:
+- 07_red_neuronal_numpy.py: La misma red con una matriz de pesos por capa
 - 04_tensorflow_intro.py: Usar frameworks profesionales
 - 05_pytorch_intro.py: Alternativa popular para investigación
 - Estos frameworks hacen todo esto automáticamente y más rápido
@@ -0,0 +1,1358 @@
+"""
+================================================================================
+RED NEURONAL CON NUMPY: UNA MATRIZ DE PESOS POR CAPA
+================================================================================
+
+PREREQUISITOS:
+- 03_red_neuronal_desde_cero.py (Neurona, Capa, RedNeuronal)
+- activaciones.py (funciones de activación vectorizadas y sus derivadas)
+- 02-Data-Science-AI/01-Analisis-Datos (NumPy)
+
+================================================================================
+¿POR QUÉ ES LENTA LA VERSIÓN DESDE CERO?
+================================================================================
+
+En 03_red_neuronal_desde_cero.py cada Neurona guarda una LISTA de pesos y
+Capa.forward llama a neurona.forward una neurona cada vez:
+
+    for neurona in capa.neuronas:                 ← bucle de Python
+        sum(e * p for e, p in zip(entradas, pesos))  ← otro bucle de Python
+
+Con una capa de 1.000 neuronas y 1.000 entradas son 1.000.000 de
+multiplicaciones, cada una pasando por el intérprete (~50 ns cada una).
+
+================================================================================
+LA MISMA CAPA COMO MATRIZ
+================================================================================
+
+Los pesos de todas las neuronas de una capa forman una MATRIZ:
+
+                neurona 1  neurona 2  neurona 3
+    entrada 1 [   w₁₁        w₁₂        w₁₃   ]
+    entrada 2 [   w₂₁        w₂₂        w₂₃   ]     W: (n_entradas, n_neuronas)
+
+    sesgos    [   b₁         b₂         b₃    ]     b: (n_neuronas,)
+
+Y toda la capa es UNA operación:
+
+    salidas = σ(x · W + b)
+
+NumPy hace el producto matriz-vector en código compilado (BLAS), usando
+instrucciones SIMD y la caché de forma eficiente. Además, si x tiene
+varias filas (varias muestras), la MISMA línea procesa todas a la vez.
+
+La interfaz no cambia: RedNeuronal([2, 8, 4, 1]) y red.predecir(entrada).
+
+================================================================================
+BACKPROPAGATION POR MINI-LOTES
+================================================================================
+
+entrenar_red de la versión desde cero procesa UNA muestra cada vez, con
+bucles sobre neuronas y pesos. Con matrices, un MINI-LOTE de B muestras
+(X: B × n_entradas) se procesa entero en cada paso:
+
+    forward:   A₀ = X,   Aₗ = σ(Aₗ₋₁ · Wₗ + bₗ)      (guardamos cada Aₗ)
+    salida:    δ_L = (A_L - Y) ⊙ A_L ⊙ (1 - A_L)
+    ocultas:   δₗ  = (δₗ₊₁ · Wₗ₊₁ᵀ) ⊙ Aₗ ⊙ (1 - Aₗ)
+    gradiente: ∂Wₗ = Aₗ₋₁ᵀ · δₗ / B,   ∂bₗ = media de δₗ por columnas
+
+- σ'(z) = σ(z)(1 - σ(z)) se calcula con la ACTIVACIÓN YA GUARDADA Aₗ:
+  no hace falta volver a evaluar la sigmoide sobre la suma ponderada
+- Cada época BARAJAMOS las muestras: los lotes cambian y el descenso no
+  sigue siempre el mismo camino (evita ciclos y mejora la generalización)
+
+================================================================================
+OPTIMIZADORES
+================================================================================
+
+El descenso de gradiente simple (SGD) da pasos del mismo tamaño en todas
+las direcciones:  θ ← θ - η · g
+
+- MOMENTUM: acumula una "velocidad"; en valles alargados avanza más
+      v ← β·v + g;   θ ← θ - η·v
+- RMSPROP: divide cada paso por la magnitud RECIENTE de su gradiente, así
+  los pesos con gradientes pequeños avanzan tanto como los grandes
+      s ← ρ·s + (1-ρ)·g²;   θ ← θ - η·g / (√s + ε)
+- ADAM: momentum + RMSProp, con corrección del sesgo inicial (m y v
+  empiezan en 0)
+
+Todos guardan su ESTADO (v, s, m...) en arrays del mismo tamaño que cada
+parámetro, creados UNA vez. Cada paso actualiza estado y parámetros EN
+SITIO con out=: ningún array nuevo por paso (sin trabajo extra para el
+recolector de memoria ni copias).
+
+================================================================================
+FLOAT32 VS FLOAT64
+================================================================================
+
+La versión de listas guarda cada peso como un float de Python: 24 bytes
+del objeto + 8 del puntero en la lista = 32 bytes por parámetro. Un array
+float64 usa 8 bytes y uno float32, 4, contiguos en memoria.
+
+Con RedNeuronal(..., dtype=np.float32) pesos, activaciones, gradientes y
+estado del optimizador son float32:
+- La mitad de memoria que float64, y la mitad de bytes que mover de la RAM
+- BLAS procesa el doble de float32 por instrucción SIMD → en capas anchas
+  el producto de matrices va ~2 veces más rápido
+- 7 cifras significativas bastan para entrenar: el ruido del SGD es mucho
+  mayor que el error de redondeo
+
+================================================================================
+INFERENCIA POR BLOQUES
+================================================================================
+
+red.predecir(X) con X de 10 millones de filas crea de golpe las
+activaciones de TODAS las filas en cada capa (10M × 8 × 8 bytes = 640 MB
+solo la primera capa oculta). red.predecir_lote(X) recorre X en bloques
+de tam_bloque filas y escribe cada resultado en un único array de salida:
+la memoria extra queda acotada por el tamaño del bloque.
+
+Con hilos=N los bloques se reparten entre N hilos. NumPy libera el GIL
+durante los productos de matrices y las funciones universales, así que
+los hilos trabajan en paralelo sin copiar datos entre procesos.
+
+================================================================================
+PUNTOS DE CONTROL (CHECKPOINTS)
+================================================================================
+
+red.guardar(ruta) escribe un archivo binario compacto:
+
+    [ "REDNP" + versión | longitud | cabecera JSON | relleno | parámetros ]
+                                     arquitectura,            W₁ b₁ W₂ b₂ ...
+                                     dtype, activaciones      (bytes crudos)
+
+Los parámetros empiezan en un múltiplo de 64 bytes y van seguidos, sin
+compresión. Así RedNeuronal.cargar(ruta, mmap=True) no LEE los pesos: los
+proyecta en memoria con np.memmap. Los procesos que cargan el mismo
+archivo comparten las mismas páginas de la caché del sistema operativo
+(una sola copia en RAM) y cargar tarda lo mismo con 1 KB que con 1 GB.
+
+La escritura va a un archivo temporal que después se renombra: si el
+programa se interrumpe a mitad, el checkpoint anterior sigue intacto.
+
+================================================================================
+PARADA TEMPRANA Y TASA DE APRENDIZAJE VARIABLE
+================================================================================
+
+Con epocas=10000 fijas, casi todo el tiempo se gasta DESPUÉS de que el
+error deje de bajar. entrenar_red puede:
+
+- PARAR ANTES: con datos_validacion y paciencia=N, se detiene cuando el
+  error de validación lleva N épocas sin mejorar, y (restaurar_mejores)
+  vuelve a los pesos de la mejor época: los últimos suelen sobreajustar
+- CAMBIAR LA TASA por época (programacion=...):
+      TasaEscalonada(cada, factor)   η · factor^(época // cada)
+      TasaCoseno(epocas)             de η a 0 siguiendo medio coseno
+      ReducirEnMeseta(factor, pac.)  η · factor si el error se estanca
+  Pasos grandes al principio para avanzar rápido, pequeños al final para
+  asentarse en el mínimo
+
+El historial devuelto sigue siendo la lista de errores por época, con
+epocas_usadas, mejor_epoca, tiempo y tiempo_ahorrado como atributos.
+
+================================================================================
+VARIAS CLASES: SOFTMAX + ENTROPÍA CRUZADA
+================================================================================
+
+Con K clases, la capa de salida tiene K neuronas y activacion_salida=
+'softmax': pᵢ = e^zᵢ / Σⱼ e^zⱼ, probabilidades que suman 1. El error es la
+ENTROPÍA CRUZADA: -log p[clase correcta].
+
+La derivada de softmax + entropía cruzada JUNTAS respecto a z es:
+
+    δ = p - y          (y = vector one-hot de la clase correcta)
+
+Sin jacobiano de softmax, sin exponenciales extra. Y como y solo tiene un
+1, no hace falta construir la matriz one-hot (n × K): con las etiquetas
+enteras basta restar 1 en una posición de cada fila:
+
+    delta[np.arange(n), etiquetas] -= 1
+
+Una red con K salidas entrena las K clases a la vez, en vez de K redes
+"una contra el resto".
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import json
+import math
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Activaciones vectorizadas, estables y con derivada (ver activaciones.py)
+from activaciones import obtener_activacion
+
+# ==============================================================================
+# CAPA: MATRIZ DE PESOS + VECTOR DE SESGOS
+# ==============================================================================
+
+class Capa:
+    """
+    Capa densa: salidas = f(entradas · W + b).
+
+    Guarda las entradas y las salidas del último forward para poder hacer
+    backpropagation. La activación se aplica EN SITIO sobre la suma
+    ponderada: las derivadas solo necesitan la salida.
+    """
+
+    def __init__(self, n_neuronas, n_entradas_por_neurona, rng=None, activacion='sigmoide',
+                 dtype=np.float64):
+        """
+        Args:
+            n_neuronas: Cuántas neuronas tendrá esta capa
+            n_entradas_por_neurona: Cuántas entradas recibe cada neurona
+            rng: np.random.Generator (por defecto, uno nuevo)
+            activacion: Nombre en activaciones.ACTIVACIONES
+            dtype: np.float64 o np.float32 (pesos, activaciones y gradientes)
+        """
+        self.activacion = obtener_activacion(activacion)
+        rng = rng if rng is not None else np.random.default_rng()
+
+        # Misma inicialización Xavier/Glorot que Neurona (los mismos valores
+        # con cualquier dtype, redondeados)
+        limite = math.sqrt(6 / (n_entradas_por_neurona + 1))
+        self.pesos = rng.uniform(-limite, limite, size=(n_entradas_por_neurona, n_neuronas)
+                                 ).astype(dtype)
+        self.sesgos = rng.uniform(-limite, limite, size=n_neuronas).astype(dtype)
+
+        # Valores guardados para backpropagation
+        self.entradas = None
+        self.salidas = None
+
+    @classmethod
+    def desde_arrays(cls, pesos, sesgos, activacion='sigmoide'):
+        """Capa con los pesos y sesgos dados (sin copiarlos)."""
+        capa = cls.__new__(cls)
+        capa.activacion = obtener_activacion(activacion)
+        capa.pesos = pesos
+        capa.sesgos = sesgos
+        capa.entradas = None
+        capa.salidas = None
+        return capa
+
+    @property
+    def n_neuronas(self):
+        return self.pesos.shape[1]
+
+    def forward(self, entradas):
+        """
+        Propaga una muestra (vector) o un lote (matriz, una fila por muestra).
+
+        Returns:
+            np.ndarray: (n_neuronas,) o (n_muestras, n_neuronas)
+        """
+        self.entradas = np.asarray(entradas, dtype=self.pesos.dtype)
+        self.salidas = self.aplicar(self.entradas)
+        return self.salidas
+
+    def aplicar(self, entradas):
+        """Como forward, pero sin guardar nada: se puede llamar desde varios hilos."""
+        suma_ponderada = entradas @ self.pesos
+        suma_ponderada += self.sesgos
+        return self.activacion.funcion(suma_ponderada, out=suma_ponderada)
+
+    def __str__(self):
+        return (f"Capa({self.n_neuronas} neuronas, pesos {self.pesos.shape}, "
+                f"{self.activacion.nombre})")
+
+
+# ==============================================================================
+# RED NEURONAL
+# ==============================================================================
+
+# Formato de guardar()/cargar(): nombre + versión, y alineación de los datos
+MAGIA_CHECKPOINT = b'REDNP\x00\x00\x01'
+ALINEACION_CHECKPOINT = 64
+
+
+def entropia_cruzada(probabilidades, Y):
+    """
+    Media de -log p(clase correcta).
+
+    Args:
+        probabilidades: Salida de softmax (n, K)
+        Y: Etiquetas enteras (n,) u one-hot / probabilidades (n, K)
+    """
+    # Un p = 0 (underflow de e^(z - máx)) daría log 0 = -inf
+    minimo = np.finfo(probabilidades.dtype).tiny
+    if Y.ndim == 1:
+        correctas = probabilidades[np.arange(len(Y)), Y]
+        return -float(np.log(np.maximum(correctas, minimo)).sum()) / len(Y)
+    log_p = np.log(np.maximum(probabilidades, minimo))
+    return -float(np.einsum('ij,ij->', Y, log_p)) / len(Y)
+
+
+def _formas_parametros(arquitectura):
+    """Formas de [W₁, b₁, W₂, b₂, ...], el orden de parametros()."""
+    return [forma for n_entradas, n_neuronas in zip(arquitectura, arquitectura[1:])
+            for forma in ((n_entradas, n_neuronas), (n_neuronas,))]
+
+
+def _inicio_parametros(longitud_cabecera):
+    """Posición (múltiplo de 64) donde empiezan los parámetros."""
+    fin_cabecera = len(MAGIA_CHECKPOINT) + 8 + longitud_cabecera
+    return -(-fin_cabecera // ALINEACION_CHECKPOINT) * ALINEACION_CHECKPOINT
+
+
+class RedNeuronal:
+    """
+    Perceptrón multicapa con una matriz de pesos por capa.
+
+    Misma interfaz que la versión de 03_red_neuronal_desde_cero.py:
+        red = RedNeuronal([2, 8, 4, 1])
+        red.predecir([0.3, 0.7])       → array([0.52...])
+    """
+
+    def __init__(self, arquitectura, semilla=None, activacion='sigmoide',
+                 activacion_salida='sigmoide', dtype=np.float64):
+        """
+        Args:
+            arquitectura: Neuronas por capa; el primero son las entradas
+            semilla: Semilla para inicializar los pesos (reproducible)
+            activacion: Activación de las capas ocultas
+            activacion_salida: Activación de la capa de salida
+            dtype: np.float64 o np.float32 para toda la red
+        """
+        self.arquitectura = arquitectura
+        self.dtype = np.dtype(dtype)
+        if self.dtype.kind != 'f':
+            raise ValueError(f"dtype debe ser de coma flotante, no {self.dtype}")
+        rng = np.random.default_rng(semilla)
+        n_capas = len(arquitectura) - 1
+        self.capas = [Capa(arquitectura[i], arquitectura[i - 1], rng,
+                           activacion_salida if i == n_capas else activacion, self.dtype)
+                      for i in range(1, len(arquitectura))]
+
+        print(f"Red creada con arquitectura: {arquitectura}")
+        print(f"Total de capas (sin contar entrada): {len(self.capas)}")
+
+    def forward(self, entradas):
+        """Propaga una muestra o un lote por todas las capas."""
+        salida_actual = entradas
+        for capa in self.capas:
+            salida_actual = capa.forward(salida_actual)
+        return salida_actual
+
+    def predecir(self, entradas):
+        """
+        Realiza una predicción (alias más intuitivo de forward).
+
+        Returns:
+            np.ndarray: Salidas de la última capa
+        """
+        return self.forward(entradas)
+
+    def predecir_lote(self, X, tam_bloque=4096, hilos=None):
+        """
+        Predicciones de un array grande, por bloques de filas.
+
+        Args:
+            X: (n_muestras, n_entradas)
+            tam_bloque: Filas por bloque (acota la memoria intermedia)
+            hilos: Hilos que procesan bloques a la vez (None = solo este)
+
+        Returns:
+            np.ndarray: (n_muestras, n_salidas) en el dtype de la red
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        if X.ndim != 2 or X.shape[1] != self.arquitectura[0]:
+            raise ValueError(f"Se esperaba un array (n, {self.arquitectura[0]}), "
+                             f"se recibió {X.shape}")
+        salida = np.empty((len(X), self.arquitectura[-1]), dtype=self.dtype)
+
+        def procesar(inicio):
+            bloque = X[inicio:inicio + tam_bloque]
+            for capa in self.capas:
+                bloque = capa.aplicar(bloque)
+            salida[inicio:inicio + tam_bloque] = bloque
+
+        inicios = range(0, len(X), tam_bloque)
+        if hilos is None or hilos <= 1:
+            for inicio in inicios:
+                procesar(inicio)
+        else:
+            with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+                # list() para que salten aquí las excepciones de los hilos
+                list(ejecutor.map(procesar, inicios))
+        return salida
+
+    @property
+    def multiclase(self):
+        """True si la salida es softmax (y el error, entropía cruzada)."""
+        return self.capas[-1].activacion.nombre == 'softmax'
+
+    def n_parametros(self):
+        return sum(capa.pesos.size + capa.sesgos.size for capa in self.capas)
+
+    def bytes_parametros(self):
+        return sum(p.nbytes for p in self.parametros())
+
+    def parametros(self):
+        """Lista plana [W₁, b₁, W₂, b₂, ...] (los mismos arrays, no copias)."""
+        return [p for capa in self.capas for p in (capa.pesos, capa.sesgos)]
+
+    def guardar(self, ruta, **metadatos):
+        """
+        Guarda arquitectura, dtype, activaciones y parámetros en `ruta`.
+
+        Args:
+            ruta: Archivo de destino (se reemplaza de forma atómica)
+            **metadatos: Datos JSON extra (época, error...), en red.metadatos al cargar
+        """
+        cabecera = json.dumps({
+            'arquitectura': list(self.arquitectura),
+            'dtype': self.dtype.str,
+            'activaciones': [capa.activacion.nombre for capa in self.capas],
+            'metadatos': metadatos,
+        }).encode('utf-8')
+        temporal = f"{ruta}.tmp"
+        with open(temporal, 'wb') as archivo:
+            archivo.write(MAGIA_CHECKPOINT)
+            archivo.write(struct.pack('<Q', len(cabecera)))
+            archivo.write(cabecera)
+            archivo.write(bytes(_inicio_parametros(len(cabecera)) - archivo.tell()))
+            for parametro in self.parametros():
+                archivo.write(np.ascontiguousarray(parametro).data)
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta, mmap=False):
+        """
+        Reconstruye una red guardada con guardar().
+
+        Args:
+            ruta: Archivo del checkpoint
+            mmap: Proyectar los parámetros en memoria (solo lectura, para
+                  inferencia) en vez de leerlos
+
+        Returns:
+            RedNeuronal: con red.metadatos = los metadatos guardados
+        """
+        with open(ruta, 'rb') as archivo:
+            if archivo.read(len(MAGIA_CHECKPOINT)) != MAGIA_CHECKPOINT:
+                raise ValueError(f"{ruta} no es un checkpoint de RedNeuronal")
+            (longitud,) = struct.unpack('<Q', archivo.read(8))
+            cabecera = json.loads(archivo.read(longitud))
+
+        arquitectura = cabecera['arquitectura']
+        dtype = np.dtype(cabecera['dtype'])
+        n_valores = sum(math.prod(forma) for forma in _formas_parametros(arquitectura))
+
+        # Un único buffer; cada parámetro es una vista sobre su tramo
+        inicio = _inicio_parametros(longitud)
+        if mmap:
+            datos = np.memmap(ruta, dtype=dtype, mode='r', offset=inicio, shape=(n_valores,))
+        else:
+            datos = np.fromfile(ruta, dtype=dtype, count=n_valores, offset=inicio)
+        if len(datos) != n_valores:
+            raise ValueError(f"{ruta} está truncado")
+
+        red = cls.desde_plano(datos, arquitectura, cabecera['activaciones'])
+        red.metadatos = cabecera['metadatos']
+        return red
+
+    @classmethod
+    def desde_plano(cls, datos, arquitectura, activaciones):
+        """
+        Red cuyos parámetros son VISTAS de un único vector plano, en el
+        orden de parametros(): escribir en la red escribe en `datos`.
+
+        Args:
+            datos: Vector 1-D (array, memmap, memoria compartida...)
+            arquitectura: Neuronas por capa
+            activaciones: Nombre de la activación de cada capa
+        """
+        parametros = []
+        desplazamiento = 0
+        for forma in _formas_parametros(arquitectura):
+            tamaño = math.prod(forma)
+            parametros.append(datos[desplazamiento:desplazamiento + tamaño].reshape(forma))
+            desplazamiento += tamaño
+        if desplazamiento != len(datos):
+            raise ValueError(f"Se esperaban {desplazamiento} parámetros, hay {len(datos)}")
+
+        # Sin __init__: ni pesos aleatorios que tirar ni mensajes en cada proceso
+        red = cls.__new__(cls)
+        red.arquitectura = list(arquitectura)
+        red.dtype = datos.dtype
+        red.capas = [Capa.desde_arrays(pesos, sesgos, nombre) for pesos, sesgos, nombre
+                     in zip(parametros[0::2], parametros[1::2], activaciones)]
+        red.metadatos = {}
+        return red
+
+    def gradientes(self, X, Y):
+        """
+        Forward + backpropagation de un lote.
+
+        Error (media sobre muestras):
+            salida softmax:  entropía cruzada, -log p[clase correcta]
+            resto:           Σ (y - salida)²  (el gradiente es el de la mitad)
+
+        Args:
+            X: (n_muestras, n_entradas)
+            Y: (n_muestras, n_salidas), o etiquetas enteras (n_muestras,)
+               si la red es multiclase
+
+        Returns:
+            tuple: (error, [(∂W, ∂b) por capa])
+        """
+        salida = self.forward(X)
+        if self.multiclase:
+            Y = Y if Y.ndim == 1 else np.asarray(Y, dtype=self.dtype)
+            error = entropia_cruzada(salida, Y)
+            # δ = p - y; con etiquetas, en sitio sobre la salida (el
+            # backward ya no la necesita) y sin matriz one-hot
+            if Y.ndim == 1:
+                delta = salida
+                delta[np.arange(len(Y)), Y] -= 1
+            else:
+                delta = salida - Y
+        else:
+            # Y en el dtype de la red: si no, float32 - float64 daría float64
+            diferencia = salida - np.asarray(Y, dtype=self.dtype)
+            error = float(np.einsum('ij,ij->', diferencia, diferencia)) / len(X)
+            # Delta de la capa de salida, con la activación guardada en forward
+            delta = diferencia * self.capas[-1].activacion.derivada(salida)
+
+        gradientes = []
+        for l in range(len(self.capas) - 1, -1, -1):
+            capa = self.capas[l]
+            gradientes.append((capa.entradas.T @ delta / len(X), delta.mean(axis=0)))
+            if l > 0:
+                anterior = self.capas[l - 1]
+                delta = (delta @ capa.pesos.T) * anterior.activacion.derivada(anterior.salidas)
+        gradientes.reverse()
+        return error, gradientes
+
+
+# ==============================================================================
+# OPTIMIZADORES CON ACTUALIZACIÓN EN SITIO
+# ==============================================================================
+
+class Optimizador:
+    """
+    Interfaz común: paso(parametros, gradientes) modifica los parámetros
+    en sitio. El estado se reserva en el primer paso, uno por parámetro.
+
+    `tasa` es un atributo normal: se puede cambiar entre pasos.
+    """
+
+    n_estados = 0
+
+    def __init__(self, tasa):
+        self.tasa = tasa
+        self.estado = None      # [[buffer, ...] por parámetro]
+        self.t = 0              # pasos dados
+
+    def _reservar(self, parametros):
+        # El primer buffer es siempre un temporal para el paso
+        self.estado = [[np.zeros_like(p) for _ in range(1 + self.n_estados)]
+                       for p in parametros]
+
+    def paso(self, parametros, gradientes):
+        if self.estado is None:
+            self._reservar(parametros)
+        self.t += 1
+        for p, g, estado in zip(parametros, gradientes, self.estado):
+            self._actualizar(p, g, *estado)
+
+    def _actualizar(self, p, g, tmp, *estado):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}(tasa={self.tasa})"
+
+
+class SGD(Optimizador):
+    """θ ← θ - η·g"""
+
+    def _actualizar(self, p, g, tmp):
+        np.multiply(g, self.tasa, out=tmp)
+        np.subtract(p, tmp, out=p)
+
+
+class Momentum(Optimizador):
+    """v ← β·v + g;  θ ← θ - η·v"""
+
+    n_estados = 1
+
+    def __init__(self, tasa=0.1, beta=0.9):
+        super().__init__(tasa)
+        self.beta = beta
+
+    def _actualizar(self, p, g, tmp, v):
+        np.multiply(v, self.beta, out=v)
+        np.add(v, g, out=v)
+        np.multiply(v, self.tasa, out=tmp)
+        np.subtract(p, tmp, out=p)
+
+
+class RMSProp(Optimizador):
+    """s ← ρ·s + (1-ρ)·g²;  θ ← θ - η·g / (√s + ε)"""
+
+    n_estados = 1
+
+    def __init__(self, tasa=0.01, rho=0.9, epsilon=1e-8):
+        super().__init__(tasa)
+        self.rho = rho
+        self.epsilon = epsilon
+
+    def _actualizar(self, p, g, tmp, s):
+        np.multiply(g, g, out=tmp)
+        np.multiply(tmp, 1 - self.rho, out=tmp)
+        np.multiply(s, self.rho, out=s)
+        np.add(s, tmp, out=s)
+        np.sqrt(s, out=tmp)
+        np.add(tmp, self.epsilon, out=tmp)
+        np.divide(g, tmp, out=tmp)
+        np.multiply(tmp, self.tasa, out=tmp)
+        np.subtract(p, tmp, out=p)
+
+
+class Adam(Optimizador):
+    """
+    m ← β₁·m + (1-β₁)·g;   v ← β₂·v + (1-β₂)·g²
+    θ ← θ - η · m̂ / (√v̂ + ε),   con m̂ = m/(1-β₁ᵗ), v̂ = v/(1-β₂ᵗ)
+    """
+
+    n_estados = 2
+
+    def __init__(self, tasa=0.01, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        super().__init__(tasa)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+
+    def paso(self, parametros, gradientes):
+        # La corrección del sesgo es un escalar por paso: se calcula una vez
+        t = self.t + 1
+        self._tasa_t = self.tasa * math.sqrt(1 - self.beta2 ** t) / (1 - self.beta1 ** t)
+        self._epsilon_t = self.epsilon * math.sqrt(1 - self.beta2 ** t)
+        super().paso(parametros, gradientes)
+
+    def _actualizar(self, p, g, tmp, m, v):
+        np.multiply(m, self.beta1, out=m)
+        np.multiply(g, 1 - self.beta1, out=tmp)
+        np.add(m, tmp, out=m)
+
+        np.multiply(v, self.beta2, out=v)
+        np.multiply(g, g, out=tmp)
+        np.multiply(tmp, 1 - self.beta2, out=tmp)
+        np.add(v, tmp, out=v)
+
+        np.sqrt(v, out=tmp)
+        np.add(tmp, self._epsilon_t, out=tmp)
+        np.divide(m, tmp, out=tmp)
+        np.multiply(tmp, self._tasa_t, out=tmp)
+        np.subtract(p, tmp, out=p)
+
+
+# ==============================================================================
+# PROGRAMACIÓN DE LA TASA DE APRENDIZAJE
+# ==============================================================================
+
+class TasaEscalonada:
+    """Multiplica la tasa por `factor` cada `cada` épocas."""
+
+    def __init__(self, cada, factor=0.5):
+        self.cada = cada
+        self.factor = factor
+
+    def __call__(self, epoca, tasa_inicial, error):
+        return tasa_inicial * self.factor ** (epoca // self.cada)
+
+    def __repr__(self):
+        return f"TasaEscalonada(cada={self.cada}, factor={self.factor})"
+
+
+class TasaCoseno:
+    """Baja la tasa de tasa_inicial a tasa_minima siguiendo medio coseno."""
+
+    def __init__(self, epocas, tasa_minima=0.0):
+        self.epocas = epocas
+        self.tasa_minima = tasa_minima
+
+    def __call__(self, epoca, tasa_inicial, error):
+        progreso = min(epoca, self.epocas) / self.epocas
+        return (self.tasa_minima + (tasa_inicial - self.tasa_minima)
+                * 0.5 * (1 + math.cos(math.pi * progreso)))
+
+    def __repr__(self):
+        return f"TasaCoseno(epocas={self.epocas})"
+
+
+class ReducirEnMeseta:
+    """
+    Multiplica la tasa por `factor` cuando el error no mejora en
+    `paciencia` épocas (nunca por debajo de tasa_minima).
+    """
+
+    def __init__(self, factor=0.5, paciencia=10, tasa_minima=1e-6):
+        self.factor = factor
+        self.paciencia = paciencia
+        self.tasa_minima = tasa_minima
+        self.tasa = None
+        self.mejor_error = math.inf
+        self.epocas_sin_mejora = 0
+
+    def __call__(self, epoca, tasa_inicial, error):
+        if self.tasa is None:
+            self.tasa = tasa_inicial
+        if error < self.mejor_error:
+            self.mejor_error = error
+            self.epocas_sin_mejora = 0
+        else:
+            self.epocas_sin_mejora += 1
+            if self.epocas_sin_mejora >= self.paciencia:
+                self.tasa = max(self.tasa * self.factor, self.tasa_minima)
+                self.epocas_sin_mejora = 0
+        return self.tasa
+
+    def __repr__(self):
+        return f"ReducirEnMeseta(factor={self.factor}, paciencia={self.paciencia})"
+
+
+# ==============================================================================
+# VERSIÓN DE LISTAS (de 03_red_neuronal_desde_cero.py), PARA COMPARAR
+# ==============================================================================
+
+def sigmoide_escalar(x):
+    """Función sigmoide: σ(x) = 1 / (1 + e^(-x)), como en 03 y activaciones.py"""
+    return 0.5 * (1 + math.tanh(0.5 * x))
+
+
+class CapaListas:
+    """Capa de 03_red_neuronal_desde_cero.py: una lista de pesos por neurona."""
+
+    def __init__(self, pesos, sesgos):
+        # pesos[i] = lista de pesos de la neurona i
+        self.pesos = pesos
+        self.sesgos = sesgos
+
+    @classmethod
+    def desde_capa(cls, capa):
+        """Copia los pesos de una Capa de matrices (columna j → neurona j)."""
+        return cls(capa.pesos.T.tolist(), capa.sesgos.tolist())
+
+    def forward(self, entradas):
+        return [sigmoide_escalar(sum(e * p for e, p in zip(entradas, pesos)) + sesgo)
+                for pesos, sesgo in zip(self.pesos, self.sesgos)]
+
+
+# ==============================================================================
+# ENTRENAMIENTO POR MINI-LOTES
+# ==============================================================================
+
+def como_arrays(datos, etiquetas=False):
+    """
+    Acepta (X, Y) o la lista [(entrada, esperado), ...] de la versión
+    desde cero. Devuelve X (n, n_entradas) e Y (n, n_salidas).
+
+    Con etiquetas=True, un Y de enteros (n,) se devuelve tal cual (intp):
+    son las clases de una red multiclase.
+    """
+    if isinstance(datos, tuple) and len(datos) == 2 and isinstance(datos[0], np.ndarray):
+        X, Y = datos
+    else:
+        X = np.array([entrada for entrada, _ in datos], dtype=float)
+        Y = np.array([esperado for _, esperado in datos])
+    Y = np.asarray(Y)
+    if etiquetas and Y.ndim == 1 and Y.dtype.kind in 'iu':
+        return X, Y.astype(np.intp, copy=False)
+    Y = Y.astype(float, copy=False)
+    return X, Y.reshape(len(Y), -1)
+
+
+def _al_dtype(red, X, Y):
+    """X (y las Y no enteras) en el dtype de la red."""
+    Y = Y if Y.dtype.kind in 'iu' else Y.astype(red.dtype, copy=False)
+    return X.astype(red.dtype, copy=False), Y
+
+
+class Historial(list):
+    """
+    Error de entrenamiento por época (una lista, como antes) más el resumen:
+
+        validacion       error de validación por época (si hay datos)
+        tasas            tasa de aprendizaje usada en cada época
+        epocas_usadas    épocas realmente entrenadas
+        mejor_epoca      época con menor error vigilado (1 = la primera)
+        tiempo           segundos de entrenamiento
+        tiempo_ahorrado  estimación de lo que habrían costado las épocas
+                         que la parada temprana se saltó
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.validacion = []
+        self.tasas = []
+        self.epocas_usadas = 0
+        self.mejor_epoca = None
+        self.tiempo = 0.0
+        self.tiempo_ahorrado = 0.0
+
+
+def error_medio(red, X, Y):
+    """El mismo error que entrenar_red, sin tocar la caché de forward."""
+    salida = red.predecir_lote(X)
+    if red.multiclase:
+        return entropia_cruzada(salida, Y)
+    diferencia = salida - Y
+    return float(np.einsum('ij,ij->', diferencia, diferencia)) / len(X)
+
+
+def entrenar_red(red, datos, epocas=10000, tasa_aprendizaje=0.5, batch_size=32,
+                 barajar=True, semilla=None, mostrar_cada=None, optimizador=None,
+                 checkpoint_cada=None, ruta_checkpoint=None, datos_validacion=None,
+                 paciencia=None, delta_minimo=0.0, restaurar_mejores=None,
+                 programacion=None):
+    """
+    Entrena la red con backpropagation vectorizada por mini-lotes.
+
+    Args:
+        red: RedNeuronal a entrenar
+        datos: (X, Y) en arrays, o lista de tuplas (entrada, esperado)
+        epocas: Pasadas completas sobre los datos (máximo, con paciencia)
+        tasa_aprendizaje: Tamaño de los ajustes (learning rate)
+        batch_size: Muestras por actualización (1 = como la versión desde cero)
+        barajar: Cambiar el orden de las muestras en cada época
+        semilla: Semilla del barajado
+        mostrar_cada: Imprimir el error cada N épocas (por defecto, epocas // 5)
+        optimizador: SGD, Momentum, RMSProp o Adam (por defecto,
+                     SGD(tasa_aprendizaje))
+        checkpoint_cada: Guardar la red cada N épocas (y al terminar)
+        ruta_checkpoint: Archivo donde guardarla (se sobrescribe; el estado
+                         del optimizador no se guarda)
+        datos_validacion: (X, Y) para vigilar el error fuera del entrenamiento;
+                          sin ellos se vigila el error de entrenamiento
+        paciencia: Parar tras N épocas sin mejorar el error vigilado
+        delta_minimo: Mejora mínima que cuenta como mejora
+        restaurar_mejores: Al terminar, volver a los pesos de la mejor época
+                           (por defecto, solo con datos_validacion: sin
+                           ellos el error vigilado es la media de los
+                           lotes, calculada con pesos que ya cambiaron)
+        programacion: TasaEscalonada, TasaCoseno o ReducirEnMeseta
+
+    Returns:
+        Historial: lista del error medio por época, con el resumen
+    """
+    if checkpoint_cada and not ruta_checkpoint:
+        raise ValueError("checkpoint_cada necesita ruta_checkpoint")
+    # Una sola conversión al dtype de la red, no una por lote
+    X, Y = _al_dtype(red, *como_arrays(datos, etiquetas=red.multiclase))
+    if datos_validacion is not None:
+        X_val, Y_val = _al_dtype(red, *como_arrays(datos_validacion, etiquetas=red.multiclase))
+    rng = np.random.default_rng(semilla)
+    mostrar_cada = mostrar_cada or max(1, epocas // 5)
+    n = len(X)
+    historial = Historial()
+    optimizador = optimizador if optimizador is not None else SGD(tasa_aprendizaje)
+    tasa_inicial = optimizador.tasa
+    parametros = red.parametros()
+    if restaurar_mejores is None:
+        restaurar_mejores = datos_validacion is not None
+
+    # Copia de los mejores pesos, reservada una vez y actualizada en sitio
+    mejores = [np.empty_like(p) for p in parametros] if restaurar_mejores else None
+    mejor_error = math.inf
+    epocas_sin_mejora = 0
+    inicio_entrenamiento = time.perf_counter()
+
+    for epoca in range(epocas):
+        historial.tasas.append(optimizador.tasa)
+        if barajar:
+            orden = rng.permutation(n)
+            X_epoca, Y_epoca = X[orden], Y[orden]
+        else:
+            X_epoca, Y_epoca = X, Y
+
+        error_total = 0.0
+        for inicio in range(0, n, batch_size):
+            X_lote = X_epoca[inicio:inicio + batch_size]
+            Y_lote = Y_epoca[inicio:inicio + batch_size]
+            error, gradientes = red.gradientes(X_lote, Y_lote)
+            error_total += error * len(X_lote)
+            optimizador.paso(parametros, [g for par in gradientes for g in par])
+
+        # Mismo error que la versión desde cero: Σ (esperado - salida)² por
+        # muestra (o la entropía cruzada si la red es multiclase)
+        error_promedio = error_total / n
+        historial.append(error_promedio)
+        vigilado = error_promedio
+        if datos_validacion is not None:
+            vigilado = error_medio(red, X_val, Y_val)
+            historial.validacion.append(vigilado)
+
+        if (epoca + 1) % mostrar_cada == 0:
+            print(f"  Época {epoca + 1:5d}: Error = {error_promedio:.6f}")
+
+        if checkpoint_cada and (epoca + 1) % checkpoint_cada == 0:
+            red.guardar(ruta_checkpoint, epoca=epoca + 1, error=error_promedio)
+
+        if vigilado < mejor_error - delta_minimo:
+            mejor_error = vigilado
+            historial.mejor_epoca = epoca + 1
+            epocas_sin_mejora = 0
+            if mejores is not None:
+                for mejor, p in zip(mejores, parametros):
+                    np.copyto(mejor, p)
+        else:
+            epocas_sin_mejora += 1
+
+        if programacion is not None:
+            optimizador.tasa = programacion(epoca + 1, tasa_inicial, vigilado)
+
+        if paciencia is not None and epocas_sin_mejora >= paciencia:
+            print(f"  Parada temprana en la época {epoca + 1}: {paciencia} épocas sin "
+                  f"mejorar (mejor: época {historial.mejor_epoca}, error {mejor_error:.6f})")
+            break
+
+    historial.epocas_usadas = len(historial)
+    historial.tiempo = time.perf_counter() - inicio_entrenamiento
+    if historial.epocas_usadas:
+        historial.tiempo_ahorrado = (historial.tiempo / historial.epocas_usadas
+                                     * (epocas - historial.epocas_usadas))
+
+    if mejores is not None and historial.mejor_epoca is not None:
+        for mejor, p in zip(mejores, parametros):
+            np.copyto(p, mejor)
+    if checkpoint_cada:
+        red.guardar(ruta_checkpoint, epoca=historial.epocas_usadas,
+                    mejor_epoca=historial.mejor_epoca, error=mejor_error)
+
+    return historial
+
+
+def generar_datos_circulo(n_puntos, semilla=None):
+    """
+    Puntos aleatorios en [0, 1]², clase 1 si están dentro del círculo de
+    centro (0.5, 0.5) y radio 0.35. Igual que la versión desde cero, pero
+    devuelve arrays (X, y) en vez de una lista de tuplas.
+    """
+    rng = np.random.default_rng(semilla)
+    X = rng.random((n_puntos, 2))
+    distancia = np.hypot(X[:, 0] - 0.5, X[:, 1] - 0.5)
+    return X, (distancia < 0.35).astype(float)
+
+
+def generar_datos_multiclase(n_muestras, n_clases=10, n_rasgos=784, mezcla=0.45,
+                             ruido=1.0, semilla=None, semilla_clases=0):
+    """
+    Problema sintético del tamaño de MNIST (784 = 28 × 28 "píxeles").
+
+    Cada clase tiene un prototipo (un 15% de píxeles encendidos, fijado por
+    semilla_clases). Cada muestra mezcla el prototipo de su clase con el de
+    otra clase al azar (hasta `mezcla`) y suma ruido gaussiano: algunas
+    quedan cerca de la frontera y el problema no es trivial.
+
+    Returns:
+        tuple: X (n_muestras, n_rasgos) float32, y (n_muestras,) enteros
+    """
+    prototipos = (np.random.default_rng(semilla_clases).random((n_clases, n_rasgos))
+                  < 0.15).astype(np.float32)
+    rng = np.random.default_rng(semilla)
+    y = rng.integers(0, n_clases, size=n_muestras)
+    otra = rng.integers(0, n_clases, size=n_muestras)
+    peso_otra = rng.uniform(0, mezcla, size=(n_muestras, 1)).astype(np.float32)
+    X = rng.standard_normal((n_muestras, n_rasgos), dtype=np.float32)
+    X *= ruido
+    X += (1 - peso_otra) * prototipos[y]
+    X += peso_otra * prototipos[otra]
+    return X, y
+
+
+def precision(red, X, y):
+    """
+    Proporción de aciertos redondeando la salida (0/1) o, si hay varias
+    salidas, eligiendo la de mayor valor.
+    """
+    salida = red.predecir_lote(X)
+    if salida.shape[1] > 1:
+        return float((salida.argmax(axis=1) == y).mean())
+    return float((np.round(salida.ravel()) == y).mean())
+
+
+# Bajo __main__ porque 08_entrenamiento_paralelo.py importa este módulo (y
+# sus trabajadores, arrancados con "spawn", lo vuelven a importar).
+if __name__ == "__main__":
+
+    # ==============================================================================
+    # EJEMPLO 1: MISMA INTERFAZ, MISMOS RESULTADOS
+    # ==============================================================================
+
+    print("=" * 60)
+    print("EJEMPLO 1: RedNeuronal con matrices")
+    print("=" * 60)
+
+    red = RedNeuronal([2, 8, 4, 1], semilla=42)
+    for capa in red.capas:
+        print(f"  {capa}")
+    print(f"Parámetros: {red.n_parametros()}")
+
+    random.seed(42)
+    puntos = [[random.random(), random.random()] for _ in range(5)]
+
+    capas_listas = [CapaListas.desde_capa(capa) for capa in red.capas]
+    print("\nMismos pesos, versión de listas vs versión NumPy:")
+    for punto in puntos:
+        salida_listas = punto
+        for capa in capas_listas:
+            salida_listas = capa.forward(salida_listas)
+        prediccion = red.predecir(punto)
+        print(f"  [{punto[0]:.3f}, {punto[1]:.3f}] → listas {salida_listas[0]:.10f}  "
+              f"numpy {prediccion[0]:.10f}")
+        assert abs(salida_listas[0] - prediccion[0]) < 1e-12
+
+    # Un lote entero en una sola llamada
+    lote = np.array(puntos)
+    print(f"\nLote de {len(lote)} muestras en una llamada: {red.predecir(lote).ravel().round(4)}")
+
+
+    # ==============================================================================
+    # EJEMPLO 2: CAPAS ANCHAS
+    # ==============================================================================
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 2: Capas anchas, listas vs matriz")
+    print("=" * 60)
+
+    for ancho in (100, 1_000, 2_000):
+        capa = Capa(ancho, ancho, np.random.default_rng(0))
+        capa_listas = CapaListas.desde_capa(capa)
+        entrada = np.random.default_rng(1).random(ancho)
+        entrada_lista = entrada.tolist()
+
+        repeticiones = max(1, 200 // ancho)
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            salida_listas = capa_listas.forward(entrada_lista)
+        t_listas = (time.perf_counter() - inicio) / repeticiones
+
+        repeticiones_np = 200
+        inicio = time.perf_counter()
+        for _ in range(repeticiones_np):
+            salida = capa.forward(entrada)
+        t_numpy = (time.perf_counter() - inicio) / repeticiones_np
+
+        assert np.allclose(salida, salida_listas)
+        print(f"  {ancho:>5} × {ancho:<5} listas {t_listas * 1e3:9.2f} ms   "
+              f"numpy {t_numpy * 1e3:7.3f} ms   {t_listas / t_numpy:7.0f}x")
+
+
+    # ==============================================================================
+    # EJEMPLO 3: XOR CON BACKPROPAGATION VECTORIZADA
+    # ==============================================================================
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 3: XOR, una muestra por paso (batch_size=1)")
+    print("=" * 60)
+
+    datos_xor = [
+        ([0, 0], 0),
+        ([0, 1], 1),
+        ([1, 0], 1),
+        ([1, 1], 0)
+    ]
+
+    red_xor = RedNeuronal([2, 2, 1], semilla=2)
+    inicio = time.perf_counter()
+    historial = entrenar_red(red_xor, datos_xor, epocas=10000, tasa_aprendizaje=0.5,
+                             batch_size=1, semilla=0)
+    print(f"Tiempo: {time.perf_counter() - inicio:.2f} s")
+    for entrada, esperado in datos_xor:
+        prediccion = red_xor.predecir(entrada)
+        print(f"  {entrada[0]} XOR {entrada[1]} = {prediccion[0]:.4f} → "
+              f"{round(prediccion[0])} (esperado: {esperado})")
+
+
+    # ==============================================================================
+    # EJEMPLO 4: 100.000 PUNTOS DEL CÍRCULO POR MINI-LOTES
+    # ==============================================================================
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 4: Círculo con 100.000 puntos, mini-lotes de 64")
+    print("=" * 60)
+
+    X_circulo, y_circulo = generar_datos_circulo(100_000, semilla=0)
+    X_prueba, y_prueba = generar_datos_circulo(10_000, semilla=1)
+
+    red_circulo = RedNeuronal([2, 8, 4, 1], semilla=42)
+    inicio = time.perf_counter()
+    historial_circulo = entrenar_red(red_circulo, (X_circulo, y_circulo), epocas=20,
+                                     tasa_aprendizaje=2.0, batch_size=64, semilla=0)
+    tiempo = time.perf_counter() - inicio
+    print(f"Tiempo: {tiempo:.2f} s ({20 * len(X_circulo) / tiempo:,.0f} muestras/s)")
+    print(f"Precisión: entrenamiento {precision(red_circulo, X_circulo, y_circulo):.1%}, "
+          f"prueba {precision(red_circulo, X_prueba, y_prueba):.1%}")
+
+
+    # ==============================================================================
+    # EJEMPLO 5: OPTIMIZADORES
+    # ==============================================================================
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 5: Épocas hasta converger con cada optimizador")
+    print("=" * 60)
+
+
+    def epocas_hasta(historial, umbral):
+        """Primera época con error < umbral (o None si no llega)."""
+        return next((i + 1 for i, e in enumerate(historial) if e < umbral), None)
+
+
+    X_pequeño, y_pequeño = generar_datos_circulo(2_000, semilla=0)
+    experimentos = [
+        ('XOR (lote completo)', datos_xor, [2, 4, 1], 4, 5000, 0.01),
+        ('Círculo 2.000 puntos', (X_pequeño, y_pequeño), [2, 8, 4, 1], 32, 500, 0.04),
+    ]
+    for nombre, datos, arquitectura, batch, epocas, umbral in experimentos:
+        print(f"\n{nombre}: épocas hasta error < {umbral}")
+        for optimizador in (SGD(0.5), Momentum(0.5, 0.9), RMSProp(0.01), Adam(0.02)):
+            red = RedNeuronal(arquitectura, semilla=3)
+            inicio = time.perf_counter()
+            historial = entrenar_red(red, datos, epocas=epocas, batch_size=batch, semilla=0,
+                                     optimizador=optimizador, mostrar_cada=epocas + 1)
+            tiempo = time.perf_counter() - inicio
+            necesarias = epocas_hasta(historial, umbral)
+            texto = f"{necesarias:>5}" if necesarias else f">{epocas}"
+            print(f"  {optimizador!r:<28} {texto} épocas  (error final {historial[-1]:.4f}, "
+                  f"{tiempo:.2f} s)")
+
+
+    # ==============================================================================
+    # EJEMPLO 6: OTRAS ACTIVACIONES EN LAS CAPAS OCULTAS
+    # ==============================================================================
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 6: sigmoide, tanh y ReLU en las capas ocultas (Adam)")
+    print("=" * 60)
+
+    for activacion in ('sigmoide', 'tanh', 'relu'):
+        red = RedNeuronal([2, 16, 8, 1], semilla=3, activacion=activacion)
+        historial = entrenar_red(red, (X_pequeño, y_pequeño), epocas=100, batch_size=32,
+                                 semilla=0, optimizador=Adam(0.01), mostrar_cada=101)
+        print(f"  {activacion:>8}: {epocas_hasta(historial, 0.04) or '>100'} épocas hasta error < 0.04, "
+              f"precisión de prueba {precision(red, X_prueba, y_prueba):.1%}")
+
+
+    # ==============================================================================
+    # EJEMPLO 7: FLOAT32 VS FLOAT64
+    # ==============================================================================
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 7: La misma red en float64 y en float32")
+    print("=" * 60)
+
+    # Red pequeña: el tiempo se va en el intérprete (un lote de 64 × 8 neuronas
+    # es trabajo mínimo para BLAS), así que float32 apenas acelera aquí
+    redes = {}
+    for dtype in (np.float64, np.float32):
+        red = RedNeuronal([2, 8, 4, 1], semilla=42, dtype=dtype)
+        inicio = time.perf_counter()
+        entrenar_red(red, (X_circulo, y_circulo), epocas=20, tasa_aprendizaje=2.0,
+                     batch_size=64, semilla=0, mostrar_cada=21)
+        tiempo = time.perf_counter() - inicio
+        redes[dtype] = red
+        assert all(p.dtype == dtype for p in red.parametros())
+        print(f"  {np.dtype(dtype).name}: {tiempo:.2f} s, precisión de prueba "
+              f"{precision(red, X_prueba, y_prueba):.2%}")
+
+    # Paridad: misma inicialización y mismos lotes → casi la misma red
+    diferencia = np.abs(redes[np.float64].predecir(X_prueba)
+                        - redes[np.float32].predecir(X_prueba)).max()
+    diferencia_precision = abs(precision(redes[np.float64], X_prueba, y_prueba)
+                               - precision(redes[np.float32], X_prueba, y_prueba))
+    print(f"  Máxima diferencia entre salidas: {diferencia:.1e}")
+    assert diferencia_precision <= 0.005
+
+    # Memoria por parámetro y velocidad en capas anchas (donde manda BLAS)
+    print("\nRed ancha [784, 512, 256, 10], lotes de 256:")
+    X_ancho = np.random.default_rng(0).random((256, 784))
+    Y_ancho = np.random.default_rng(1).random((256, 10))
+    capa_listas = CapaListas.desde_capa(Capa(512, 784, np.random.default_rng(0)))
+    bytes_listas = sum(sys.getsizeof(fila) + sum(map(sys.getsizeof, fila))
+                       for fila in capa_listas.pesos) / (512 * 784)
+    print(f"  listas de float (Python): {bytes_listas:5.1f} bytes/parámetro")
+
+    resultados = {}
+    for dtype in (np.float64, np.float32):
+        red = RedNeuronal([784, 512, 256, 10], semilla=0, dtype=dtype)
+        optimizador = SGD(0.1)
+        parametros = red.parametros()
+        X_lote, Y_lote = X_ancho.astype(dtype), Y_ancho.astype(dtype)
+        red.gradientes(X_lote, Y_lote)      # calentamiento
+        inicio = time.perf_counter()
+        for _ in range(20):
+            _, gradientes = red.gradientes(X_lote, Y_lote)
+            optimizador.paso(parametros, [g for par in gradientes for g in par])
+        resultados[dtype] = 20 * len(X_lote) / (time.perf_counter() - inicio)
+        print(f"  {np.dtype(dtype).name:>7}: {red.bytes_parametros() / red.n_parametros():5.1f} "
+              f"bytes/parámetro, {resultados[dtype]:8,.0f} muestras/s (forward + backward)")
+    print(f"  float32 / float64: {resultados[np.float32] / resultados[np.float64]:.1f}x más rápido")
+
+
+    # ==============================================================================
+    # EJEMPLO 8: INFERENCIA POR BLOQUES
+    # ==============================================================================
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 8: predecir_lote sobre 2 millones de puntos")
+    print("=" * 60)
+
+    X_grande, y_grande = generar_datos_circulo(2_000_000, semilla=2)
+
+    # Una muestra por llamada, como se puntuaría con la versión de listas
+    inicio = time.perf_counter()
+    for fila in X_grande[:20_000]:
+        red_circulo.predecir(fila)
+    t_fila = (time.perf_counter() - inicio) / 20_000
+    print(f"  predecir(fila) en un bucle: {1 / t_fila:12,.0f} muestras/s")
+
+    referencia = None
+    for nombre, prediccion in [
+            ('predecir(X) de golpe', lambda: red_circulo.predecir(X_grande)),
+            ('predecir_lote(X)', lambda: red_circulo.predecir_lote(X_grande)),
+            ('predecir_lote(X, hilos=4)', lambda: red_circulo.predecir_lote(X_grande, hilos=4)),
+    ]:
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        salidas = prediccion()
+        tiempo = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1] - salidas.nbytes
+        tracemalloc.stop()
+        if referencia is None:
+            referencia = salidas
+        assert np.allclose(salidas, referencia, rtol=0, atol=1e-12)
+        print(f"  {nombre:<26}  {len(X_grande) / tiempo:12,.0f} muestras/s, "
+              f"memoria extra {pico / 1e6:6.1f} MB")
+    print(f"Precisión: {float((np.round(referencia.ravel()) == y_grande).mean()):.1%} "
+          f"(los hilos solo aceleran con varios núcleos: {os.cpu_count()} aquí)")
+
+
+    # ==============================================================================
+    # EJEMPLO 9: PUNTOS DE CONTROL
+    # ==============================================================================
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 9: Guardar durante el entrenamiento y cargar con mmap")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'circulo.rednp')
+        red = RedNeuronal([2, 8, 4, 1], semilla=42, dtype=np.float32)
+        entrenar_red(red, (X_circulo, y_circulo), epocas=10, tasa_aprendizaje=2.0,
+                     batch_size=64, semilla=0, mostrar_cada=11, checkpoint_cada=4,
+                     ruta_checkpoint=ruta)
+        print(f"  {os.path.getsize(ruta)} bytes en disco para {red.n_parametros()} parámetros "
+              f"({red.bytes_parametros()} bytes)")
+
+        for mmap in (False, True):
+            inicio = time.perf_counter()
+            cargada = RedNeuronal.cargar(ruta, mmap=mmap)
+            tiempo = time.perf_counter() - inicio
+            assert np.array_equal(cargada.predecir_lote(X_prueba), red.predecir_lote(X_prueba))
+            print(f"  cargar(mmap={mmap!s:<5}): {tiempo * 1e3:.2f} ms, "
+                  f"pesos {type(cargada.capas[0].pesos).__name__}, metadatos {cargada.metadatos}")
+
+        # Una red ancha: leer escala con el tamaño, proyectar no
+        red_ancha = RedNeuronal([784, 2048, 2048, 10], semilla=0, dtype=np.float32)
+        red_ancha.guardar(ruta)
+        for mmap in (False, True):
+            inicio = time.perf_counter()
+            cargada = RedNeuronal.cargar(ruta, mmap=mmap)
+            print(f"  {red_ancha.bytes_parametros() / 1e6:.0f} MB, cargar(mmap={mmap!s:<5}): "
+                  f"{(time.perf_counter() - inicio) * 1e3:6.1f} ms")
+        del cargada     # libera el memmap antes de borrar el directorio
+
+
+    # ==============================================================================
+    # EJEMPLO 10: PARADA TEMPRANA Y PROGRAMACIÓN DE LA TASA
+    # ==============================================================================
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 10: Tiempo hasta la precisión, con y sin parada temprana")
+    print("=" * 60)
+
+    X_validacion, y_validacion = generar_datos_circulo(1_000, semilla=3)
+    configuraciones = [
+        ('600 épocas fijas', None, None),
+        ('paciencia 25', 25, None),
+        ('paciencia 25 + escalonada', 25, TasaEscalonada(cada=100, factor=0.5)),
+        ('paciencia 25 + coseno', 25, TasaCoseno(epocas=300)),
+        ('paciencia 25 + meseta', 25, ReducirEnMeseta(factor=0.5, paciencia=8)),
+    ]
+    print(f"  {'':<27} {'épocas':>6} {'mejor':>6} {'tiempo':>8} {'ahorrado':>9} {'prueba':>7}")
+    for nombre, paciencia, programacion in configuraciones:
+        red = RedNeuronal([2, 8, 4, 1], semilla=3)
+        historial = entrenar_red(red, (X_pequeño, y_pequeño), epocas=600, batch_size=32,
+                                 semilla=0, optimizador=Momentum(0.5, 0.9),
+                                 mostrar_cada=601, datos_validacion=(X_validacion, y_validacion),
+                                 paciencia=paciencia, programacion=programacion)
+        print(f"  {nombre:<27} {historial.epocas_usadas:>6} {historial.mejor_epoca:>6} "
+              f"{historial.tiempo:>7.2f}s {historial.tiempo_ahorrado:>8.2f}s "
+              f"{precision(red, X_prueba, y_prueba):>7.1%}")
+
+
+    # ==============================================================================
+    # EJEMPLO 11: VARIAS CLASES CON SOFTMAX + ENTROPÍA CRUZADA
+    # ==============================================================================
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 11: Softmax + entropía cruzada con etiquetas enteras")
+    print("=" * 60)
+
+    # Gradiente fusionado (p - y) frente a diferencias finitas
+    red = RedNeuronal([4, 5, 3], semilla=0, activacion='tanh', activacion_salida='softmax')
+    X_mini = np.random.default_rng(0).standard_normal((6, 4))
+    y_mini = np.array([0, 2, 1, 2, 0, 1])
+    _, gradientes = red.gradientes(X_mini, y_mini)
+    analitico = np.concatenate([g.ravel() for par in gradientes for g in par])
+    numerico = []
+    h = 1e-6
+    for p in red.parametros():
+        for i in np.ndindex(p.shape):
+            original = p[i]
+            p[i] = original + h
+            error_mas = error_medio(red, X_mini, y_mini)
+            p[i] = original - h
+            error_menos = error_medio(red, X_mini, y_mini)
+            p[i] = original
+            numerico.append((error_mas - error_menos) / (2 * h))
+    print(f"  Gradiente vs diferencias finitas: error máximo "
+          f"{np.abs(analitico - np.array(numerico)).max():.1e}")
+
+    # Etiquetas enteras y one-hot dan el mismo gradiente
+    _, con_one_hot = red.gradientes(X_mini, np.eye(3)[y_mini])
+    assert all(np.allclose(a, b) for par_a, par_b in zip(gradientes, con_one_hot)
+               for a, b in zip(par_a, par_b))
+
+    print("\n60.000 muestras de entrenamiento, 784 rasgos, 10 clases (float32):")
+    X_multi, y_multi = generar_datos_multiclase(60_000, semilla=0)
+    X_val_multi, y_val_multi = generar_datos_multiclase(10_000, semilla=1)
+    X_prueba_multi, y_prueba_multi = generar_datos_multiclase(10_000, semilla=2)
+
+    red_multi = RedNeuronal([784, 128, 10], semilla=0, activacion='relu',
+                            activacion_salida='softmax', dtype=np.float32)
+    print(f"  Precisión antes de entrenar: {precision(red_multi, X_prueba_multi, y_prueba_multi):.1%}")
+    historial = entrenar_red(red_multi, (X_multi, y_multi), epocas=10, batch_size=128, semilla=0,
+                             optimizador=Adam(0.0002), mostrar_cada=1,
+                             datos_validacion=(X_val_multi, y_val_multi), paciencia=2)
+    print(f"  {historial.epocas_usadas} épocas en {historial.tiempo:.1f} s "
+          f"({historial.epocas_usadas * len(X_multi) / historial.tiempo:,.0f} muestras/s)")
+    print(f"  Precisión de prueba: {precision(red_multi, X_prueba_multi, y_prueba_multi):.1%}")
+
+
+    print("\n" + "=" * 60)
+    print("PRÓXIMO: 08_entrenamiento_paralelo.py")
+    print("=" * 60)
@@ -0,0 +1,447 @@
+"""
+================================================================================
+ENTRENAMIENTO EN PARALELO: DATOS REPARTIDOS, PESOS EN MEMORIA COMPARTIDA
+================================================================================
+
+PREREQUISITOS:
+- 07_red_neuronal_numpy.py (RedNeuronal con matrices, gradientes, Momentum)
+- 01-Fundamentos-Python (multiprocessing)
+
+================================================================================
+EL PROBLEMA
+================================================================================
+
+entrenar_red usa UN núcleo. Python no ejecuta hilos en paralelo (GIL) y
+NumPy solo paraleliza productos de matrices grandes; con capas pequeñas
+casi todo el tiempo es código de un solo hilo.
+
+================================================================================
+PARALELISMO DE DATOS
+================================================================================
+
+Cada PROCESO (trabajador) tiene una porción de los datos y una vista de
+LOS MISMOS PESOS. El gradiente de un lote es la MEDIA de los gradientes
+de sus muestras, así que k trabajadores con B/k muestras cada uno
+calculan exactamente el gradiente de un lote de B:
+
+    trabajador 0: datos[0::k]  ─┐
+    trabajador 1: datos[1::k]  ─┼─→ media de gradientes → un paso
+    trabajador 2: datos[2::k]  ─┘
+
+Modo SÍNCRONO (all-reduce), en cada paso:
+1. Cada trabajador escribe su gradiente en SU fila de una matriz
+   compartida GRADIENTES (k × n_parámetros)
+2. Barrera: esperamos a que todos terminen
+3. REDUCE-SCATTER: el trabajador i promedia solo el TROZO i de las
+   columnas y actualiza ese trozo de los pesos (cada uno hace 1/k del
+   trabajo de reducción)
+4. Barrera: todos ven los pesos nuevos (están en memoria compartida, no
+   hace falta enviarlos)
+
+Modo HOGWILD (Niu et al., 2011): sin barreras ni candados. Cada trabajador
+lee los pesos compartidos, calcula su gradiente y los actualiza
+directamente. Las escrituras pueden pisarse, pero con actualizaciones
+pequeñas el entrenamiento converge igual y nadie espera a nadie.
+
+================================================================================
+multiprocessing.shared_memory
+================================================================================
+
+Un bloque de memoria con nombre que varios procesos mapean. Creamos un
+np.ndarray SOBRE ese bloque: leer y escribir los pesos no copia nada ni
+pasa por pickle. Pesos, gradientes y datos de entrenamiento viven ahí.
+
+Cada trabajador construye su RedNeuronal (07_red_neuronal_numpy.py) con
+RedNeuronal.desde_plano: sus W y b son vistas del vector de pesos
+compartido, y calcula el gradiente con el mismo red.gradientes que usa
+entrenar_red.
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from importlib import import_module
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# ==============================================================================
+# LA RED DE 07_red_neuronal_numpy.py SOBRE UN VECTOR PLANO
+# ==============================================================================
+
+# El nombre empieza por un dígito: `from 07_red_neuronal_numpy import ...`
+# no es sintaxis válida, así que lo importamos por nombre
+_red_numpy = import_module('07_red_neuronal_numpy')
+RedNeuronal = _red_numpy.RedNeuronal
+Momentum = _red_numpy.Momentum
+entrenar_red = _red_numpy.entrenar_red
+como_arrays = _red_numpy.como_arrays
+generar_datos_circulo = _red_numpy.generar_datos_circulo
+generar_datos_multiclase = _red_numpy.generar_datos_multiclase
+precision = _red_numpy.precision
+
+
+def vector_plano(red):
+    """Copia de todos los parámetros en un vector, en el orden de parametros()."""
+    return np.concatenate([p.ravel() for p in red.parametros()])
+
+
+def activaciones(red):
+    return [capa.activacion.nombre for capa in red.capas]
+
+
+def copiar_red(red):
+    """Red nueva con una copia de los pesos (sin los mensajes de __init__)."""
+    return RedNeuronal.desde_plano(vector_plano(red), red.arquitectura, activaciones(red))
+
+
+# ==============================================================================
+# MEMORIA COMPARTIDA
+# ==============================================================================
+
+def crear_compartido(array):
+    """Copia `array` a un bloque de memoria compartida nuevo."""
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    vista = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    vista[:] = array
+    return shm, {'nombre': shm.name, 'forma': array.shape, 'dtype': array.dtype.str}
+
+
+def adjuntar_compartido(descripcion):
+    """Abre un bloque creado por otro proceso y devuelve (shm, array)."""
+    # Los procesos "spawn" comparten el resource_tracker del padre: el bloque
+    # queda registrado una sola vez y lo libera el creador con unlink()
+    shm = shared_memory.SharedMemory(name=descripcion['nombre'])
+    array = np.ndarray(descripcion['forma'], dtype=descripcion['dtype'], buffer=shm.buf)
+    return shm, array
+
+
+# ==============================================================================
+# TRABAJADOR
+# ==============================================================================
+
+def _trabajador(id_trabajador, config, barrera, detener, resultados):
+    """Entrena sobre su porción de los datos (se ejecuta en otro proceso)."""
+    try:
+        _entrenar_porcion(id_trabajador, config, barrera, detener, resultados)
+    except BaseException:
+        # Rompe la barrera: los demás no esperan a un trabajador muerto
+        barrera.abort()
+        raise
+
+
+def _entrenar_porcion(id_trabajador, config, barrera, detener, resultados):
+    k = config['n_trabajadores']
+    espera = config['espera_maxima']
+    bloques = {nombre: adjuntar_compartido(desc) for nombre, desc in config['bloques'].items()}
+    pesos = bloques['pesos'][1]
+    # La red del trabajador: sus W y b son vistas de los pesos compartidos
+    red = RedNeuronal.desde_plano(pesos, config['arquitectura'], config['activaciones'])
+    X = bloques['X'][1][id_trabajador::k]
+    Y = bloques['Y'][1][id_trabajador::k]
+    todos_gradientes = bloques['gradientes'][1]
+    mi_fila = todos_gradientes[id_trabajador]
+
+    rng = np.random.default_rng(config['semilla'] + id_trabajador)
+    tasa, beta = config['tasa'], config['beta']
+    lote = config['batch_size'] // k if config['modo'] == 'sincrono' else config['batch_size']
+    pasos = len(X) // lote
+
+    if config['modo'] == 'sincrono':
+        # Este trabajador reduce y actualiza las columnas [inicio, fin)
+        limites = np.linspace(0, len(pesos), k + 1).astype(int)
+        inicio, fin = limites[id_trabajador], limites[id_trabajador + 1]
+        velocidad = np.zeros(fin - inicio)
+        suma = np.empty(fin - inicio)
+    else:
+        velocidad = np.zeros_like(pesos)
+        paso_pesos = np.empty_like(pesos)
+
+    if id_trabajador == 0:
+        X_val, y_val = bloques['X_val'][1], bloques['y_val'][1]
+        instantanea = bloques['instantanea'][1]
+        red_instantanea = RedNeuronal.desde_plano(instantanea, config['arquitectura'],
+                                                  config['activaciones'])
+        historial = []
+
+    barrera.wait(espera)
+    t0 = time.perf_counter()
+
+    for epoca in range(config['epocas']):
+        orden = rng.permutation(len(X))
+        for paso in range(pasos):
+            indices = orden[paso * lote:(paso + 1) * lote]
+            # El mismo backpropagation que entrenar_red, copiado a mi fila
+            _, gradientes = red.gradientes(X[indices], Y[indices])
+            np.concatenate([g.ravel() for par in gradientes for g in par], out=mi_fila)
+
+            if config['modo'] == 'sincrono':
+                barrera.wait(espera)
+                # Reduce-scatter: media de mi trozo de columnas + momentum
+                np.sum(todos_gradientes[:, inicio:fin], axis=0, out=suma)
+                suma /= k
+                velocidad *= beta
+                velocidad += suma
+                np.multiply(velocidad, tasa, out=suma)
+                pesos[inicio:fin] -= suma
+                barrera.wait(espera)
+            else:
+                # Hogwild: actualización directa, sin candados
+                velocidad *= beta
+                velocidad += mi_fila
+                np.multiply(velocidad, tasa, out=paso_pesos)
+                pesos -= paso_pesos
+                if detener.is_set():
+                    break
+
+        if id_trabajador == 0:
+            # Copia de los pesos antes de evaluar: en modo hogwild los demás
+            # siguen escribiendo, y el resultado debe ser lo que se evaluó
+            np.copyto(instantanea, pesos)
+            acierto = precision(red_instantanea, X_val, y_val)
+            historial.append((epoca + 1, time.perf_counter() - t0, acierto))
+            if acierto >= config['objetivo']:
+                detener.set()
+        if config['modo'] == 'sincrono':
+            barrera.wait(espera)
+        if detener.is_set():
+            break
+
+    if id_trabajador == 0:
+        resultados.put(historial)
+    for shm, _ in bloques.values():
+        shm.close()
+
+
+def _esperar_historial(resultados, procesos, barrera):
+    """
+    Espera el historial del trabajador 0 comprobando que nadie haya muerto:
+    un get() sin plazo se quedaría colgado para siempre.
+    """
+    while True:
+        try:
+            return resultados.get(timeout=0.5)
+        except queue.Empty:
+            pass
+        for i, proceso in enumerate(procesos):
+            if proceso.exitcode not in (None, 0):
+                barrera.abort()
+                raise RuntimeError(f"El trabajador {i} terminó con código {proceso.exitcode}")
+        if all(proceso.exitcode == 0 for proceso in procesos):
+            # Terminaron bien: lo que puso el trabajador 0 ya está en la cola
+            try:
+                return resultados.get(timeout=0.5)
+            except queue.Empty:
+                raise RuntimeError("Los trabajadores terminaron sin devolver el historial") \
+                    from None
+
+
+# ==============================================================================
+# ENTRENAMIENTO EN PARALELO
+# ==============================================================================
+
+def entrenar_paralelo(red, datos, datos_validacion, n_trabajadores=2, modo='sincrono',
+                      epocas=20, tasa_aprendizaje=0.5, beta=0.9, batch_size=256,
+                      objetivo=1.0, semilla=0, espera_maxima=60.0):
+    """
+    Entrena una RedNeuronal con n_trabajadores procesos. Al terminar, la
+    red tiene los pesos de la última evaluación (como entrenar_red, la
+    entrena en sitio).
+
+    Args:
+        red: RedNeuronal (float64) de 07_red_neuronal_numpy.py
+        datos, datos_validacion: (X, y) en arrays; para una red softmax,
+                                 y con las clases (enteros) o en one-hot
+        modo: 'sincrono' (all-reduce, equivale a un lote de batch_size)
+              o 'hogwild' (asíncrono, cada trabajador usa lotes de batch_size)
+        tasa_aprendizaje, beta: SGD con momentum (Momentum de 07)
+        objetivo: Se detiene al alcanzar esta precisión de validación
+        espera_maxima: Segundos que un trabajador espera a los demás en
+                       una barrera antes de darse por roto
+
+    Returns:
+        list: [(época, segundos, precisión validación)]
+
+    Raises:
+        ValueError: Modo desconocido o batch_size < n_trabajadores
+        RuntimeError: Si algún trabajador muere
+    """
+    if modo not in ('sincrono', 'hogwild'):
+        raise ValueError(f"Modo desconocido: {modo} (opciones: sincrono, hogwild)")
+    if n_trabajadores < 1 or batch_size < 1:
+        raise ValueError("n_trabajadores y batch_size deben ser >= 1")
+    if modo == 'sincrono' and batch_size < n_trabajadores:
+        # Cada trabajador calcula batch_size // n_trabajadores muestras
+        raise ValueError(f"batch_size ({batch_size}) debe ser >= n_trabajadores "
+                         f"({n_trabajadores}) en modo síncrono")
+    if red.dtype != np.float64:
+        raise ValueError(f"entrenar_paralelo necesita una red float64, no {red.dtype}")
+
+    # Como en entrenar_red: etiquetas enteras (n,) para una red multiclase,
+    # columnas flotantes (n, n_salidas) en el resto
+    X, Y = como_arrays(datos, etiquetas=red.multiclase)
+    if Y.dtype.kind == 'f':
+        Y = Y.astype(np.float64, copy=False)
+    X_val, y_val = datos_validacion
+    # Todos los trabajadores reciben el mismo número de muestras
+    n = len(X) - len(X) % n_trabajadores
+    pesos = vector_plano(red)
+
+    compartidos = {
+        'pesos': pesos,
+        'instantanea': pesos.copy(),
+        'gradientes': np.zeros((n_trabajadores, len(pesos))),
+        'X': np.ascontiguousarray(X[:n], dtype=np.float64),
+        'Y': np.ascontiguousarray(Y[:n]),
+        'X_val': np.ascontiguousarray(X_val, dtype=np.float64),
+        'y_val': np.ascontiguousarray(y_val, dtype=np.float64),
+    }
+    bloques = {nombre: crear_compartido(array) for nombre, array in compartidos.items()}
+    config = {
+        'bloques': {nombre: desc for nombre, (_, desc) in bloques.items()},
+        'arquitectura': red.arquitectura, 'activaciones': activaciones(red),
+        'n_trabajadores': n_trabajadores, 'modo': modo, 'epocas': epocas,
+        'tasa': tasa_aprendizaje, 'beta': beta, 'batch_size': batch_size,
+        'objetivo': objetivo, 'semilla': semilla, 'espera_maxima': espera_maxima,
+    }
+
+    contexto = multiprocessing.get_context('spawn')
+    barrera = contexto.Barrier(n_trabajadores)
+    detener = contexto.Event()
+    resultados = contexto.Queue()
+    procesos = [contexto.Process(target=_trabajador,
+                                 args=(i, config, barrera, detener, resultados))
+                for i in range(n_trabajadores)]
+    try:
+        for proceso in procesos:
+            proceso.start()
+        historial = _esperar_historial(resultados, procesos, barrera)
+        for proceso in procesos:
+            proceso.join()
+        shm_pesos, desc_pesos = bloques['instantanea']
+        finales = np.ndarray(desc_pesos['forma'], dtype=desc_pesos['dtype'],
+                             buffer=shm_pesos.buf).copy()
+        red_final = RedNeuronal.desde_plano(finales, red.arquitectura, config['activaciones'])
+        for p, final in zip(red.parametros(), red_final.parametros()):
+            np.copyto(p, final)
+    finally:
+        for proceso in procesos:
+            if proceso.is_alive():
+                proceso.terminate()
+                proceso.join()
+        for shm, _ in bloques.values():
+            shm.close()
+            shm.unlink()
+
+    return historial
+
+
+# ==============================================================================
+# EJEMPLOS
+# ==============================================================================
+
+# Los ejemplos van bajo __main__: los trabajadores se arrancan con "spawn"
+# y cada uno vuelve a importar este archivo.
+if __name__ == "__main__":
+
+    print("=" * 60)
+    print("EJEMPLO 1: Tiempo hasta una precisión objetivo según trabajadores")
+    print("=" * 60)
+
+    arquitectura = [2, 32, 16, 1]
+    datos = generar_datos_circulo(200_000, semilla=0)
+    datos_validacion = generar_datos_circulo(20_000, semilla=1)
+    red_inicial = RedNeuronal(arquitectura, semilla=0)
+    objetivo = 0.99
+    n_cpu = os.cpu_count() or 1
+    opciones = [k for k in (1, 2, 4, 8) if k <= max(2, n_cpu)]
+
+    print(f"Datos: {len(datos[0]):,} puntos, red {arquitectura} "
+          f"({red_inicial.n_parametros()} parámetros), {n_cpu} CPU")
+    print(f"Objetivo: precisión de validación ≥ {objetivo:.0%}\n")
+    if n_cpu < max(opciones):
+        print(f"  (con {n_cpu} CPU, más trabajadores que núcleos solo añade esperas:\n"
+              f"   el tiempo no puede bajar, pero la precisión debe coincidir)\n")
+
+    base = None
+    for modo in ('sincrono', 'hogwild'):
+        for k in opciones:
+            if modo == 'hogwild' and k == 1:
+                continue
+            # Todas las pruebas parten de los mismos pesos iniciales
+            red = copiar_red(red_inicial)
+            inicio = time.perf_counter()
+            historial = entrenar_paralelo(
+                red, datos, datos_validacion, n_trabajadores=k, modo=modo,
+                epocas=30, tasa_aprendizaje=0.5, batch_size=256, objetivo=objetivo)
+            total = time.perf_counter() - inicio
+            epoca, segundos, acierto = historial[-1]
+            final = precision(red, *datos_validacion)
+            base = base or segundos
+            print(f"  {modo:>8}, {k} trabajador{'es' if k > 1 else '  '}: "
+                  f"{epoca:2d} épocas, {segundos:6.2f} s hasta {acierto:.2%} "
+                  f"(×{base / segundos:4.2f}), precisión final {final:.2%}, "
+                  f"total con arranque {total:.1f} s")
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 2: Mismo resultado que entrenar_red")
+    print("=" * 60)
+
+    # Síncrono = un lote de batch_size repartido: mismo optimizador (Momentum),
+    # mismos pesos iniciales, mismo lote y misma semilla que en un solo proceso
+    epocas = 3
+    red_serie = copiar_red(red_inicial)
+    entrenar_red(red_serie, datos, epocas=epocas, batch_size=256, semilla=0,
+                 optimizador=Momentum(0.5, beta=0.9), mostrar_cada=epocas,
+                 restaurar_mejores=False)
+    red_sincrona = copiar_red(red_inicial)
+    entrenar_paralelo(red_sincrona, datos, datos_validacion, n_trabajadores=2,
+                      epocas=epocas, tasa_aprendizaje=0.5, beta=0.9, batch_size=256,
+                      semilla=0)
+    acierto_serie = precision(red_serie, *datos_validacion)
+    acierto_sincrono = precision(red_sincrona, *datos_validacion)
+    print(f"  entrenar_red, {epocas} épocas:                        {acierto_serie:.2%}")
+    print(f"  entrenar_paralelo, 2 trabajadores, {epocas} épocas:   {acierto_sincrono:.2%}")
+    # El orden de las muestras difiere (cada trabajador baraja su porción):
+    # no son los mismos bits, pero sí la misma precisión
+    assert abs(acierto_serie - acierto_sincrono) < 0.01
+
+    # Red softmax: los trabajadores reciben las etiquetas enteras tal cual
+    X_multi, y_multi = generar_datos_multiclase(20_000, n_rasgos=100, semilla=0)
+    validacion_multi = generar_datos_multiclase(5_000, n_rasgos=100, semilla=1)
+    X_multi = X_multi.astype(np.float64)
+    red_multi = RedNeuronal([100, 32, 10], semilla=0, activacion='relu',
+                            activacion_salida='softmax')
+    red_serie = copiar_red(red_multi)
+    entrenar_red(red_serie, (X_multi, y_multi), epocas=epocas, batch_size=256, semilla=0,
+                 optimizador=Momentum(0.1, beta=0.9), mostrar_cada=epocas,
+                 restaurar_mejores=False)
+    red_sincrona = copiar_red(red_multi)
+    entrenar_paralelo(red_sincrona, (X_multi, y_multi), validacion_multi, n_trabajadores=2,
+                      epocas=epocas, tasa_aprendizaje=0.1, beta=0.9, batch_size=256,
+                      semilla=0)
+    acierto_serie = precision(red_serie, *validacion_multi)
+    acierto_sincrono = precision(red_sincrona, *validacion_multi)
+    print(f"  softmax, 10 clases: antes {precision(red_multi, *validacion_multi):.2%}, "
+          f"entrenar_red {acierto_serie:.2%}, entrenar_paralelo {acierto_sincrono:.2%}")
+    assert abs(acierto_serie - acierto_sincrono) < 0.02
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 3: Errores sin colgarse")
+    print("=" * 60)
+
+    try:
+        entrenar_paralelo(copiar_red(red_inicial), datos, datos_validacion,
+                          n_trabajadores=2, batch_size=1)
+    except ValueError as error:
+        print(f"  batch_size=1 con 2 trabajadores → ValueError: {error}")
+
+    print("\n" + "=" * 60)
+    print("PRÓXIMO: 04_tensorflow_intro.py")
+    print("=" * 60)
@@ -0,0 +1,277 @@
+"""
+================================================================================
+FUNCIONES DE ACTIVACIÓN VECTORIZADAS Y ESTABLES
+================================================================================
+
+PREREQUISITOS:
+- 02_que_es_una_neurona.py (escalón, sigmoide, ReLU, tanh)
+- 03_red_neuronal_desde_cero.py (derivadas para backpropagation)
+
+Módulo compartido: 07_red_neuronal_numpy.py y los archivos siguientes lo
+importan con  from activaciones import ACTIVACIONES, sigmoide, ...
+
+================================================================================
+TRES PROBLEMAS DE LAS VERSIONES ESCALARES
+================================================================================
+
+1. LENTITUD: math.exp trabaja con UN número. Para una capa de 1.000
+   neuronas y un lote de 256 muestras son 256.000 llamadas desde Python.
+
+2. DESBORDAMIENTO: 1 / (1 + math.exp(-x)) con x = -1000 lanza
+   OverflowError (e^1000 no cabe en un float). Con NumPy, np.exp(1000)
+   da inf y un aviso; en float32 ya desborda con x < -89.
+
+   Solución: σ(x) = ½ · (1 + tanh(x/2)). Es la MISMA función (identidad
+   exacta) y tanh nunca desborda: satura en ±1. Las versiones escalares
+   de 02 y 03 usan la misma identidad con math.tanh.
+
+3. MEMORIA: cada operación NumPy crea un array nuevo. Con out= escribimos
+   el resultado en un array existente, incluso en el de entrada:
+
+       sigmoide(z, out=z)      ← z pasa a ser σ(z), sin reservar memoria
+
+================================================================================
+DERIVADAS EN FUNCIÓN DE LA SALIDA
+================================================================================
+
+En backpropagation ya tenemos guardada la SALIDA y = f(x) de cada capa.
+Para estas funciones la derivada se escribe con y, sin volver a evaluar f:
+
+    sigmoide:  f'(x) = y · (1 - y)
+    tanh:      f'(x) = 1 - y²
+    relu:      f'(x) = 1 si y > 0, si no 0
+    escalón:   f'(x) = 0  (no sirve para aprender por gradiente)
+    lineal:    f'(x) = 1
+
+SOFTMAX (capa de salida multiclase) no es elemento a elemento: cada salida
+depende de toda la fila. No tiene derivada aquí porque se usa junto con
+la entropía cruzada, y la derivada de las dos juntas es simplemente
+p - y (ver 07_red_neuronal_numpy.py).
+
+Todas las funciones aceptan float32 y float64 y devuelven el mismo tipo.
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+# ==============================================================================
+# FUNCIONES
+# ==============================================================================
+
+
+def _preparar(x, out):
+    """Devuelve el array de salida: `out` si se da, si no uno nuevo flotante."""
+    if out is not None:
+        return out
+    x = np.asarray(x)
+    return np.empty_like(x, dtype=x.dtype if x.dtype.kind == 'f' else np.float64)
+
+
+def sigmoide(x, out=None):
+    """
+    σ(x) = ½ · (1 + tanh(x/2)): sin desbordamiento para ningún x.
+
+    El error es ABSOLUTO (~1e-16): para x < -37 devuelve 0 en vez de
+    un número diminuto. Para log σ(x) conviene trabajar con x directamente.
+    """
+    out = _preparar(x, out)
+    np.multiply(x, 0.5, out=out)
+    np.tanh(out, out=out)
+    out += 1
+    out *= 0.5
+    return out
+
+
+def tanh(x, out=None):
+    """tanh(x), entre -1 y 1."""
+    return np.tanh(x, out=_preparar(x, out))
+
+
+def relu(x, out=None):
+    """max(0, x)."""
+    return np.maximum(x, 0, out=_preparar(x, out))
+
+
+def escalon(x, out=None):
+    """1 si x > 0, si no 0."""
+    return np.greater(x, 0, out=_preparar(x, out), casting='unsafe')
+
+
+def lineal(x, out=None):
+    """Identidad (capas de salida de regresión)."""
+    out = _preparar(x, out)
+    if out is not x:
+        np.copyto(out, x)
+    return out
+
+
+def softmax(x, out=None):
+    """
+    e^xᵢ / Σⱼ e^xⱼ en cada fila (última dimensión): probabilidades que suman 1.
+
+    Restamos el máximo de la fila antes de exponenciar: se cancela en el
+    cociente y así e^(x - máx) ≤ 1 nunca desborda.
+    """
+    out = _preparar(x, out)
+    np.subtract(x, np.max(x, axis=-1, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= out.sum(axis=-1, keepdims=True)
+    return out
+
+
+# ==============================================================================
+# DERIVADAS (a partir de la salida y = f(x))
+# ==============================================================================
+
+def derivada_sigmoide(y, out=None):
+    """
+    y · (1 - y), calculado como ¼ - (y - ½)²: así también funciona EN SITIO
+    (out=y) sin un array temporal.
+    """
+    out = _preparar(y, out)
+    np.subtract(y, 0.5, out=out)
+    np.square(out, out=out)
+    np.subtract(0.25, out, out=out)
+    return out
+
+
+def derivada_tanh(y, out=None):
+    """1 - y²."""
+    out = _preparar(y, out)
+    np.square(y, out=out)
+    np.subtract(1, out, out=out)
+    return out
+
+
+def derivada_relu(y, out=None):
+    """1 donde la neurona está activa (y > 0), 0 en el resto."""
+    return np.greater(y, 0, out=_preparar(y, out), casting='unsafe')
+
+
+def derivada_escalon(y, out=None):
+    out = _preparar(y, out)
+    out.fill(0)
+    return out
+
+
+def derivada_lineal(y, out=None):
+    out = _preparar(y, out)
+    out.fill(1)
+    return out
+
+
+def derivada_softmax(y, out=None):
+    raise ValueError("softmax solo se usa en la capa de salida con entropía cruzada, "
+                     "cuyo gradiente conjunto es p - y")
+
+
+# ==============================================================================
+# TABLA DE DESPACHO
+# ==============================================================================
+
+class Activacion(NamedTuple):
+    """Función de activación y su derivada (en función de la salida)."""
+    nombre: str
+    funcion: Callable
+    derivada: Callable
+
+
+ACTIVACIONES = {
+    'sigmoide': Activacion('sigmoide', sigmoide, derivada_sigmoide),
+    'tanh': Activacion('tanh', tanh, derivada_tanh),
+    'relu': Activacion('relu', relu, derivada_relu),
+    'escalon': Activacion('escalon', escalon, derivada_escalon),
+    'lineal': Activacion('lineal', lineal, derivada_lineal),
+    'softmax': Activacion('softmax', softmax, derivada_softmax),
+}
+
+
+def obtener_activacion(nombre):
+    """ACTIVACIONES[nombre], con un error claro si el nombre no existe."""
+    try:
+        return ACTIVACIONES[nombre]
+    except KeyError:
+        raise ValueError(f"Función desconocida: {nombre} "
+                         f"(opciones: {', '.join(ACTIVACIONES)})") from None
+
+
+# ==============================================================================
+# EJEMPLOS
+# ==============================================================================
+
+# Bajo __main__ porque otros archivos importan este módulo.
+if __name__ == "__main__":
+    import math
+    import time
+
+    print("=" * 60)
+    print("EJEMPLO 1: Valores extremos, sin desbordamiento")
+    print("=" * 60)
+
+    extremos = np.array([-1000.0, -100.0, -10.0, 0.0, 10.0, 100.0, 1000.0])
+    for dtype in (np.float64, np.float32):
+        x = extremos.astype(dtype)
+        with np.errstate(over='raise'):
+            y = sigmoide(x)
+        print(f"  sigmoide {np.dtype(dtype).name:>7}: {y}  (dtype {y.dtype})")
+
+    with np.errstate(over='raise'):
+        fila = softmax(np.array([[1000.0, 0.0, -1000.0, 999.0]], dtype=np.float32))
+    print(f"  softmax [1000, 0, -1000, 999]: {fila.ravel()} (suma {fila.sum():.6f})")
+
+    try:
+        1 / (1 + math.exp(1000))
+    except OverflowError as error:
+        print(f"  versión con math.exp(-x), x = -1000: OverflowError ({error})")
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 2: Derivadas comparadas con diferencias finitas")
+    print("=" * 60)
+
+    x = np.linspace(-3.5, 3.5, 8)    # sin x = 0, donde ReLU no es derivable
+    h = 1e-6
+    for nombre in ('sigmoide', 'tanh', 'relu', 'lineal'):
+        activacion = ACTIVACIONES[nombre]
+        analitica = activacion.derivada(activacion.funcion(x))
+        numerica = (activacion.funcion(x + h) - activacion.funcion(x - h)) / (2 * h)
+        print(f"  {nombre:>8}: error máximo {np.abs(analitica - numerica).max():.1e}")
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 3: En sitio con out= (misma memoria, mismo dtype)")
+    print("=" * 60)
+
+    z = np.random.default_rng(0).standard_normal((256, 1000)).astype(np.float32)
+    direccion = z.__array_interface__['data'][0]
+    sigmoide(z, out=z)
+    derivada_sigmoide(z, out=z)
+    print(f"  dtype {z.dtype}, mismo buffer: "
+          f"{z.__array_interface__['data'][0] == direccion}, "
+          f"σ'(x) ∈ [{z.min():.3f}, {z.max():.3f}]")
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 4: Escalar (math.exp) vs vectorizada")
+    print("=" * 60)
+
+    datos = np.random.default_rng(1).standard_normal(256_000)
+    lista = datos.tolist()
+
+    inicio = time.perf_counter()
+    escalar = [1 / (1 + math.exp(-v)) for v in lista]
+    t_escalar = time.perf_counter() - inicio
+
+    for dtype in (np.float64, np.float32):
+        x = datos.astype(dtype)
+        salida = np.empty_like(x)
+        inicio = time.perf_counter()
+        for _ in range(10):
+            sigmoide(x, out=salida)
+        t_vector = (time.perf_counter() - inicio) / 10
+        assert np.allclose(salida, escalar, atol=1e-6)
+        print(f"  {np.dtype(dtype).name:>7}: {t_vector * 1e3:6.2f} ms vs "
+              f"escalar {t_escalar * 1e3:6.1f} ms ({t_escalar / t_vector:.0f}x)")
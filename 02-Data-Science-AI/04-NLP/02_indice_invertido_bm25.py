@@ -0,0 +1,592 @@
+"""
+================================================================================
+ÍNDICE INVERTIDO Y RANKING BM25
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (tokenización, TF-IDF)
+
+================================================================================
+¿QUÉ ES UN ÍNDICE INVERTIDO?
+================================================================================
+
+Con TF-IDF sabemos cuánto pesa cada palabra en cada documento, pero para
+BUSCAR tendríamos que recorrer todos los documentos en cada consulta.
+
+Un índice invertido le da la vuelta a la tabla:
+
+    término  →  lista de apariciones (postings)
+
+    "gato"   →  [(doc 0, tf 1), (doc 2, tf 1)]
+    "perro"  →  [(doc 1, tf 1), (doc 2, tf 1)]
+
+Para responder "gato perro" solo leemos dos listas, no todo el corpus.
+
+Guardamos cada lista como ARRAYS COMPACTOS (NumPy) en formato CSR:
+- doc_ids:  int32 con los documentos de todos los términos, concatenados
+- tfs:      int32 con la frecuencia del término en cada documento
+- offsets:  dónde empieza y termina la lista de cada término
+
+================================================================================
+BM25
+================================================================================
+
+BM25 mejora TF-IDF con dos ideas:
+1. SATURACIÓN: la décima aparición de una palabra aporta menos que la primera
+2. NORMALIZACIÓN POR LONGITUD: los documentos largos no ganan por ser largos
+
+    score(d, q) = Σ idf(t) · tf·(k1 + 1) / (tf + k1·(1 - b + b·|d|/avgdl))
+
+    idf(t) = log(1 + (N - df + 0.5) / (df + 0.5))
+
+Valores típicos: k1 = 1.2, b = 0.75
+
+================================================================================
+TOP-K CON TERMINACIÓN TEMPRANA
+================================================================================
+
+No necesitamos puntuar todo: solo los k mejores. Cada término tiene una
+COTA SUPERIOR (la máxima contribución que puede aportar a un documento).
+Procesamos los términos de mayor a menor cota; cuando el k-ésimo mejor score
+supera la suma de las cotas restantes, ningún documento nuevo puede entrar
+en el top-k y solo seguimos actualizando a los candidatos que aún pueden
+ganar (estrategia "MaxScore"). Un heap de tamaño k da el resultado final.
+
+================================================================================
+TRAMOS POR IMPACTO
+================================================================================
+
+MaxScore solo corta cuando las cotas de los términos RESTANTES son
+pequeñas. Una consulta de palabras muy frecuentes ("de la que") no tiene
+términos pequeños: habría que recorrer listas de casi N postings.
+
+Por eso las listas largas se parten en TRAMOS por contribución: los 1.024
+postings que más aportan, los 4.096 siguientes, los 16.384 siguientes...
+(cada tramo ordenado por documento y con su propia cota). Un documento
+está en UN solo tramo de cada término, así que un documento aún no visto
+puede sumar como mucho, por cada término, la COLA: la cota de sus tramos
+sin leer. buscar() lee por rondas (el primer tramo de cada término, luego
+el segundo...) y en cada tramo:
+
+- Si su cota más la cola de los demás términos no llega al k-ésimo score,
+  ningún documento NUEVO del tramo puede entrar: solo se actualizan los
+  ya vistos
+- Cuando la suma de las colas no llega al k-ésimo, pasa a modo MaxScore
+- Cada documento lleva un bit por término en el que ya lo encontramos:
+  su cota es su score más la cola de los términos que le FALTAN, y los
+  candidatos que no pueden alcanzar al k-ésimo se descartan en cada tramo
+
+La contribución BM25 de cada posting (su IMPACTO) se precalcula en float32
+al construir: leer un tramo es copiar valores, no recalcular la fórmula.
+
+De las listas largas solo se leen las cabezas, y el resultado sigue
+siendo EXACTO (el mismo top-k que puntuando todos los documentos).
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import heapq
+import itertools
+import random
+import re
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+# ==============================================================================
+# PREPROCESAMIENTO (mismo que en 01_introduccion_nlp.py)
+# ==============================================================================
+
+
+def limpiar_texto(texto):
+    """Minúsculas, sin caracteres especiales y sin espacios extra."""
+    texto = texto.lower()
+    texto = re.sub(r'[^a-záéíóúñü0-9\s]', '', texto)
+    return ' '.join(texto.split())
+
+
+def tokenizar(texto):
+    """Tokenización simple: dividir por espacios."""
+    return texto.split()
+
+
+# ==============================================================================
+# CLASE INDICE INVERTIDO
+# ==============================================================================
+
+class IndiceInvertido:
+    """
+    Índice invertido con postings compactos y ranking BM25 o TF-IDF.
+
+    Uso:
+        indice = IndiceInvertido()
+        indice.agregar_documentos(documentos)
+        indice.construir()
+        indice.buscar("gato negro", k=10)
+
+    Atributos (después de construir):
+        vocabulario: dict término → id de término
+        doc_ids: int32, postings concatenados (por documento dentro de cada tramo)
+        tfs: int32, frecuencia del término en cada posting
+        offsets: int64, la lista del término t es doc_ids[offsets[t]:offsets[t+1]]
+        tramos: int64, el tramo j es doc_ids[tramos[j]:tramos[j+1]]
+        primer_tramo: int64, los tramos del término t van de primer_tramo[t]
+                      a primer_tramo[t+1] - 1, de mayor a menor contribución
+        longitudes: int32, número de tokens de cada documento
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        """
+        Args:
+            k1: Saturación de la frecuencia del término (BM25)
+            b: Peso de la normalización por longitud (BM25)
+        """
+        self.k1 = k1
+        self.b = b
+
+        self.vocabulario = {}
+        # Durante la carga: por término, [docs], [tfs]. construir() lo vacía
+        # (None) para no duplicar memoria junto a los arrays CSR
+        self._postings = []
+        self._longitudes = []
+        self.construido = False
+
+    @property
+    def n_docs(self):
+        return len(self._longitudes)
+
+    def agregar_documentos(self, documentos):
+        """
+        Tokeniza y añade documentos al índice.
+
+        Los ids de documento son consecutivos en orden de llegada, así las
+        listas de postings quedan ordenadas por documento sin ordenar nada.
+
+        Args:
+            documentos: Iterable de textos
+
+        Returns:
+            list: Ids asignados a los documentos añadidos
+        """
+        if self._postings is None:
+            # Ya construido: recuperamos las listas desde los arrays, otra vez
+            # por documento (los tramos las reordenan)
+            self._postings = []
+            for inicio, fin in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist()):
+                orden = np.argsort(self.doc_ids[inicio:fin], kind='stable')
+                self._postings.append((self.doc_ids[inicio:fin][orden].tolist(),
+                                       self.tfs[inicio:fin][orden].tolist()))
+
+        ids = []
+        for texto in documentos:
+            doc_id = len(self._longitudes)
+            tokens = tokenizar(limpiar_texto(texto))
+            self._longitudes.append(len(tokens))
+
+            for termino, tf in Counter(tokens).items():
+                t = self.vocabulario.get(termino)
+                if t is None:
+                    t = len(self.vocabulario)
+                    self.vocabulario[termino] = t
+                    self._postings.append(([], []))
+                docs, tfs = self._postings[t]
+                docs.append(doc_id)
+                tfs.append(tf)
+            ids.append(doc_id)
+
+        self.construido = False
+        return ids
+
+    def construir(self):
+        """
+        Congela las listas de Python en arrays NumPy compactos, parte las
+        listas largas en tramos y precalcula IDF y cotas superiores por tramo.
+        """
+        n_terminos = len(self.vocabulario)
+        tamanos = np.fromiter(
+            (len(docs) for docs, _ in self._postings), dtype=np.int64, count=n_terminos
+        )
+        self.offsets = np.zeros(n_terminos + 1, dtype=np.int64)
+        np.cumsum(tamanos, out=self.offsets[1:])
+
+        self.doc_ids = np.empty(self.offsets[-1], dtype=np.int32)
+        self.tfs = np.empty(self.offsets[-1], dtype=np.int32)
+        for t, (docs, tfs) in enumerate(self._postings):
+            inicio, fin = self.offsets[t], self.offsets[t + 1]
+            self.doc_ids[inicio:fin] = docs
+            self.tfs[inicio:fin] = tfs
+
+        self.longitudes = np.asarray(self._longitudes, dtype=np.int32)
+        self.longitud_media = float(self.longitudes.mean()) if self.n_docs else 0.0
+
+        n = self.n_docs
+        df = tamanos.astype(np.float64)
+        self.idf_bm25 = np.log1p((n - df + 0.5) / (df + 0.5))
+        # Mismo IDF que calcular_tfidf: log(N / df)
+        self.idf_tfidf = np.log(n / np.maximum(df, 1))
+
+        self._crear_tramos()
+
+        # Acumulador denso y marcas (términos en los que ya vimos cada
+        # documento), reutilizados entre consultas (evitan reservar memoria)
+        self._acumulador = np.zeros(n, dtype=np.float64)
+        self._marcas = np.zeros(n, dtype=np.uint16)
+        self._postings = None
+        self.construido = True
+
+    def _crear_tramos(self):
+        """
+        Calcula el impacto BM25 de cada posting, reordena cada lista larga
+        de mayor a menor impacto, la corta en tramos crecientes (cada uno
+        ordenado por documento, para buscarlos con searchsorted) y calcula
+        la cota de cada tramo.
+        """
+        n_terminos = len(self.offsets) - 1
+        # k1·(1 - b + b·|d|/avgdl), una vez por documento
+        norma = self.k1 * (1 - self.b + self.b * self.longitudes
+                           / (self.longitud_media or 1.0))
+        # Impacto = contribución BM25 del posting. En float32 (error relativo
+        # ~1e-7): buscar() lo lee tramo a tramo en vez de recalcularlo
+        self.impactos = np.empty(len(self.doc_ids), dtype=np.float32)
+        tramos = []
+        self.primer_tramo = np.zeros(n_terminos + 1, dtype=np.int64)
+        for t in range(n_terminos):
+            inicio, fin = self.offsets[t], self.offsets[t + 1]
+            tf = self.tfs[inicio:fin]
+            impactos = self.idf_bm25[t] * (self.k1 + 1) * tf / (tf + norma[self.doc_ids[inicio:fin]])
+            cortes = _cortes_tramos(fin - inicio)
+            if len(cortes) > 2:
+                orden = np.argsort(-impactos, kind='stable')
+                orden = np.concatenate([np.sort(orden[a:b])
+                                        for a, b in zip(cortes[:-1], cortes[1:])])
+                self.doc_ids[inicio:fin] = self.doc_ids[inicio:fin][orden]
+                self.tfs[inicio:fin] = self.tfs[inicio:fin][orden]
+                impactos = impactos[orden]
+            self.impactos[inicio:fin] = impactos
+            tramos.extend(inicio + c for c in cortes[:-1])
+            self.primer_tramo[t + 1] = len(tramos)
+        tramos.append(self.offsets[-1])
+        self.tramos = np.asarray(tramos, dtype=np.int64)
+
+        # Cotas superiores exactas: máxima contribución del término en el tramo
+        n_tramos = len(self.tramos) - 1
+        self.cota_bm25 = np.zeros(n_tramos)
+        self.cota_tfidf = np.zeros(n_tramos)
+        for t in range(n_terminos):
+            for j in range(self.primer_tramo[t], self.primer_tramo[t + 1]):
+                inicio, fin = self.tramos[j], self.tramos[j + 1]
+                if fin > inicio:
+                    self.cota_bm25[j] = self._contribuciones(t, 'bm25', inicio, fin).max()
+                    self.cota_tfidf[j] = self._contribuciones(t, 'tfidf', inicio, fin).max()
+
+    def _contribuciones(self, t, metodo, inicio=None, fin=None, posiciones=None):
+        """
+        Contribución del término t a cada documento de su lista, o solo de
+        los postings [inicio, fin) (un tramo) si se indican. La de BM25 es
+        el impacto precalculado.
+        """
+        if inicio is None:
+            inicio, fin = self.offsets[t], self.offsets[t + 1]
+        docs = self.doc_ids[inicio:fin]
+        tf = self.tfs[inicio:fin]
+        if posiciones is not None:
+            docs, tf = docs[posiciones], tf[posiciones]
+
+        if metodo == 'bm25':
+            impactos = self.impactos[inicio:fin]
+            return impactos if posiciones is None else impactos[posiciones]
+        if metodo == 'tfidf':
+            return (tf / self.longitudes[docs]) * self.idf_tfidf[t]
+        raise ValueError(f"Método desconocido: {metodo}")
+
+    def postings(self, termino):
+        """
+        Devuelve (doc_ids, tfs) del término como vistas, sin copiar. Las
+        listas de más de TAM_TRAMO postings van en orden de tramos.
+        """
+        t = self.vocabulario.get(termino)
+        if t is None:
+            vacio = np.empty(0, dtype=np.int32)
+            return vacio, vacio
+        inicio, fin = self.offsets[t], self.offsets[t + 1]
+        return self.doc_ids[inicio:fin], self.tfs[inicio:fin]
+
+    def postings_por_id(self, t):
+        """Como postings(), pero recibiendo el id del término."""
+        inicio, fin = self.offsets[t], self.offsets[t + 1]
+        return self.doc_ids[inicio:fin], self.tfs[inicio:fin]
+
+    def buscar(self, consulta, k=10, metodo='bm25'):
+        """
+        Devuelve los k documentos más relevantes para la consulta.
+
+        Args:
+            consulta: Texto de la consulta
+            k: Número de resultados
+            metodo: 'bm25' o 'tfidf'
+
+        Returns:
+            list: Tuplas (doc_id, score) ordenadas de mayor a menor score
+        """
+        if not self.construido:
+            self.construir()
+
+        cotas = self.cota_bm25 if metodo == 'bm25' else self.cota_tfidf
+        terminos = sorted({self.vocabulario[p] for p in tokenizar(limpiar_texto(consulta))
+                           if p in self.vocabulario})
+        if not terminos or k <= 0:
+            return []
+
+        # Un bit por término: marcas[d] dice en qué términos ya encontramos
+        # al documento d (0 = no visto). Desde el 12º comparten el último bit
+        bits = {t: np.uint16(1 << min(i, BITS_MARCA - 1)) for i, t in enumerate(terminos)}
+        # Por rondas: el tramo r de cada término (de mayor a menor cota), luego
+        # el r + 1... Así los términos frecuentes avanzan a la vez
+        primeros = {t: int(self.primer_tramo[t]) for t in terminos}
+        tramos = sorted((r, -cotas[j], j, t) for t in terminos
+                        for r, j in enumerate(range(primeros[t], self.primer_tramo[t + 1])))
+        # cola[t][r]: lo máximo que el término t puede dar a un documento que
+        # no esté en sus tramos 0..r-1 (máximo de las cotas desde r)
+        cola = {}
+        for t in terminos:
+            c = cotas[primeros[t]:self.primer_tramo[t + 1]]
+            cola[t] = np.append(np.maximum.accumulate(c[::-1])[::-1], 0.0).tolist()
+        leidos = dict.fromkeys(terminos, 0)
+
+        # sin_bit[i, m]: el término i no está en la combinación de bits m
+        combinaciones = np.arange(1 << min(len(terminos), BITS_MARCA))
+        sin_bit = np.array([(((combinaciones >> min(i, BITS_MARCA - 1)) & 1) == 0)
+                            | (i >= BITS_MARCA - 1 and len(terminos) > BITS_MARCA)
+                            for i in range(len(terminos))], dtype=np.float64)
+
+        def pendiente(docs):
+            """Cota de lo que aún pueden sumar `docs` en los tramos sin leer."""
+            # Si ya encontramos al documento en t, su contribución de t está
+            # completa; si no, puede sumar hasta la cola de t. Una tabla por
+            # combinación de bits, y una sola lectura por documento
+            tabla = np.array([cola[t][leidos[t]] for t in terminos]) @ sin_bit
+            return tabla[marcas[docs]]
+
+        acumulador = self._acumulador
+        marcas = self._marcas
+        # Documentos nuevos de cada tramo (sin repetidos)
+        tocados = [np.empty(0, dtype=self.doc_ids.dtype)]
+        candidatos = None    # se fija al entrar en modo "solo candidatos"
+        top = np.empty(0, dtype=self.doc_ids.dtype)   # k mejores vistos hasta ahora
+        umbral = 0.0         # score del k-ésimo (0 mientras haya menos de k)
+
+        for i, (_, _, j, t) in enumerate(tramos):
+            inicio, fin = self.tramos[j], self.tramos[j + 1]
+            docs = self.doc_ids[inicio:fin]
+            # Un documento nuevo de este tramo suma como mucho su cota más la
+            # cola de los demás términos (en los que todavía no lo vimos)
+            otros = sum(cola[u][leidos[u]] for u in terminos if u != t)
+            if candidatos is None and cotas[j] + otros > umbral:
+                # Modo OR: entran los documentos nuevos que todavía pueden
+                # superar al k-ésimo, y se actualizan los ya vistos
+                contribuciones = self._contribuciones(t, metodo, inicio, fin)
+                marcas_docs = marcas[docs]
+                utiles = (marcas_docs != 0) | (contribuciones + otros > umbral)
+                if not utiles.all():
+                    docs, contribuciones = docs[utiles], contribuciones[utiles]
+                    marcas_docs = marcas_docs[utiles]
+                tocados.append(docs[marcas_docs == 0])
+                marcas[docs] = marcas_docs | bits[t]
+            else:
+                # Ningún documento nuevo llega al k-ésimo: solo se actualizan
+                # los ya vistos (o, en modo MaxScore, los candidatos vivos)
+                if candidatos is not None and len(candidatos) * 16 < len(docs):
+                    # Pocos candidatos: búsqueda binaria en el tramo
+                    pos = np.searchsorted(docs, candidatos)
+                    pos = np.minimum(pos, len(docs) - 1)
+                    pos = pos[docs[pos] == candidatos]
+                else:
+                    # Muchos: recorrer el tramo filtrando por la marca de vivo
+                    pos = np.flatnonzero(marcas[docs])
+                docs = docs[pos]
+                marcas[docs] |= bits[t]
+                contribuciones = self._contribuciones(t, metodo, inicio, fin, pos)
+            scores = acumulador[docs] + contribuciones
+            acumulador[docs] = scores
+            leidos[t] += 1
+
+            # Solo cambió el score de los documentos del tramo: los k mejores
+            # están entre los de antes y los del tramo que superan el umbral
+            entran = scores > umbral
+            if entran.any():
+                mejores_tramo = docs[entran][_k_mejores(scores[entran], k)]
+                top = np.union1d(top, mejores_tramo)
+                top = top[_k_mejores(acumulador[top], k)]
+                if len(top) == k:
+                    umbral = float(acumulador[top].min())
+
+            # Un documento no visto puede sumar, como mucho, la cola de cada
+            # término: si no llega al k-ésimo, seguimos solo con los vistos
+            if candidatos is None and umbral > sum(cola[u][leidos[u]] for u in terminos):
+                candidatos = np.concatenate(tocados)
+            if candidatos is not None and i + 1 < len(tramos):
+                # Con menos cota pendiente, más candidatos quedan descartados
+                vivos = acumulador[candidatos] + pendiente(candidatos) >= umbral
+                marcas[candidatos[~vivos]] = 0
+                candidatos = candidatos[vivos]
+
+        if candidatos is None:
+            candidatos = np.concatenate(tocados)
+        scores = acumulador[candidatos]
+
+        # Heap de tamaño k sobre los candidatos supervivientes
+        mejores = heapq.nlargest(k, zip(scores.tolist(), candidatos.tolist()))
+
+        # Dejamos acumulador y marcas a cero para la próxima consulta
+        for docs in tocados:
+            acumulador[docs] = 0.0
+            marcas[docs] = 0
+
+        # Con idf = 0 (término en todos los documentos, TF-IDF) el score es 0:
+        # el documento no es relevante aunque contenga el término
+        return [(doc, score) for score, doc in mejores if score > 0]
+
+    def memoria_bytes(self):
+        """Memoria ocupada por los arrays del índice."""
+        return sum(a.nbytes for a in (self.doc_ids, self.tfs, self.impactos, self.offsets,
+                                      self.tramos, self.primer_tramo, self.longitudes))
+
+    def __str__(self):
+        return (f"IndiceInvertido({self.n_docs} docs, "
+                f"{len(self.vocabulario)} términos)")
+
+
+# Tamaño del primer tramo de una lista; cada tramo siguiente es 4 veces mayor
+TAM_TRAMO = 1024
+# Bits de las marcas por documento en buscar(): un término por bit
+BITS_MARCA = 12
+
+
+def _cortes_tramos(n):
+    """Límites de los tramos de una lista de n postings: 0, 1024, 5120, ..., n."""
+    cortes = [0]
+    tam = TAM_TRAMO
+    while cortes[-1] + tam < n:
+        cortes.append(cortes[-1] + tam)
+        tam *= 4
+    cortes.append(n)
+    return cortes
+
+
+def _k_mejores(valores, k):
+    """Posiciones de los k valores más grandes (todas si hay menos de k)."""
+    if len(valores) <= k:
+        return np.arange(len(valores))
+    return np.argpartition(valores, len(valores) - k)[len(valores) - k:]
+
+
+# ==============================================================================
+# EJEMPLO 1: BÚSQUEDA EN UN CORPUS PEQUEÑO
+# ==============================================================================
+
+print("=" * 60)
+print("EJEMPLO 1: Índice invertido sobre pocos documentos")
+print("=" * 60)
+
+documentos = [
+    "el gato come pescado",
+    "el perro come carne",
+    "el gato y el perro juegan",
+    "el gato negro duerme en el sofá del salón",
+]
+
+indice = IndiceInvertido()
+indice.agregar_documentos(documentos)
+indice.construir()
+print(indice)
+
+docs_gato, tfs_gato = indice.postings("gato")
+print(f"\nPostings de 'gato': docs={docs_gato.tolist()} tfs={tfs_gato.tolist()}")
+
+for metodo in ('bm25', 'tfidf'):
+    print(f"\nConsulta 'gato perro' ({metodo}):")
+    for doc_id, score in indice.buscar("gato perro", k=3, metodo=metodo):
+        print(f"  {score:.4f}  '{documentos[doc_id]}'")
+
+# "el" está en todos los documentos: idf TF-IDF = log(4/4) = 0, no hay resultados
+print(f"\nConsulta 'el' (tfidf): {indice.buscar('el', metodo='tfidf')}")
+
+# Se pueden añadir documentos después de construir (se reconstruye al buscar)
+indice.agregar_documentos(["un perro negro"])
+print(f"Tras añadir 'un perro negro', 'perro negro' → "
+      f"{indice.buscar('perro negro', k=1)[0][0]}")
+
+
+# ==============================================================================
+# EJEMPLO 2: LATENCIA EN UN CORPUS SINTÉTICO
+# ==============================================================================
+
+print("\n" + "=" * 60)
+print("EJEMPLO 2: Latencia de consulta en un corpus sintético")
+print("=" * 60)
+
+print("""
+Generamos documentos con un vocabulario de frecuencias Zipf (como el
+lenguaje real: pocas palabras muy frecuentes, muchas palabras raras).
+
+Por defecto 20.000 documentos para que el ejemplo sea rápido; el tamaño
+objetivo (1 millón) se mide con:  python 02_indice_invertido_bm25.py 1000000
+
+Con 1 millón de documentos (un núcleo) medimos p50 ≈ 1,2 ms y p99 ≈ 7 ms.
+Las consultas más lentas son las de palabras muy frecuentes ("pal0" está
+en ~95% de los documentos): gracias a los tramos solo se leen unas decenas
+de miles de sus postings, no el millón entero.
+""")
+
+rng = random.Random(42)
+vocab_sintetico = [f"pal{i}" for i in range(20_000)]
+# Pesos acumulados precalculados: choices() no los recalcula en cada llamada
+acumulados_zipf = list(itertools.accumulate(
+    1 / (i + 1) for i in range(len(vocab_sintetico))
+))
+
+n_docs_sinteticos = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+inicio = time.perf_counter()
+corpus = [' '.join(rng.choices(vocab_sintetico, cum_weights=acumulados_zipf, k=30))
+          for _ in range(n_docs_sinteticos)]
+indice_grande = IndiceInvertido()
+indice_grande.agregar_documentos(corpus)
+indice_grande.construir()
+print(f"Índice de {n_docs_sinteticos:,} docs construido en "
+      f"{time.perf_counter() - inicio:.2f} s")
+print(f"Memoria de postings: {indice_grande.memoria_bytes() / 1e6:.1f} MB")
+
+consultas = [' '.join(rng.choices(vocab_sintetico, cum_weights=acumulados_zipf, k=3))
+             for _ in range(500)]
+latencias = []
+for consulta in consultas:
+    t0 = time.perf_counter()
+    indice_grande.buscar(consulta, k=10)
+    latencias.append((time.perf_counter() - t0) * 1000)
+
+latencias.sort()
+p50 = latencias[len(latencias) // 2]
+p99 = latencias[int(len(latencias) * 0.99)]
+print(f"Latencia de consulta: p50 = {p50:.2f} ms, p99 = {p99:.2f} ms")
+
+# Comprobamos que la terminación temprana no cambia el resultado
+consulta = consultas[0]
+rapido = indice_grande.buscar(consulta, k=10)
+exacto = np.zeros(indice_grande.n_docs)
+# Con un corpus pequeño (argv) puede haber palabras de la consulta sin postings
+for t in {indice_grande.vocabulario.get(p) for p in consulta.split()} - {None}:
+    docs, _ = indice_grande.postings_por_id(t)
+    exacto[docs] += indice_grande._contribuciones(t, 'bm25')
+orden_exacto = np.argsort(-exacto, kind='stable')[:10]
+print(f"\nTop-10 con MaxScore == top-10 exhaustivo: "
+      f"{np.allclose(sorted(exacto[orden_exacto]), sorted(s for _, s in rapido))}")
+
+
+print("\n" + "=" * 60)
+print("PRÓXIMO: 03_tfidf_incremental.py")
+print("=" * 60)
@@ -0,0 +1,288 @@
+"""
+================================================================================
+TF-IDF INCREMENTAL: AGREGAR Y ELIMINAR DOCUMENTOS
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (calcular_tfidf)
+
+================================================================================
+EL PROBLEMA
+================================================================================
+
+calcular_tfidf(documentos) recibe TODO el corpus y lo procesa de cero:
+tokeniza, cuenta DF, calcula IDF y pondera cada documento.
+
+Si cada día llegan 1.000 reseñas nuevas a un corpus de 10 millones,
+volver a procesar los 10 millones es desperdiciar el 99.99% del trabajo.
+
+================================================================================
+LA IDEA: GUARDAR LO QUE NO CAMBIA
+================================================================================
+
+TF-IDF(t, d) = TF(t, d) × IDF(t)
+
+- TF(t, d) solo depende del documento d → se calcula UNA vez al agregarlo
+- IDF(t) = log(N / df(t)) = log(N) - log(df(t))
+    · N cambia con cada lote, pero es un solo número
+    · df(t) solo cambia para los términos que aparecen en el lote
+
+Por tanto, al agregar o eliminar documentos:
+1. Actualizamos df solo para los términos del lote (coste ∝ tamaño del lote)
+2. Marcamos esos términos como "sucios"
+3. El IDF se recalcula de forma PEREZOSA (solo cuando alguien lo pide)
+   y solo para los términos sucios
+4. Los vectores de los documentos que no cambiaron se REPONDERAN al vuelo
+   con el IDF actual, sin volver a contar sus palabras
+
+================================================================================
+"""
+
+import math
+import random
+import time
+from collections import Counter
+
+# ==============================================================================
+# VERSIÓN COMPLETA (de 01_introduccion_nlp.py)
+# ==============================================================================
+
+
+def calcular_tfidf(documentos):
+    """Calcula TF-IDF para una colección de documentos (versión completa)."""
+    docs_tokens = [doc.lower().split() for doc in documentos]
+    n_docs = len(documentos)
+
+    df = Counter()
+    for tokens in docs_tokens:
+        for palabra in set(tokens):
+            df[palabra] += 1
+
+    idf = {palabra: math.log(n_docs / freq) for palabra, freq in df.items()}
+
+    tfidf_docs = []
+    for tokens in docs_tokens:
+        tf = Counter(tokens)
+        total_tokens = len(tokens)
+        tfidf_docs.append({palabra: (freq / total_tokens) * idf[palabra]
+                           for palabra, freq in tf.items()})
+
+    return tfidf_docs, idf
+
+
+# ==============================================================================
+# CLASE MODELO TF-IDF INCREMENTAL
+# ==============================================================================
+
+class ModeloTFIDFIncremental:
+    """
+    Modelo TF-IDF que admite agregar y eliminar documentos sin reprocesar
+    el corpus completo.
+
+    Usa el mismo preprocesamiento y la misma fórmula que calcular_tfidf,
+    así que los vectores coinciden exactamente con los de la versión
+    completa sobre los documentos vigentes.
+
+    Atributos:
+        n_docs: Número de documentos vigentes
+        df: Counter término → número de documentos que lo contienen
+    """
+
+    def __init__(self):
+        self.n_docs = 0
+        self.df = Counter()
+
+        self._tf = {}                 # doc_id → {término: frecuencia relativa}
+        self._siguiente_id = 0
+        self._log_df = {}             # caché de log(df) por término
+        self._terminos_sucios = set()  # términos cuyo df cambió desde la caché
+
+    def agregar(self, documentos):
+        """
+        Agrega un lote de documentos.
+
+        Coste proporcional al tamaño del lote: no toca los documentos
+        anteriores ni recalcula el IDF.
+
+        Args:
+            documentos: Iterable de textos
+
+        Returns:
+            list: Ids asignados a los documentos
+        """
+        ids = []
+        for doc in documentos:
+            tokens = doc.lower().split()
+            conteo = Counter(tokens)
+            total = len(tokens)
+
+            doc_id = self._siguiente_id
+            self._siguiente_id += 1
+            self._tf[doc_id] = {p: f / total for p, f in conteo.items()}
+
+            self.df.update(conteo.keys())
+            self._terminos_sucios.update(conteo.keys())
+            self.n_docs += 1
+            ids.append(doc_id)
+        return ids
+
+    def eliminar(self, doc_ids):
+        """
+        Elimina documentos por id.
+
+        Args:
+            doc_ids: Iterable de ids devueltos por agregar()
+
+        Raises:
+            KeyError: Si algún id no existe
+        """
+        for doc_id in doc_ids:
+            tf = self._tf.pop(doc_id)
+            for palabra in tf:
+                self.df[palabra] -= 1
+                if self.df[palabra] == 0:
+                    del self.df[palabra]
+            self._terminos_sucios.update(tf)
+            self.n_docs -= 1
+
+    def _refrescar(self):
+        """Actualiza log(df) solo para los términos que cambiaron."""
+        for palabra in self._terminos_sucios:
+            freq = self.df.get(palabra)
+            if freq:
+                self._log_df[palabra] = math.log(freq)
+            else:
+                self._log_df.pop(palabra, None)
+        self._terminos_sucios.clear()
+
+    def idf(self, palabra):
+        """IDF de un término: log(N) - log(df). 0 si no está en el corpus."""
+        if self._terminos_sucios:
+            self._refrescar()
+        log_df = self._log_df.get(palabra)
+        if log_df is None:
+            return 0.0
+        return math.log(self.n_docs) - log_df
+
+    def tabla_idf(self):
+        """Diccionario término → IDF (se construye bajo demanda)."""
+        if self._terminos_sucios:
+            self._refrescar()
+        log_n = math.log(self.n_docs) if self.n_docs else 0.0
+        return {palabra: log_n - log_df for palabra, log_df in self._log_df.items()}
+
+    def vector(self, doc_id):
+        """
+        Vector TF-IDF de un documento, reponderado con el IDF actual.
+
+        El TF se calculó una sola vez en agregar(); aquí solo se multiplica.
+        """
+        if self.n_docs == 0:
+            return {}
+        if self._terminos_sucios:
+            self._refrescar()
+        log_n = math.log(self.n_docs)
+        return {palabra: tf * (log_n - self._log_df[palabra])
+                for palabra, tf in self._tf[doc_id].items()}
+
+    def vectores(self):
+        """Genera (doc_id, vector) para todos los documentos vigentes."""
+        for doc_id in self._tf:
+            yield doc_id, self.vector(doc_id)
+
+    def __len__(self):
+        return self.n_docs
+
+    def __str__(self):
+        return f"ModeloTFIDFIncremental({self.n_docs} docs, {len(self.df)} términos)"
+
+
+# ==============================================================================
+# EJEMPLO 1: MISMO RESULTADO QUE calcular_tfidf
+# ==============================================================================
+
+print("=" * 60)
+print("EJEMPLO 1: Agregar y eliminar documentos")
+print("=" * 60)
+
+documentos = [
+    "el gato come pescado",
+    "el perro come carne",
+    "el gato y el perro juegan"
+]
+
+modelo = ModeloTFIDFIncremental()
+ids = modelo.agregar(documentos)
+print(modelo)
+print(f"IDF de 'gato': {modelo.idf('gato'):.3f}")
+
+# Llega un lote nuevo
+nuevos = ["el pájaro come semillas", "el gato duerme"]
+ids_nuevos = modelo.agregar(nuevos)
+print(f"\nDespués de agregar {len(nuevos)} documentos: {modelo}")
+print(f"IDF de 'gato': {modelo.idf('gato'):.3f}")
+
+# Eliminamos el primer documento
+modelo.eliminar([ids[0]])
+print(f"\nDespués de eliminar el documento {ids[0]}: {modelo}")
+
+vigentes = documentos[1:] + nuevos
+esperado, _ = calcular_tfidf(vigentes)
+coincide = all(
+    modelo.vector(doc_id).keys() == vec.keys()
+    and all(abs(modelo.vector(doc_id)[p] - v) < 1e-12 for p, v in vec.items())
+    for doc_id, vec in zip(ids[1:] + ids_nuevos, esperado)
+)
+print(f"¿Coincide con calcular_tfidf sobre los documentos vigentes? {coincide}")
+
+print(f"\nVector de '{nuevos[1]}':")
+for palabra, valor in sorted(modelo.vector(ids_nuevos[1]).items(),
+                             key=lambda x: x[1], reverse=True):
+    print(f"  {palabra}: {valor:.3f}")
+
+
+# ==============================================================================
+# EJEMPLO 2: COSTE DE ACTUALIZAR VS RECALCULAR
+# ==============================================================================
+
+print("\n" + "=" * 60)
+print("EJEMPLO 2: Actualización incremental vs recálculo completo")
+print("=" * 60)
+
+rng = random.Random(42)
+palabras = [f"pal{i}" for i in range(5_000)]
+
+
+def generar_reseñas(n):
+    return [' '.join(rng.choices(palabras, k=20)) for _ in range(n)]
+
+
+corpus = generar_reseñas(50_000)
+lote = generar_reseñas(500)
+
+modelo = ModeloTFIDFIncremental()
+modelo.agregar(corpus)
+
+inicio = time.perf_counter()
+calcular_tfidf(corpus + lote)
+tiempo_completo = time.perf_counter() - inicio
+
+inicio = time.perf_counter()
+modelo.agregar(lote)
+modelo.tabla_idf()
+tiempo_incremental = time.perf_counter() - inicio
+
+print(f"Corpus: {len(corpus)} docs, lote nuevo: {len(lote)} docs")
+print(f"Recalcular todo con calcular_tfidf: {tiempo_completo * 1000:8.1f} ms")
+print(f"Agregar lote + refrescar IDF:       {tiempo_incremental * 1000:8.1f} ms")
+print(f"Aceleración: {tiempo_completo / tiempo_incremental:.0f}x")
+
+print("""
+Los vectores del resto del corpus no se recalculan: modelo.vector(doc_id)
+los repondera con el IDF vigente en el momento en que se piden.
+""")
+
+
+print("=" * 60)
+print("PRÓXIMO: 04_similitud_coseno_topk.py")
+print("=" * 60)
@@ -0,0 +1,409 @@
+"""
+================================================================================
+SIMILITUD COSENO POR LOTES: TOP-K Y TODOS LOS PARES
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (calcular_tfidf)
+- 01-Analisis-Datos/01_numpy_fundamentos.py
+
+================================================================================
+SIMILITUD COSENO
+================================================================================
+
+Dos documentos son parecidos si sus vectores TF-IDF apuntan en la misma
+dirección:
+
+    cos(a, b) = (a · b) / (||a|| · ||b||)
+
+Si normalizamos cada vector a longitud 1 (norma L2), el coseno es
+simplemente el producto punto. Y el producto punto de TODAS las consultas
+contra TODOS los documentos es un producto de matrices:
+
+    S = Q · Xᵀ        (S[i, j] = similitud entre consulta i y documento j)
+
+================================================================================
+¿POR QUÉ NO COMPARAR DICCIONARIOS?
+================================================================================
+
+Comparar dicts por pares en Python cuesta ~microsegundos por par.
+100.000 × 100.000 = 10.000 millones de pares → días.
+
+La versión por lotes:
+1. Guarda los vectores como matriz DISPERSA en formato CSR
+   (la mayoría de las palabras no aparecen en cada documento)
+2. Toma un BLOQUE de consultas, lo convierte a denso SOLO en los términos
+   que aparecen en el bloque (no en todo el vocabulario) y lo multiplica
+   contra un TROZO de documentos a la vez → memoria acotada
+3. Mantiene solo los k mejores por consulta con np.argpartition (O(n)),
+   sin ordenar la fila completa
+
+FORMATO CSR (Compressed Sparse Row):
+    indptr:  la fila i ocupa las posiciones indptr[i]:indptr[i+1]
+    indices: columna (id de término) de cada valor no nulo
+    data:    valor no nulo
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import math
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+# ==============================================================================
+# MATRIZ DISPERSA CSR
+# ==============================================================================
+
+
+class MatrizCSR:
+    """
+    Matriz dispersa en formato CSR con arrays NumPy.
+
+    Atributos:
+        indptr: int64 de longitud n_filas + 1
+        indices: int32, columna de cada valor
+        data: float32, valores no nulos
+        forma: (n_filas, n_columnas)
+    """
+
+    def __init__(self, indptr, indices, data, forma):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.data = np.asarray(data, dtype=np.float32)
+        self.forma = forma
+
+    @property
+    def n_filas(self):
+        return self.forma[0]
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def filas(self, inicio, fin):
+        """Submatriz con las filas [inicio, fin) (vistas, sin copiar data)."""
+        a, b = self.indptr[inicio], self.indptr[fin]
+        return MatrizCSR(self.indptr[inicio:fin + 1] - a, self.indices[a:b],
+                         self.data[a:b], (fin - inicio, self.forma[1]))
+
+    def copia(self):
+        return MatrizCSR(self.indptr.copy(), self.indices.copy(), self.data.copy(), self.forma)
+
+    def __str__(self):
+        return f"MatrizCSR({self.forma[0]}×{self.forma[1]}, nnz={self.nnz})"
+
+
+def tfidf_csr(documentos):
+    """
+    Calcula TF-IDF (misma fórmula que calcular_tfidf) directamente en CSR.
+
+    Returns:
+        tuple: (MatrizCSR, vocabulario dict término → columna)
+    """
+    docs_conteos = [Counter(doc.lower().split()) for doc in documentos]
+    n_docs = len(documentos)
+
+    vocabulario = {}
+    df = Counter()
+    for conteo in docs_conteos:
+        df.update(conteo.keys())
+        for palabra in conteo:
+            vocabulario.setdefault(palabra, len(vocabulario))
+
+    idf = np.zeros(len(vocabulario), dtype=np.float32)
+    for palabra, freq in df.items():
+        idf[vocabulario[palabra]] = math.log(n_docs / freq)
+
+    indptr = [0]
+    indices, data = [], []
+    for conteo in docs_conteos:
+        total = sum(conteo.values())
+        for palabra, freq in conteo.items():
+            indices.append(vocabulario[palabra])
+            data.append(freq / total)
+        indptr.append(len(indices))
+
+    matriz = MatrizCSR(indptr, indices, data, (n_docs, len(vocabulario)))
+    matriz.data *= idf[matriz.indices]
+    return matriz, vocabulario
+
+
+def normalizar_l2(matriz):
+    """Normaliza cada fila a norma L2 = 1 (en el sitio). Filas vacías: 0."""
+    cuadrados = np.zeros(matriz.n_filas, dtype=np.float32)
+    no_vacias = np.diff(matriz.indptr) > 0
+    if matriz.nnz:
+        sumas = np.add.reduceat(matriz.data ** 2, matriz.indptr[:-1][no_vacias])
+        cuadrados[no_vacias] = sumas
+    normas = np.sqrt(cuadrados)
+    normas[normas == 0] = 1.0
+    matriz.data /= np.repeat(normas, np.diff(matriz.indptr))
+    return matriz
+
+
+# ==============================================================================
+# MOTOR DE SIMILITUD
+# ==============================================================================
+
+class MotorSimilitud:
+    """
+    Búsqueda de documentos similares por similitud coseno, en bloques.
+
+    Uso:
+        motor = MotorSimilitud(matriz_tfidf)
+        indices, scores = motor.top_k(consultas, k=10)
+        for i, j, sim in motor.todos_los_pares(umbral=0.8): ...
+
+    La memoria de trabajo está acotada por memoria_mb, sin importar
+    cuántos documentos haya ni el tamaño del vocabulario (más un array
+    int32 fijo de n_columnas para traducir términos).
+    """
+
+    def __init__(self, matriz, tam_bloque=256, memoria_mb=64):
+        """
+        Args:
+            matriz: MatrizCSR con los documentos (se normaliza en el sitio)
+            tam_bloque: Consultas procesadas a la vez
+            memoria_mb: Memoria máxima para el producto intermedio
+        """
+        self.matriz = normalizar_l2(matriz)
+        self.tam_bloque = tam_bloque
+        self.memoria_bytes = memoria_mb * 1024 * 1024
+        # Fila del bloque denso de cada término; 0 = fila de ceros (el
+        # término no aparece en el bloque de consultas actual)
+        self._posicion = np.zeros(matriz.forma[1], dtype=np.int32)
+
+    def _densas(self, bloque):
+        """
+        Bloque de consultas denso y traspuesto, restringido a sus términos:
+        (n_terminos_bloque + 1) × n_consultas, con la fila 0 a cero.
+        Deja en self._posicion la fila de cada término (liberar_densas()
+        la restaura).
+        """
+        terminos = np.unique(bloque.indices)
+        self._posicion[terminos] = np.arange(1, len(terminos) + 1)
+        densas = np.zeros((len(terminos) + 1, bloque.n_filas), dtype=np.float32)
+        filas = np.repeat(np.arange(bloque.n_filas), np.diff(bloque.indptr))
+        densas[self._posicion[bloque.indices], filas] = bloque.data
+        return densas, terminos
+
+    def _liberar_densas(self, terminos):
+        self._posicion[terminos] = 0
+
+    def _trozos(self, densas, inicio=0):
+        """
+        Divide los documentos en trozos de filas cuyo producto intermedio
+        (nnz_trozo × tam_bloque floats) cabe en el presupuesto de memoria,
+        descontando lo que ocupa el bloque de consultas denso.
+        """
+        disponible = self.memoria_bytes - densas.nbytes
+        max_nnz = max(1, disponible // (4 * densas.shape[1]))
+        indptr = self.matriz.indptr
+        n = self.matriz.n_filas
+        while inicio < n:
+            fin = int(np.searchsorted(indptr, indptr[inicio] + max_nnz, side='right')) - 1
+            fin = min(max(fin, inicio + 1), n)
+            yield inicio, fin
+            inicio = fin
+
+    def _similitudes(self, consultas_densas, inicio, fin):
+        """
+        Producto disperso × denso: similitud de las filas [inicio, fin)
+        contra el bloque de consultas. Devuelve (n_consultas × (fin - inicio)).
+        """
+        trozo = self.matriz.filas(inicio, fin)
+        resultado = np.zeros((fin - inicio, consultas_densas.shape[1]), dtype=np.float32)
+        if trozo.nnz == 0:
+            return resultado.T
+
+        # Cada valor no nulo (fila, término) aporta data × fila del término
+        # (la fila de ceros si ninguna consulta del bloque tiene el término)
+        productos = consultas_densas[self._posicion[trozo.indices]]
+        productos *= trozo.data[:, None]
+
+        # Suma por fila del documento; reduceat no admite filas vacías
+        no_vacias = np.diff(trozo.indptr) > 0
+        resultado[no_vacias] = np.add.reduceat(
+            productos, trozo.indptr[:-1][no_vacias], axis=0
+        )
+        return resultado.T
+
+    def top_k(self, consultas, k=10):
+        """
+        Los k documentos más similares a cada consulta.
+
+        Args:
+            consultas: MatrizCSR con las mismas columnas que los documentos
+                       (no se modifica: se normaliza una copia)
+            k: Resultados por consulta (>= 1)
+
+        Returns:
+            tuple: (indices int64 n_consultas × k, scores float32 n_consultas × k),
+                   ordenados de mayor a menor similitud
+        """
+        if k <= 0:
+            raise ValueError(f"k debe ser al menos 1, se recibió {k}")
+        # Copia: las consultas pueden ser vistas de la propia matriz de documentos
+        consultas = normalizar_l2(consultas.copia())
+        k = min(k, self.matriz.n_filas)
+        todos_indices = np.empty((consultas.n_filas, k), dtype=np.int64)
+        todos_scores = np.empty((consultas.n_filas, k), dtype=np.float32)
+
+        for q0 in range(0, consultas.n_filas, self.tam_bloque):
+            q1 = min(q0 + self.tam_bloque, consultas.n_filas)
+            densas, terminos = self._densas(consultas.filas(q0, q1))
+
+            mejores_scores = np.full((q1 - q0, 0), -np.inf, dtype=np.float32)
+            mejores_indices = np.empty((q1 - q0, 0), dtype=np.int64)
+
+            for inicio, fin in self._trozos(densas):
+                sims = self._similitudes(densas, inicio, fin)
+                scores = np.hstack([mejores_scores, sims])
+                indices = np.hstack([
+                    mejores_indices,
+                    np.broadcast_to(np.arange(inicio, fin), sims.shape),
+                ])
+                if scores.shape[1] > k:
+                    # argpartition: los k mayores en O(n), sin ordenar el resto
+                    sel = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                    scores = np.take_along_axis(scores, sel, axis=1)
+                    indices = np.take_along_axis(indices, sel, axis=1)
+                mejores_scores, mejores_indices = scores, indices
+            self._liberar_densas(terminos)
+
+            orden = np.argsort(-mejores_scores, axis=1, kind='stable')
+            todos_scores[q0:q1] = np.take_along_axis(mejores_scores, orden, axis=1)
+            todos_indices[q0:q1] = np.take_along_axis(mejores_indices, orden, axis=1)
+
+        return todos_indices, todos_scores
+
+    def todos_los_pares(self, umbral=0.8):
+        """
+        Genera todos los pares de documentos (i < j) con similitud >= umbral.
+
+        Cada bloque de filas solo se compara con los documentos posteriores,
+        así que se calcula la mitad de la matriz de similitud.
+
+        Yields:
+            tuple: (i, j, similitud) como arrays NumPy del mismo largo
+        """
+        n = self.matriz.n_filas
+        for q0 in range(0, n, self.tam_bloque):
+            q1 = min(q0 + self.tam_bloque, n)
+            densas, terminos = self._densas(self.matriz.filas(q0, q1))
+            filas_bloque = np.arange(q0, q1)[:, None]
+
+            # finally: aunque quien consume el generador pare antes
+            try:
+                for inicio, fin in self._trozos(densas, q0):
+                    sims = self._similitudes(densas, inicio, fin)
+                    columnas = np.arange(inicio, fin)[None, :]
+                    mascara = (sims >= umbral) & (columnas > filas_bloque)
+                    i, j = np.nonzero(mascara)
+                    if len(i):
+                        yield i + q0, j + inicio, sims[i, j]
+            finally:
+                self._liberar_densas(terminos)
+
+
+# ==============================================================================
+# EJEMPLO 1: DOCUMENTOS SIMILARES
+# ==============================================================================
+
+print("=" * 60)
+print("EJEMPLO 1: Documentos más similares")
+print("=" * 60)
+
+documentos = [
+    "el gato come pescado fresco",
+    "el perro come carne",
+    "el gato y el perro juegan",
+    "el gato come pescado",
+    "el perro juega con el gato",
+]
+
+matriz, vocabulario = tfidf_csr(documentos)
+print(matriz)
+
+motor = MotorSimilitud(matriz, tam_bloque=2)
+indices, scores = motor.top_k(matriz.filas(0, matriz.n_filas), k=2)
+for i, doc in enumerate(documentos):
+    # El más similar es el propio documento; mostramos el segundo
+    j, s = indices[i, 1], scores[i, 1]
+    print(f"  '{doc}'\n     → '{documentos[j]}' ({s:.3f})")
+
+print("\nPares con similitud >= 0.5:")
+for filas, columnas, sims in motor.todos_los_pares(umbral=0.5):
+    for i, j, s in zip(filas, columnas, sims):
+        print(f"  {s:.3f}  '{documentos[i]}'  ~  '{documentos[j]}'")
+
+
+# ==============================================================================
+# EJEMPLO 2: COMPARACIÓN CON DICCIONARIOS Y ESCALA
+# ==============================================================================
+
+print("\n" + "=" * 60)
+print("EJEMPLO 2: Por lotes vs comparar diccionarios por pares")
+print("=" * 60)
+
+
+def coseno_dicts(a, b):
+    """Similitud coseno entre dos vectores representados como dicts."""
+    punto = sum(v * b.get(p, 0.0) for p, v in a.items())
+    norma_a = math.sqrt(sum(v * v for v in a.values()))
+    norma_b = math.sqrt(sum(v * v for v in b.values()))
+    if norma_a == 0 or norma_b == 0:
+        return 0.0
+    return punto / (norma_a * norma_b)
+
+
+rng = random.Random(42)
+palabras = [f"pal{i}" for i in range(5_000)]
+n = 4_000
+corpus = [' '.join(rng.choices(palabras, k=25)) for _ in range(n)]
+
+matriz, vocabulario = tfidf_csr(corpus)
+columnas = {c: p for p, c in vocabulario.items()}
+
+
+def fila_a_dict(i):
+    """Vector TF-IDF del documento i como dict (la representación original)."""
+    a, b = matriz.indptr[i], matriz.indptr[i + 1]
+    return {columnas[c]: float(v) for c, v in zip(matriz.indices[a:b], matriz.data[a:b])}
+
+
+dicts = [fila_a_dict(i) for i in range(50)]
+
+inicio = time.perf_counter()
+for a in dicts:
+    for b in dicts:
+        coseno_dicts(a, b)
+tiempo_par = (time.perf_counter() - inicio) / len(dicts) ** 2
+
+motor = MotorSimilitud(matriz)
+inicio = time.perf_counter()
+indices, scores = motor.top_k(matriz.filas(0, n), k=10)
+tiempo_lotes = time.perf_counter() - inicio
+
+sim_dict = coseno_dicts(dicts[0], fila_a_dict(int(indices[0, 1])))
+print(f"Similitud doc 0 ~ doc {indices[0, 1]}: lotes = {scores[0, 1]:.5f}, "
+      f"dicts = {sim_dict:.5f}")
+
+print(f"\n{n}×{n} pares por lotes:   {tiempo_lotes:.2f} s")
+print(f"{n}×{n} pares con dicts:    {tiempo_par * n * n:.0f} s (estimado)")
+
+escala = (100_000 / n) ** 2
+print(f"\nExtrapolado a 100k×100k:")
+print(f"  Por lotes: {tiempo_lotes * escala / 60:.0f} min")
+print(f"  Con dicts: {tiempo_par * 1e10 / 86400:.1f} días")
+
+
+print("\n" + "=" * 60)
+print("PRÓXIMO: 05_minhash_lsh_duplicados.py")
+print("=" * 60)
@@ -0,0 +1,350 @@
+"""
+================================================================================
+DETECCIÓN DE CASI-DUPLICADOS CON MINHASH Y LSH
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (tokenización, TF-IDF, sentimiento)
+
+================================================================================
+EL PROBLEMA
+================================================================================
+
+Los feeds de reseñas están llenos de textos casi idénticos (copias, spam,
+plantillas con una palabra cambiada). Además de ser ruido, distorsionan:
+- El DF de calcular_tfidf (una palabra "rara" repetida 500 veces ya no es rara)
+- Las estadísticas de analizar_sentimiento (una opinión cuenta 500 veces)
+
+Comparar cada par de documentos es O(n²): con 1 millón de reseñas son
+500.000 millones de comparaciones.
+
+================================================================================
+SIMILITUD DE JACCARD Y SHINGLES
+================================================================================
+
+Representamos cada documento como el CONJUNTO de sus shingles
+(secuencias de k palabras consecutivas):
+
+    "el gato come pescado" (k=2) → {"el gato", "gato come", "come pescado"}
+
+    Jaccard(A, B) = |A ∩ B| / |A ∪ B|
+
+================================================================================
+MINHASH: UNA FIRMA QUE ESTIMA JACCARD
+================================================================================
+
+Si aplicamos una función hash aleatoria h a todos los shingles y nos
+quedamos con el MÍNIMO, se cumple algo sorprendente:
+
+    P[min h(A) == min h(B)] = Jaccard(A, B)
+
+Con 128 funciones hash distintas obtenemos una FIRMA de 128 números;
+la fracción de posiciones iguales entre dos firmas estima su Jaccard.
+Con NumPy calculamos las 128 funciones sobre todos los shingles de una vez.
+
+================================================================================
+LSH: BUSCAR SOLO DONDE PUEDE HABER DUPLICADOS
+================================================================================
+
+Dividimos la firma en b BANDAS de r filas. Dos documentos son CANDIDATOS
+si coinciden en al menos una banda completa:
+
+    P[candidatos] = 1 - (1 - J^r)^b
+
+Esta curva en forma de S tiene su umbral en J ≈ (1/b)^(1/r). Eligiendo b y r
+ajustamos el umbral de Jaccard. Cada banda es una tabla hash, así que
+encontrar candidatos cuesta O(n) en lugar de O(n²).
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import random
+import time
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+# ==============================================================================
+# SHINGLES
+# ==============================================================================
+
+
+def shingles(texto, k=3):
+    """
+    Conjunto de shingles de k palabras de un texto.
+
+    Los textos con menos de k palabras producen un único shingle con todo
+    el texto.
+    """
+    tokens = texto.lower().split()
+    if len(tokens) < k:
+        return {' '.join(tokens)}
+    return {' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+def jaccard(a, b):
+    """Similitud de Jaccard exacta entre dos conjuntos."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+# ==============================================================================
+# GENERADOR DE FIRMAS MINHASH
+# ==============================================================================
+
+class GeneradorMinHash:
+    """
+    Calcula firmas MinHash vectorizadas con NumPy.
+
+    Cada "permutación" es una función hash multiply-shift:
+
+        h_i(x) = ((a_i · x + b_i) mod 2⁶⁴) >> 32
+
+    con a_i impar y aleatorio. La aritmética uint64 de NumPy desborda
+    módulo 2⁶⁴, así que las n_permutaciones se evalúan sobre todos los
+    shingles en una sola operación de matrices.
+    """
+
+    def __init__(self, n_permutaciones=128, k_shingle=3, semilla=42):
+        """
+        Args:
+            n_permutaciones: Longitud de la firma
+            k_shingle: Palabras por shingle
+            semilla: Semilla para que las firmas sean reproducibles
+        """
+        self.n_permutaciones = n_permutaciones
+        self.k_shingle = k_shingle
+
+        rng = np.random.default_rng(semilla)
+        self._a = rng.integers(1, 2**63, n_permutaciones, dtype=np.uint64) * 2 + 1
+        self._b = rng.integers(0, 2**63, n_permutaciones, dtype=np.uint64)
+
+    def _hashes_base(self, texto):
+        """Hash estable (crc32) de cada shingle del texto."""
+        return np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) for s in shingles(texto, self.k_shingle)),
+            dtype=np.uint64,
+        )
+
+    def firma(self, texto):
+        """Firma MinHash de un texto: uint32 de longitud n_permutaciones."""
+        x = self._hashes_base(texto)
+        # (n_permutaciones × n_shingles) en una operación
+        h = (np.outer(self._a, x) + self._b[:, None]) >> np.uint64(32)
+        return h.min(axis=1).astype(np.uint32)
+
+    def firmas(self, textos):
+        """Firmas de varios textos: matriz (n_textos × n_permutaciones)."""
+        resultado = np.empty((len(textos), self.n_permutaciones), dtype=np.uint32)
+        for i, texto in enumerate(textos):
+            resultado[i] = self.firma(texto)
+        return resultado
+
+
+def jaccard_estimado(firma_a, firma_b):
+    """Fracción de posiciones iguales entre dos firmas ≈ Jaccard."""
+    return float(np.mean(firma_a == firma_b))
+
+
+# ==============================================================================
+# ÍNDICE LSH POR BANDAS
+# ==============================================================================
+
+def elegir_bandas(n_permutaciones, umbral):
+    """
+    Elige (bandas, filas) con bandas × filas == n_permutaciones cuyo umbral
+    teórico (1/b)^(1/r) está más cerca del umbral de Jaccard pedido.
+    """
+    opciones = [(b, n_permutaciones // b) for b in range(1, n_permutaciones + 1)
+                if n_permutaciones % b == 0]
+    return min(opciones, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - umbral))
+
+
+class IndiceLSH:
+    """
+    Índice LSH: una tabla hash por banda de la firma.
+
+    Uso:
+        indice = IndiceLSH(n_permutaciones=128, umbral=0.8)
+        indice.insertar(doc_id, firma)
+        indice.candidatos(firma)  → ids que comparten alguna banda
+    """
+
+    def __init__(self, n_permutaciones=128, umbral=0.8):
+        """
+        Args:
+            n_permutaciones: Longitud de las firmas que se insertarán
+            umbral: Jaccard a partir del cual queremos detectar duplicados
+        """
+        self.umbral = umbral
+        self.bandas, self.filas = elegir_bandas(n_permutaciones, umbral)
+        self.tablas = [defaultdict(list) for _ in range(self.bandas)]
+        self.firmas = {}
+
+    def _claves(self, firma):
+        """Una clave (bytes de la banda) por banda."""
+        r = self.filas
+        return [firma[i * r:(i + 1) * r].tobytes() for i in range(self.bandas)]
+
+    def candidatos(self, firma):
+        """Ids que coinciden con la firma en al menos una banda."""
+        encontrados = set()
+        for tabla, clave in zip(self.tablas, self._claves(firma)):
+            encontrados.update(tabla.get(clave, ()))
+        return encontrados
+
+    def insertar(self, doc_id, firma):
+        """Añade la firma del documento a todas las bandas."""
+        self.firmas[doc_id] = firma
+        for tabla, clave in zip(self.tablas, self._claves(firma)):
+            tabla[clave].append(doc_id)
+
+    def duplicados_de(self, firma):
+        """Candidatos cuyo Jaccard estimado supera el umbral."""
+        return [doc_id for doc_id in self.candidatos(firma)
+                if jaccard_estimado(firma, self.firmas[doc_id]) >= self.umbral]
+
+    def __str__(self):
+        return (f"IndiceLSH({len(self.firmas)} docs, {self.bandas} bandas × "
+                f"{self.filas} filas, umbral≈{(1 / self.bandas) ** (1 / self.filas):.2f})")
+
+
+# ==============================================================================
+# CLUSTERS DE DUPLICADOS Y DEDUPLICACIÓN EN STREAMING
+# ==============================================================================
+
+def agrupar_duplicados(textos, umbral=0.8, n_permutaciones=128, k_shingle=3):
+    """
+    Agrupa los textos en clusters de casi-duplicados.
+
+    Los pares candidatos de LSH que superan el umbral se unen con
+    Union-Find, así que la duplicación es transitiva.
+
+    Returns:
+        list: Clusters (listas de índices) con 2 o más textos
+    """
+    generador = GeneradorMinHash(n_permutaciones, k_shingle)
+    indice = IndiceLSH(n_permutaciones, umbral)
+    padre = list(range(len(textos)))
+
+    def raiz(i):
+        while padre[i] != i:
+            padre[i] = padre[padre[i]]
+            i = padre[i]
+        return i
+
+    for i, texto in enumerate(textos):
+        firma = generador.firma(texto)
+        for j in indice.duplicados_de(firma):
+            padre[raiz(i)] = raiz(j)
+        indice.insertar(i, firma)
+
+    grupos = defaultdict(list)
+    for i in range(len(textos)):
+        grupos[raiz(i)].append(i)
+    return [grupo for grupo in grupos.values() if len(grupo) > 1]
+
+
+def filtrar_duplicados(textos, umbral=0.8, n_permutaciones=128, k_shingle=3):
+    """
+    Etapa de deduplicación en streaming: deja pasar solo el primer texto
+    de cada grupo de casi-duplicados.
+
+    Es un generador, así que puede ir antes de la vectorización sin cargar
+    el corpus completo en memoria:
+
+        vectores = calcular_tfidf(list(filtrar_duplicados(reseñas)))
+
+    Yields:
+        str: Textos que no son casi-duplicados de uno anterior
+    """
+    generador = GeneradorMinHash(n_permutaciones, k_shingle)
+    indice = IndiceLSH(n_permutaciones, umbral)
+    for i, texto in enumerate(textos):
+        firma = generador.firma(texto)
+        if not indice.duplicados_de(firma):
+            indice.insertar(i, firma)
+            yield texto
+
+
+# ==============================================================================
+# EJEMPLO 1: JACCARD EXACTO VS ESTIMADO
+# ==============================================================================
+
+print("=" * 60)
+print("EJEMPLO 1: MinHash estima la similitud de Jaccard")
+print("=" * 60)
+
+a = "este producto es excelente lo recomiendo totalmente a todos mis amigos"
+b = "este producto es excelente lo recomiendo totalmente a toda mi familia"
+c = "terrible experiencia muy malo el servicio no lo recomiendo"
+
+generador = GeneradorMinHash(n_permutaciones=256)
+for x, y in [(a, b), (a, c)]:
+    exacto = jaccard(shingles(x), shingles(y))
+    estimado = jaccard_estimado(generador.firma(x), generador.firma(y))
+    print(f"  '{x[:30]}...' vs '{y[:30]}...'")
+    print(f"     Jaccard exacto: {exacto:.3f}   MinHash: {estimado:.3f}")
+
+print("\nUmbral de Jaccard → bandas × filas (128 permutaciones):")
+for umbral in (0.5, 0.7, 0.8, 0.9):
+    bandas, filas = elegir_bandas(128, umbral)
+    print(f"  {umbral:.1f} → {bandas:3d} × {filas:3d}  "
+          f"(umbral real ≈ {(1 / bandas) ** (1 / filas):.2f})")
+
+
+# ==============================================================================
+# EJEMPLO 2: CLUSTERS EN UN FEED CON DUPLICADOS
+# ==============================================================================
+
+print("\n" + "=" * 60)
+print("EJEMPLO 2: Clusters de reseñas casi duplicadas")
+print("=" * 60)
+
+rng = random.Random(42)
+palabras = [f"pal{i}" for i in range(3_000)]
+originales = [' '.join(rng.choices(palabras, k=30)) for _ in range(3_000)]
+
+
+def variante(texto):
+    """Copia del texto con una palabra cambiada (spam típico)."""
+    tokens = texto.split()
+    tokens[rng.randrange(len(tokens))] = rng.choice(palabras)
+    return ' '.join(tokens)
+
+
+feed = list(originales)
+for i in range(0, 3_000, 10):
+    feed.extend(variante(originales[i]) for _ in range(3))
+rng.shuffle(feed)
+print(f"Feed: {len(feed)} reseñas ({len(feed) - len(originales)} son variantes)")
+
+inicio = time.perf_counter()
+clusters = agrupar_duplicados(feed, umbral=0.7)
+tiempo_lsh = time.perf_counter() - inicio
+print(f"\nMinHash + LSH: {len(clusters)} clusters en {tiempo_lsh:.2f} s")
+print(f"Tamaños de cluster: {sorted({len(c) for c in clusters})}")
+
+conjuntos = [shingles(t) for t in feed[:500]]
+inicio = time.perf_counter()
+for i in range(len(conjuntos)):
+    for j in range(i + 1, len(conjuntos)):
+        jaccard(conjuntos[i], conjuntos[j])
+tiempo_par = (time.perf_counter() - inicio) / (len(conjuntos) * (len(conjuntos) - 1) / 2)
+n = len(feed)
+print(f"Todos los pares exactos: {tiempo_par * n * (n - 1) / 2:.1f} s (estimado)")
+
+inicio = time.perf_counter()
+unicos = list(filtrar_duplicados(feed, umbral=0.7))
+print(f"\nfiltrar_duplicados: {len(feed)} → {len(unicos)} reseñas "
+      f"en {time.perf_counter() - inicio:.2f} s")
+
+
+print("\n" + "=" * 60)
+print("PRÓXIMO: 06_sentimiento_por_lotes.py")
+print("=" * 60)
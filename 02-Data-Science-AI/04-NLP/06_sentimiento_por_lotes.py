@@ -0,0 +1,466 @@
+"""
+================================================================================
+ANÁLISIS DE SENTIMIENTO POR LOTES (ALTO RENDIMIENTO)
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (analizar_sentimiento)
+- 01-Analisis-Datos/01_numpy_fundamentos.py
+
+================================================================================
+LIMITACIONES DE analizar_sentimiento
+================================================================================
+
+    texto = texto.lower()
+    tokens = set(texto.split())
+    positivas = len(tokens & PALABRAS_POSITIVAS)
+
+1. Procesa UN texto por llamada: millones de llamadas a funciones Python
+2. Crea un set nuevo por texto
+3. split() deja la puntuación pegada: "excelente," NO está en el léxico,
+   así que "Este producto es excelente, lo recomiendo" pierde una palabra
+
+================================================================================
+LA VERSIÓN POR LOTES
+================================================================================
+
+1. TOKENIZAMOS TODO EL LOTE DE UNA VEZ, sin bucle de Python por texto ni
+   por token: unimos los textos, los pasamos a un array de puntos de código
+   y una tabla dice qué caracteres forman tokens (y su minúscula). Los
+   tokens son los tramos seguidos de esos caracteres: la puntuación separa
+2. Cada token se convierte en su ID con un HASH de 64 bits calculado con
+   NumPy (Σ carácter · baseᵖᵒˢ), un filtro por sus bits bajos y búsqueda
+   binaria en los hashes del vocabulario; los aciertos se confirman
+   comparando los caracteres
+3. El léxico se convierte en una TABLA DE POLARIDAD indexada por ID:
+
+       polaridad[id] = +1 (positiva), -1 (negativa), 0 (neutral)
+
+4. Un lote de textos es un array plano de IDs + offsets (dónde empieza
+   cada texto). Puntuar todo el lote es:
+
+       polaridad[ids]                      → un lookup vectorizado
+       np.bincount(doc_de_cada_token, ...) → suma por documento
+
+5. Para lotes enormes repartimos los trozos entre varios procesos
+   (multiprocessing); cada proceso tokeniza y puntúa su trozo.
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import multiprocessing
+import random
+import re
+import time
+
+import numpy as np
+
+# ==============================================================================
+# LÉXICO Y VERSIÓN ORIGINAL (de 01_introduccion_nlp.py)
+# ==============================================================================
+
+PALABRAS_POSITIVAS = {
+    'bueno', 'excelente', 'genial', 'increíble', 'fantástico',
+    'amor', 'feliz', 'alegre', 'mejor', 'maravilloso', 'encanta',
+    'recomiendo', 'perfecto', 'útil', 'fácil'
+}
+
+PALABRAS_NEGATIVAS = {
+    'malo', 'terrible', 'horrible', 'pésimo', 'peor',
+    'odio', 'triste', 'difícil', 'problema', 'error',
+    'lento', 'caro', 'feo', 'aburrido', 'inútil'
+}
+
+
+def analizar_sentimiento(texto):
+    """Análisis de sentimiento basado en diccionario (un texto)."""
+    texto = texto.lower()
+    tokens = set(texto.split())
+
+    positivas = len(tokens & PALABRAS_POSITIVAS)
+    negativas = len(tokens & PALABRAS_NEGATIVAS)
+
+    if positivas > negativas:
+        return 'POSITIVO', positivas - negativas
+    elif negativas > positivas:
+        return 'NEGATIVO', negativas - positivas
+    else:
+        return 'NEUTRAL', 0
+
+
+# ==============================================================================
+# PUNTUADOR POR LOTES
+# ==============================================================================
+
+PATRON_TOKEN = re.compile(r'[a-záéíóúñü0-9]+')
+
+ETIQUETAS = {1: 'POSITIVO', -1: 'NEGATIVO', 0: 'NEUTRAL'}
+
+# Minúscula de cada punto de código si (ya en minúscula) es carácter de
+# token, 0 si no. Equivale a PATRON_TOKEN sobre texto.lower(); ningún
+# carácter >= 0x3001 pasa a minúscula dentro de [a-záéíóúñü0-9] (la última
+# entrada es 0 y sirve para todos ellos). La única diferencia: 'İ'.lower()
+# son dos caracteres ('i' + punto combinante) y aquí es una 'i' sin cortar.
+_TAM_TABLA = 0x3001
+MINUSCULA_TOKEN = np.zeros(_TAM_TABLA, dtype=np.uint16)
+for _c in range(_TAM_TABLA):
+    _minuscula = chr(_c).lower()[0]
+    if PATRON_TOKEN.fullmatch(_minuscula):
+        MINUSCULA_TOKEN[_c] = ord(_minuscula)
+
+_BASE_HASH = 0x100000001B3
+_POTENCIAS = np.ones(1, dtype=np.uint64)
+_INVERSAS = np.ones(1, dtype=np.uint64)
+
+
+def _potencias(n):
+    """base^i y base^-i (módulo 2⁶⁴; la base es impar y tiene inverso) para i < n."""
+    global _POTENCIAS, _INVERSAS
+    if len(_POTENCIAS) < n:
+        n = max(n, 2 * len(_POTENCIAS))
+        for base in (_BASE_HASH, pow(_BASE_HASH, -1, 2 ** 64)):
+            tabla = np.full(n, base, dtype=np.uint64)
+            tabla[0] = 1
+            np.multiply.accumulate(tabla, out=tabla)      # desborda = módulo 2⁶⁴
+            if base == _BASE_HASH:
+                _POTENCIAS = tabla
+            else:
+                _INVERSAS = tabla
+    return _POTENCIAS, _INVERSAS
+
+
+def tokens_de_lote(textos):
+    """
+    Tokeniza un lote entero con NumPy, sin bucle por texto ni por token.
+
+    Returns:
+        tuple: (letras, inicios, longitudes, offsets): letras son los
+               caracteres en minúscula (uint16) de todo el lote unido por
+               saltos de línea; el token i es letras[inicios[i]:][:longitudes[i]]
+               y los tokens del texto j son los de índice offsets[j]:offsets[j+1]
+    """
+    # '\n' no es carácter de token: ningún token cruza de un texto a otro
+    unido = '\n'.join(textos)
+    puntos = np.frombuffer(unido.encode('utf-32-le'), dtype=np.uint32)
+    letras = MINUSCULA_TOKEN.take(puntos, mode='clip')
+
+    es_token = np.zeros(len(letras) + 2, dtype=np.int8)
+    es_token[1:-1] = letras != 0
+    bordes = np.flatnonzero(es_token[1:] != es_token[:-1]).astype(np.int32)
+    inicios, fines = bordes[0::2], bordes[1::2]
+
+    # Dónde empieza cada texto en `unido` → primer token de cada texto
+    comienzos = np.zeros(len(textos) + 1, dtype=np.int64)
+    np.cumsum([len(t) + 1 for t in textos], out=comienzos[1:])
+    offsets = np.searchsorted(inicios, comienzos)
+    return letras, inicios, fines - inicios, offsets
+
+
+def hash_tokens(letras, inicios):
+    """
+    Hash polinómico de 64 bits (Σ letra · base^posición) de cada token.
+
+    Se suma letra · base^i con i la posición en TODO el flujo (los
+    caracteres que no son de token valen 0) y se normaliza cada token
+    multiplicando por base^-inicio: sin calcular posiciones por token.
+    """
+    if len(inicios) == 0:
+        return np.empty(0, dtype=np.uint64)
+    potencias, inversas = _potencias(len(letras))
+    terminos = potencias[:len(letras)] * letras
+    hashes = np.add.reduceat(terminos[inicios[0]:], inicios - inicios[0])
+    hashes *= inversas[inicios]
+    return hashes
+
+
+class PuntuadorSentimiento:
+    """
+    Puntuador de sentimiento por léxico que trabaja con lotes de textos.
+
+    El léxico se traduce a IDs una sola vez. Los tokens que no están en el
+    vocabulario reciben el ID 0, cuya polaridad es 0 (neutral).
+
+    Uso:
+        puntuador = PuntuadorSentimiento()
+        etiquetas, scores = puntuador.puntuar(textos)
+
+    Atributos:
+        vocabulario: dict token → id (el 0 está reservado para desconocidos)
+        polaridad: int8 indexado por id: +1, -1 o 0
+    """
+
+    def __init__(self, positivas=PALABRAS_POSITIVAS, negativas=PALABRAS_NEGATIVAS,
+                 vocabulario=None):
+        """
+        Args:
+            positivas: Conjunto de palabras positivas
+            negativas: Conjunto de palabras negativas
+            vocabulario: dict token → id ya existente (ids >= 1). Si es None,
+                         el vocabulario es solo el léxico.
+        """
+        if vocabulario is None:
+            vocabulario = {p: i for i, p in enumerate(sorted(positivas | negativas), 1)}
+        self.vocabulario = vocabulario
+
+        self.polaridad = np.zeros(max(vocabulario.values(), default=0) + 1, dtype=np.int8)
+        for palabra in positivas:
+            if palabra in vocabulario:
+                self.polaridad[vocabulario[palabra]] = 1
+        for palabra in negativas:
+            if palabra in vocabulario:
+                self.polaridad[vocabulario[palabra]] = -1
+
+        # Vocabulario en forma vectorizada: hashes ordenados con su id, y los
+        # caracteres de cada palabra (una fila por id) para confirmar aciertos
+        palabras = list(vocabulario)
+        letras, inicios, longitudes, _ = tokens_de_lote(palabras)
+        if len(inicios) != len(palabras) or np.any(longitudes != [len(p) for p in palabras]):
+            raise ValueError("El vocabulario debe contener tokens en minúscula "
+                             "(sin espacios ni puntuación)")
+        self._ancho = int(max(longitudes, default=0))
+        hashes = hash_tokens(letras, inicios)
+        if len(np.unique(hashes)) != len(hashes):
+            raise ValueError("Colisión de hash en el vocabulario")
+        orden = np.argsort(hashes)
+        self._hashes = hashes[orden]
+        self._ids_hash = np.fromiter((vocabulario[palabras[i]] for i in orden),
+                                     dtype=np.int32, count=len(palabras))
+        # Filtro previo por los bits bajos del hash: la búsqueda binaria solo
+        # la hacen los tokens que pueden estar en el vocabulario
+        bits = min(max(16, len(palabras).bit_length() + 4), 24)
+        self._mascara = np.uint64((1 << bits) - 1)
+        self._filtro = np.zeros(1 << bits, dtype=bool)
+        self._filtro[(self._hashes & self._mascara).astype(np.intp)] = True
+        self._caracteres = np.zeros((len(self.polaridad), self._ancho), dtype=np.uint16)
+        for palabra, inicio, longitud in zip(palabras, inicios, longitudes):
+            self._caracteres[vocabulario[palabra], :longitud] = letras[inicio:inicio + longitud]
+
+    def codificar(self, textos, tam_trozo=20_000):
+        """
+        Convierte un lote de textos en un array plano de IDs + offsets.
+
+        Args:
+            textos: Lista de textos
+            tam_trozo: Textos procesados a la vez (acota la memoria de
+                       trabajo, ~30 bytes por carácter del trozo)
+
+        Returns:
+            tuple: (ids int32, offsets int64 de longitud len(textos) + 1);
+                   los ids del texto i son ids[offsets[i]:offsets[i+1]]
+        """
+        todos_ids, todos_offsets = [], [np.zeros(1, dtype=np.int64)]
+        total = 0
+        for i in range(0, len(textos), tam_trozo):
+            ids, offsets = self._codificar_trozo(textos[i:i + tam_trozo])
+            todos_ids.append(ids)
+            todos_offsets.append(offsets[1:] + total)
+            total += len(ids)
+        if not todos_ids:
+            return np.empty(0, dtype=np.int32), todos_offsets[0]
+        return np.concatenate(todos_ids), np.concatenate(todos_offsets)
+
+    def _codificar_trozo(self, textos):
+        letras, inicios, longitudes, offsets = tokens_de_lote(textos)
+        ids = np.zeros(len(inicios), dtype=np.int32)
+        if len(inicios) == 0 or len(self._hashes) == 0:
+            return ids, offsets
+
+        # Candidatos: tokens cuyo hash está en el vocabulario
+        hashes = hash_tokens(letras, inicios)
+        candidatos = np.flatnonzero(self._filtro[(hashes & self._mascara).astype(np.intp)])
+        hashes = hashes[candidatos]
+        pos = np.minimum(np.searchsorted(self._hashes, hashes), len(self._hashes) - 1)
+        encontrados = self._hashes[pos] == hashes
+        candidatos = candidatos[encontrados]
+        ids_candidatos = self._ids_hash[pos[encontrados]]
+
+        # Confirmación exacta, carácter a carácter (descarta colisiones)
+        ancho = self._ancho
+        iguales = longitudes[candidatos] <= ancho
+        columnas = np.arange(ancho)
+        for i in range(0, len(candidatos), 65_536):
+            trozo = slice(i, i + 65_536)
+            indices = np.minimum(inicios[candidatos[trozo], None] + columnas, len(letras) - 1)
+            dentro = columnas < longitudes[candidatos[trozo], None]
+            esperado = self._caracteres[ids_candidatos[trozo]]
+            iguales[trozo] &= np.all(np.where(dentro, letras[indices], 0) == esperado, axis=1)
+        ids[candidatos[iguales]] = ids_candidatos[iguales]
+        return ids, offsets
+
+    def puntuar_ids(self, ids, offsets, unicas=True):
+        """
+        Puntúa un lote ya codificado con operaciones vectorizadas.
+
+        Args:
+            ids: IDs de todos los tokens del lote, concatenados
+            offsets: Límites de cada texto
+            unicas: Si True, cada palabra cuenta una vez por texto
+                    (igual que el set de analizar_sentimiento)
+
+        Returns:
+            tuple: (etiquetas int8 en {1, -1, 0}, scores int32 >= 0)
+        """
+        n_textos = len(offsets) - 1
+        docs = np.repeat(np.arange(n_textos), np.diff(offsets))
+
+        # Solo nos interesan los tokens con polaridad
+        pol = self.polaridad[ids]
+        con_polaridad = pol != 0
+        docs, ids, pol = docs[con_polaridad], ids[con_polaridad], pol[con_polaridad]
+
+        if unicas and len(ids):
+            clave = docs.astype(np.int64) * len(self.polaridad) + ids
+            _, primeras = np.unique(clave, return_index=True)
+            docs, pol = docs[primeras], pol[primeras]
+
+        neto = np.bincount(docs, weights=pol, minlength=n_textos).astype(np.int32)
+        return np.sign(neto).astype(np.int8), np.abs(neto)
+
+    def puntuar(self, textos, unicas=True):
+        """Codifica y puntúa un lote de textos."""
+        ids, offsets = self.codificar(textos)
+        return self.puntuar_ids(ids, offsets, unicas)
+
+
+def como_tuplas(etiquetas, scores):
+    """Convierte la salida por lotes al formato de analizar_sentimiento."""
+    return [(ETIQUETAS[e], s) for e, s in zip(etiquetas.tolist(), scores.tolist())]
+
+
+# ==============================================================================
+# PUNTUACIÓN EN PARALELO
+# ==============================================================================
+
+_puntuador_proceso = None
+
+
+def _iniciar_proceso(positivas, negativas):
+    """Cada proceso construye su puntuador una sola vez."""
+    global _puntuador_proceso
+    _puntuador_proceso = PuntuadorSentimiento(positivas, negativas)
+
+
+def _puntuar_trozo(textos):
+    return _puntuador_proceso.puntuar(textos)
+
+
+def puntuar_en_paralelo(textos, n_procesos=None, tam_trozo=20_000,
+                        positivas=PALABRAS_POSITIVAS, negativas=PALABRAS_NEGATIVAS):
+    """
+    Puntúa un lote enorme repartiendo trozos entre procesos.
+
+    Usamos procesos y no hilos porque no todo el trabajo suelta el GIL:
+    unir y codificar los textos (str.join, str.encode) es Python, y el
+    indexado avanzado, np.unique o el bucle de confirmación son muchas
+    operaciones NumPy cortas que lo retienen. Con hilos esas partes se
+    ejecutarían de una en una. Cada trozo viaja como lista de textos y
+    vuelve como dos arrays pequeños.
+
+    Args:
+        textos: Lista de textos
+        n_procesos: Número de procesos (por defecto, todos los núcleos)
+        tam_trozo: Textos por tarea
+
+    Returns:
+        tuple: (etiquetas int8, scores int32) en el orden original
+    """
+    trozos = [textos[i:i + tam_trozo] for i in range(0, len(textos), tam_trozo)]
+    with multiprocessing.Pool(n_procesos, _iniciar_proceso, (positivas, negativas)) as pool:
+        resultados = pool.map(_puntuar_trozo, trozos)
+    if not resultados:
+        return np.empty(0, dtype=np.int8), np.empty(0, dtype=np.int32)
+    etiquetas, scores = zip(*resultados)
+    return np.concatenate(etiquetas), np.concatenate(scores)
+
+
+# ==============================================================================
+# EJEMPLOS
+# ==============================================================================
+
+# Los ejemplos van bajo __main__: en sistemas que arrancan procesos con
+# "spawn" (Windows, macOS) cada proceso hijo vuelve a importar este archivo.
+if __name__ == "__main__":
+
+    print("=" * 60)
+    print("EJEMPLO 1: Misma lógica, puntuación pegada resuelta")
+    print("=" * 60)
+
+    reseñas = [
+        "Este producto es excelente, lo recomiendo totalmente",
+        "Terrible experiencia, muy malo el servicio",
+        "El producto llegó en buen estado",
+        "No me gustó, muy caro para lo que ofrece",
+    ]
+
+    puntuador = PuntuadorSentimiento()
+    print(f"Tabla de polaridad: {len(puntuador.polaridad)} entradas (int8)\n")
+
+    por_lotes = como_tuplas(*puntuador.puntuar(reseñas))
+    print(f"{'Original':>18} | {'Por lotes':>18} | Reseña")
+    print("-" * 60)
+    for reseña, lote in zip(reseñas, por_lotes):
+        original = analizar_sentimiento(reseña)
+        print(f"{str(original):>18} | {str(lote):>18} | '{reseña[:30]}...'")
+
+    print("""
+"excelente," ahora cuenta: el tokenizador separa la puntuación antes de
+buscar en el léxico.
+""")
+
+    print("=" * 60)
+    print("EJEMPLO 2: Rendimiento")
+    print("=" * 60)
+
+    rng = random.Random(42)
+    relleno = [f"pal{i}" for i in range(2_000)]
+    lexico = sorted(PALABRAS_POSITIVAS | PALABRAS_NEGATIVAS)
+    masivas = [
+        ' '.join(rng.choices(relleno, k=18) + rng.choices(lexico, k=2)) + '.'
+        for _ in range(200_000)
+    ]
+
+    inicio = time.perf_counter()
+    for texto in masivas:
+        analizar_sentimiento(texto)
+    tiempo_uno = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    ids, offsets = puntuador.codificar(masivas)
+    tiempo_codificar = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    puntuador.puntuar_ids(ids, offsets)
+    tiempo_puntuar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    puntuar_en_paralelo(masivas)
+    tiempo_paralelo = time.perf_counter() - inicio
+
+    # Misma tokenización que la expresión regular, texto a texto
+    muestra = masivas[:2_000] + reseñas + ["ÉXITO, Niño; PÉSIMO!!", "", "  ..."]
+    ids_muestra, offsets_muestra = puntuador.codificar(muestra)
+    get = puntuador.vocabulario.get
+    for j, texto in enumerate(muestra):
+        esperado = [get(t, 0) for t in PATRON_TOKEN.findall(texto.lower())]
+        assert ids_muestra[offsets_muestra[j]:offsets_muestra[j + 1]].tolist() == esperado
+
+    n = len(masivas)
+    tiempo_lote = tiempo_codificar + tiempo_puntuar
+    print(f"{n} reseñas de 20 palabras ({multiprocessing.cpu_count()} núcleos):")
+    print(f"  analizar_sentimiento (uno a uno):  {tiempo_uno:6.2f} s")
+    print(f"  codificar lote (tokenizar → ids):  {tiempo_codificar:6.2f} s")
+    print(f"  puntuar lote ya codificado:        {tiempo_puntuar:6.2f} s")
+    print(f"  lote en un proceso (todo):         {tiempo_lote:6.2f} s "
+          f"({tiempo_uno / tiempo_lote:.1f}x frente a uno a uno)")
+    print(f"  puntuar_en_paralelo (todo):        {tiempo_paralelo:6.2f} s "
+          f"({tiempo_uno / tiempo_paralelo:.1f}x frente a uno a uno)")
+    print(f"\nRendimiento en paralelo: {n / tiempo_paralelo * 3600 / 1e6:.0f} "
+          f"millones de reseñas/hora")
+    print(f"Ya codificadas (solo puntuar): {n / tiempo_puntuar * 3600 / 1e6:.0f} "
+          f"millones de reseñas/hora")
+
+    print("\n" + "=" * 60)
+    print("PRÓXIMO: 07_ngramas_count_min_sketch.py")
+    print("=" * 60)
@@ -0,0 +1,395 @@
+"""
+================================================================================
+CONTEO APROXIMADO DE N-GRAMAS CON COUNT-MIN SKETCH
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (tokenización, Counter)
+
+================================================================================
+N-GRAMAS
+================================================================================
+
+Un n-grama es una secuencia de n palabras consecutivas:
+
+    "me encanta este producto"
+    unigramas: me | encanta | este | producto
+    bigramas:  me encanta | encanta este | este producto
+    trigramas: me encanta este | encanta este producto
+
+Los bigramas y trigramas capturan frases ("no me gustó", "muy buena
+calidad") que las palabras sueltas pierden.
+
+EL PROBLEMA: el número de n-gramas distintos crece muchísimo con n.
+Un Counter exacto de trigramas sobre millones de reseñas no cabe en RAM.
+
+================================================================================
+COUNT-MIN SKETCH
+================================================================================
+
+Una matriz de contadores de PROFUNDIDAD × ANCHO, fija desde el principio:
+
+              0    1    2    3    4    5    6    7   ... ancho-1
+    fila 0  [ 3 ][ 0 ][ 9 ][ 1 ][ 0 ][ 4 ][ 0 ][ 2 ]
+    fila 1  [ 0 ][ 5 ][ 2 ][ 0 ][ 8 ][ 0 ][ 1 ][ 3 ]
+    fila 2  [ 1 ][ 0 ][ 0 ][12 ][ 0 ][ 2 ][ 0 ][ 3 ]
+
+- AGREGAR x: en cada fila i, sumar 1 a la columna h_i(x)
+- ESTIMAR x: mínimo de las columnas h_i(x) de cada fila
+
+Las colisiones solo pueden SUMAR, nunca restar, así que la estimación
+nunca es menor que el conteo real. Tomar el mínimo entre filas elimina
+casi todo el ruido:
+
+    error ≤ (e / ancho) · total   con probabilidad 1 - e^(-profundidad)
+
+Los frecuentes (lo que nos interesa) son precisos; los raros tienen
+error relativo grande, pero no nos importan.
+
+VENTAJAS:
+- Memoria FIJA y configurable (profundidad × ancho × 8 bytes)
+- FUSIONABLE: dos sketches con los mismos hashes se suman celda a celda,
+  así que cada proceso cuenta su parte y al final se combinan
+
+Junto al sketch guardamos un TOP-K de candidatos (heavy hitters) para
+poder listar las frases más frecuentes, no solo consultar una concreta.
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import hashlib
+import heapq
+import itertools
+import multiprocessing
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+# ==============================================================================
+# N-GRAMAS
+# ==============================================================================
+
+
+def ngramas(tokens, n):
+    """Genera los n-gramas de una lista de tokens como cadenas."""
+    return (' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+
+def _hash64(texto):
+    """Hash estable de 64 bits (blake2b) de un texto."""
+    return int.from_bytes(hashlib.blake2b(texto.encode('utf-8'), digest_size=8).digest(),
+                          'little')
+
+
+def hash_base(textos):
+    """
+    Hash estable de 64 bits de cada texto, como uint64.
+
+    Las filas del sketch derivan de este hash: si dos textos colisionan
+    aquí, colisionan en todas las filas. Con 64 bits eso es despreciable
+    (con 32 bits, crc32, ya pasa con ~100.000 n-gramas distintos).
+    """
+    blake2b = hashlib.blake2b
+    digestos = b''.join([blake2b(t.encode('utf-8'), digest_size=8).digest() for t in textos])
+    return np.frombuffer(digestos, dtype='<u8').astype(np.uint64)
+
+
+# ==============================================================================
+# COUNT-MIN SKETCH
+# ==============================================================================
+
+class CountMinSketch:
+    """
+    Count-Min Sketch sobre una matriz NumPy de profundidad × ancho.
+
+    Cada fila usa un hash multiply-shift distinto sobre el hash base
+    del elemento. Dos sketches creados con los mismos parámetros y la
+    misma semilla usan los mismos hashes y se pueden fusionar.
+
+    Los contadores son uint64: con uint32 una celda compartida por
+    n-gramas frecuentes pasaría de 2³² (unos 4.300 millones) al agregar
+    o fusionar y volvería a 0 sin avisar, rompiendo la cota superior.
+    """
+
+    def __init__(self, ancho=2**20, profundidad=4, semilla=0):
+        """
+        Args:
+            ancho: Columnas por fila (más ancho = menos error)
+            profundidad: Filas (más filas = más confianza)
+            semilla: Semilla de las funciones hash
+        """
+        self.ancho = ancho
+        self.profundidad = profundidad
+        self.semilla = semilla
+        self.tabla = np.zeros((profundidad, ancho), dtype=np.uint64)
+        self.total = 0
+
+        rng = np.random.default_rng(semilla)
+        self._a = rng.integers(1, 2**63, profundidad, dtype=np.uint64) * 2 + 1
+        self._b = rng.integers(0, 2**63, profundidad, dtype=np.uint64)
+
+    def _columnas(self, hashes):
+        """Columna de cada elemento en cada fila: (profundidad × n)."""
+        h = (self._a[:, None] * hashes[None, :] + self._b[:, None]) >> np.uint64(32)
+        return (h % np.uint64(self.ancho)).astype(np.intp)
+
+    def agregar(self, hashes, conteos=None):
+        """
+        Suma conteos para un lote de elementos (vectorizado).
+
+        Args:
+            hashes: uint64, hash base de cada elemento (ver hash_base)
+            conteos: Cantidad a sumar por elemento (1 si es None)
+        """
+        if conteos is None:
+            conteos = np.ones(len(hashes), dtype=np.uint64)
+        conteos = np.asarray(conteos, dtype=np.uint64)
+        for fila, columnas in enumerate(self._columnas(hashes)):
+            np.add.at(self.tabla[fila], columnas, conteos)
+        self.total += int(conteos.sum())
+
+    def estimar(self, hashes):
+        """Conteo estimado (cota superior) de cada elemento."""
+        columnas = self._columnas(hashes)
+        filas = np.arange(self.profundidad)[:, None]
+        return self.tabla[filas, columnas].min(axis=0)
+
+    def fusionar(self, otro):
+        """Suma otro sketch a este (deben tener mismos parámetros y semilla)."""
+        if (self.ancho, self.profundidad, self.semilla) != \
+                (otro.ancho, otro.profundidad, otro.semilla):
+            raise ValueError("Solo se pueden fusionar sketches con los mismos parámetros")
+        self.tabla += otro.tabla
+        self.total += otro.total
+
+    def memoria_bytes(self):
+        return self.tabla.nbytes
+
+    def __str__(self):
+        return (f"CountMinSketch({self.profundidad}×{self.ancho}, "
+                f"{self.memoria_bytes() / 1e6:.1f} MB, total={self.total})")
+
+
+# ==============================================================================
+# TOP-K DE FRECUENTES (HEAVY HITTERS)
+# ==============================================================================
+
+class TopKFrecuentes:
+    """
+    Mantiene los k elementos más frecuentes según un Count-Min Sketch.
+
+    El sketch sabe estimar cualquier elemento, pero no puede listar cuáles
+    son los más frecuentes. Guardamos aparte k candidatos con su
+    estimación; en cada lote compiten los candidatos actuales y los
+    elementos del lote, y sobreviven los k mejores.
+    """
+
+    def __init__(self, k=100):
+        self.k = k
+        self.candidatos = {}    # elemento → conteo estimado
+
+    def actualizar(self, sketch, elementos, hashes):
+        """
+        Re-estima candidatos + elementos nuevos y conserva los k mejores.
+
+        Args:
+            sketch: CountMinSketch ya actualizado con el lote
+            elementos: Elementos distintos del lote
+            hashes: Sus hashes base
+        """
+        todos = dict(zip(elementos, hashes.tolist()))
+        for elemento in self.candidatos:
+            if elemento not in todos:
+                todos[elemento] = _hash64(elemento)
+
+        nombres = list(todos)
+        estimaciones = sketch.estimar(np.fromiter(todos.values(), dtype=np.uint64,
+                                                  count=len(todos)))
+        if len(nombres) > self.k:
+            mejores = np.argpartition(-estimaciones.astype(np.int64), self.k - 1)[:self.k]
+        else:
+            mejores = range(len(nombres))
+        self.candidatos = {nombres[i]: int(estimaciones[i]) for i in mejores}
+
+    def mas_frecuentes(self, n=None):
+        """Lista de (elemento, conteo estimado), de mayor a menor."""
+        return heapq.nlargest(n or self.k, self.candidatos.items(), key=lambda x: x[1])
+
+
+# ==============================================================================
+# CONTADOR DE N-GRAMAS
+# ==============================================================================
+
+class ContadorNgramas:
+    """
+    Cuenta unigramas, bigramas, trigramas... con memoria fija.
+
+    Un Count-Min Sketch + top-k por cada orden de n-grama.
+
+    Uso:
+        contador = ContadorNgramas(ordenes=(2, 3))
+        contador.agregar_documentos(documentos)
+        contador.mas_frecuentes(2, 10)
+        contador.estimar(2, ["me encanta"])
+    """
+
+    def __init__(self, ordenes=(1, 2, 3), ancho=2**20, profundidad=4, k=100, semilla=0):
+        """
+        Args:
+            ordenes: Valores de n a contar
+            ancho, profundidad: Tamaño de cada sketch
+            k: Candidatos a frecuentes por orden
+            semilla: Semilla de los hashes (igual en todos los procesos)
+        """
+        self.ordenes = tuple(ordenes)
+        self.sketches = {n: CountMinSketch(ancho, profundidad, semilla + n)
+                         for n in self.ordenes}
+        self.top = {n: TopKFrecuentes(k) for n in self.ordenes}
+
+    def agregar_documentos(self, documentos):
+        """
+        Cuenta los n-gramas de un lote de documentos.
+
+        Dentro del lote se agrupan los repetidos con un Counter (pequeño, se
+        descarta al terminar) y el sketch recibe cada n-grama distinto una
+        sola vez con su conteo.
+        """
+        docs_tokens = [doc.lower().split() for doc in documentos]
+        for n in self.ordenes:
+            conteo = Counter(itertools.chain.from_iterable(
+                ngramas(tokens, n) for tokens in docs_tokens
+            ))
+            if not conteo:
+                continue
+            elementos = list(conteo)
+            hashes = hash_base(elementos)
+            self.sketches[n].agregar(hashes, np.fromiter(
+                conteo.values(), dtype=np.uint64, count=len(conteo)))
+            self.top[n].actualizar(self.sketches[n], elementos, hashes)
+
+    def estimar(self, n, elementos):
+        """Conteo estimado de n-gramas concretos."""
+        return self.sketches[n].estimar(hash_base(list(elementos)))
+
+    def mas_frecuentes(self, n, cuantos=10):
+        return self.top[n].mas_frecuentes(cuantos)
+
+    def fusionar(self, otro):
+        """
+        Combina el conteo de otro contador (p. ej. de otro proceso).
+
+        Los sketches se suman y los candidatos de ambos compiten de nuevo
+        con las estimaciones del sketch combinado.
+        """
+        for n in self.ordenes:
+            self.sketches[n].fusionar(otro.sketches[n])
+            elementos = list(otro.top[n].candidatos)
+            self.top[n].actualizar(self.sketches[n], elementos, hash_base(elementos))
+
+    def memoria_bytes(self):
+        return sum(s.memoria_bytes() for s in self.sketches.values())
+
+
+def _contar_trozo(argumentos):
+    """Tarea de un proceso: contar un trozo del corpus."""
+    documentos, parametros = argumentos
+    contador = ContadorNgramas(**parametros)
+    for i in range(0, len(documentos), 5_000):
+        contador.agregar_documentos(documentos[i:i + 5_000])
+    return contador
+
+
+def contar_en_paralelo(documentos, n_procesos=None, **parametros):
+    """
+    Cuenta n-gramas repartiendo el corpus entre procesos y fusionando
+    los sketches resultantes.
+    """
+    if not documentos:
+        return ContadorNgramas(**parametros)
+    n_procesos = n_procesos or multiprocessing.cpu_count()
+    tam = -(-len(documentos) // n_procesos)
+    trozos = [(documentos[i:i + tam], parametros) for i in range(0, len(documentos), tam)]
+    with multiprocessing.Pool(n_procesos) as pool:
+        contadores = pool.map(_contar_trozo, trozos)
+    resultado = contadores[0]
+    for contador in contadores[1:]:
+        resultado.fusionar(contador)
+    return resultado
+
+
+# ==============================================================================
+# EJEMPLOS
+# ==============================================================================
+
+# Bajo __main__ porque contar_en_paralelo lanza procesos (ver
+# 06_sentimiento_por_lotes.py).
+if __name__ == "__main__":
+
+    print("=" * 60)
+    print("EJEMPLO 1: Count-Min Sketch básico")
+    print("=" * 60)
+
+    sketch = CountMinSketch(ancho=64, profundidad=3)
+    palabras = ["gato"] * 10 + ["perro"] * 5 + ["pez"] * 2
+    sketch.agregar(hash_base(palabras))
+    print(sketch)
+    for palabra, real in [("gato", 10), ("perro", 5), ("pez", 2), ("loro", 0)]:
+        estimado = sketch.estimar(hash_base([palabra]))[0]
+        print(f"  {palabra:>6}: real = {real:2d}, estimado = {estimado}")
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 2: Bigramas y trigramas con memoria fija")
+    print("=" * 60)
+
+    rng = random.Random(42)
+    vocab = [f"pal{i}" for i in range(5_000)]
+    acumulados = list(itertools.accumulate(1 / (i + 1) for i in range(len(vocab))))
+    frases = ["me encanta este producto", "no me gustó nada", "muy buena calidad"]
+
+    def reseña():
+        tokens = rng.choices(vocab, cum_weights=acumulados, k=15)
+        if rng.random() < 0.3:
+            tokens.insert(rng.randrange(len(tokens)), rng.choice(frases))
+        return ' '.join(tokens)
+
+    corpus = [reseña() for _ in range(60_000)]
+
+    inicio = time.perf_counter()
+    contador = ContadorNgramas(ordenes=(2, 3), ancho=2**16, profundidad=4, k=50)
+    for i in range(0, len(corpus), 5_000):
+        contador.agregar_documentos(corpus[i:i + 5_000])
+    tiempo_sketch = time.perf_counter() - inicio
+
+    exacto = Counter(itertools.chain.from_iterable(
+        ngramas(doc.split(), 3) for doc in corpus
+    ))
+
+    print(f"Trigramas distintos (exacto): {len(exacto):,}")
+    print(f"Memoria de los sketches: {contador.memoria_bytes() / 1e6:.1f} MB "
+          f"(fija, no crece con el corpus)")
+    print(f"Tiempo: {tiempo_sketch:.2f} s")
+
+    print("\nTrigramas más frecuentes (estimado vs real):")
+    for trigrama, estimado in contador.mas_frecuentes(3, 5):
+        print(f"  {trigrama:>25}: {estimado:6d}  (real {exacto[trigrama]})")
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 3: Contar en varios procesos y fusionar")
+    print("=" * 60)
+
+    inicio = time.perf_counter()
+    paralelo = contar_en_paralelo(corpus, n_procesos=2, ordenes=(2, 3),
+                                  ancho=2**16, profundidad=4, k=50)
+    print(f"2 procesos + fusión: {time.perf_counter() - inicio:.2f} s")
+    iguales = np.array_equal(paralelo.sketches[3].tabla, contador.sketches[3].tabla)
+    print(f"¿Sketch fusionado idéntico al secuencial? {iguales}")
+    print(f"Top-3 bigramas: {paralelo.mas_frecuentes(2, 3)}")
+
+    print("\n" + "=" * 60)
+    print("PRÓXIMO: 08_vectorizador_mmap.py")
+    print("=" * 60)
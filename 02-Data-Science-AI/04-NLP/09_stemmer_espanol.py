@@ -0,0 +1,300 @@
+"""
+================================================================================
+STEMMER LIGERO PARA ESPAÑOL CON MEMORIZACIÓN
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (limpiar_texto, tokenizar, eliminar_stopwords)
+- 01-Fundamentos-Python/18_decoradores.py (functools.lru_cache)
+
+================================================================================
+¿QUÉ ES STEMMING?
+================================================================================
+
+Reducir cada palabra a su RAÍZ quitando sufijos:
+
+    corriendo, corremos, corrió   → corr
+    gato, gata, gatos             → gat
+
+Así "recomendamos" y "recomendaciones" (→ recomend) cuentan como la
+misma palabra en el Bag of Words y en TF-IDF, y el vocabulario se reduce.
+
+LIMITACIONES (como en Snowball, solo miramos sufijos):
+- Verbos con cambio de raíz: "recomiendo" → recom, "recomendamos" →
+  recomend. La e → ie está DENTRO de la raíz y no se unifica sin un
+  diccionario (eso es lematizar, no stemming)
+- Sufijos que coinciden por azar: "rápidos" → rap ("-idos" parece un
+  participio) pero "rápidamente" → rapid
+
+01_introduccion_nlp.py menciona el SnowballStemmer de NLTK. Aquí hacemos
+un stemmer LIGERO en Python puro inspirado en Snowball:
+
+1. Calculamos la región RV (después de la primera vocal tras la 2ª letra,
+   según las reglas de Snowball para español)
+2. Quitamos pronombres enclíticos (comprándolo → comprando)
+3. Quitamos el sufijo derivativo o verbal más largo que caiga en RV
+4. Quitamos la vocal residual final (o, a, e, os...)
+5. Quitamos tildes
+
+================================================================================
+¿POR QUÉ MEMORIZAR?
+================================================================================
+
+LEY DE ZIPF: en cualquier corpus, unas pocas palabras distintas forman la
+mayor parte de los tokens. Con 1 millón de tokens puede haber solo 30.000
+palabras distintas, y las 1.000 más frecuentes cubren ~70% del texto.
+
+Si guardamos el resultado de cada palabra ya procesada (caché LRU con
+tamaño máximo), casi todas las llamadas son una búsqueda en un dict.
+La caché es ACOTADA: si se llena, descarta las palabras usadas hace más
+tiempo, así la memoria no crece sin control.
+
+================================================================================
+"""
+
+import itertools
+import random
+import re
+import time
+from functools import lru_cache
+
+# ==============================================================================
+# PREPROCESAMIENTO (de 01_introduccion_nlp.py)
+# ==============================================================================
+
+STOPWORDS_ES = {
+    'el', 'la', 'los', 'las', 'un', 'una', 'unos', 'unas',
+    'de', 'del', 'al', 'a', 'en', 'con', 'por', 'para',
+    'es', 'son', 'este', 'esta', 'esto', 'estos', 'estas',
+    'y', 'o', 'pero', 'que', 'como', 'se', 'su', 'sus'
+}
+
+
+def limpiar_texto(texto):
+    """Minúsculas, sin caracteres especiales y sin espacios extra."""
+    texto = texto.lower()
+    texto = re.sub(r'[^a-záéíóúñü0-9\s]', '', texto)
+    return ' '.join(texto.split())
+
+
+def tokenizar(texto):
+    """Tokenización simple: dividir por espacios."""
+    return texto.split()
+
+
+def eliminar_stopwords(tokens, stopwords=STOPWORDS_ES):
+    """Elimina stopwords de una lista de tokens."""
+    return [t for t in tokens if t not in stopwords]
+
+
+# ==============================================================================
+# STEMMER LIGERO
+# ==============================================================================
+
+VOCALES = set('aeiouáéíóúü')
+
+SIN_TILDES = str.maketrans('áéíóú', 'aeiou')
+
+# Pronombres enclíticos, precedidos de gerundio o infinitivo
+PRONOMBRES = ('selas', 'selos', 'sela', 'selo', 'las', 'les', 'los', 'nos',
+              'me', 'se', 'la', 'le', 'lo')
+ANTES_DE_PRONOMBRE = ('ándo', 'iéndo', 'ando', 'iendo', 'ár', 'ér', 'ír', 'ar', 'er', 'ir')
+
+# Sufijos derivativos (sustantivos y adjetivos), del más largo al más corto
+SUFIJOS_DERIVATIVOS = sorted((
+    'amientos', 'imientos', 'amiento', 'imiento', 'aciones', 'uciones',
+    'adoras', 'adores', 'ancias', 'logías', 'encias', 'idades', 'mente',
+    'ación', 'ución', 'adora', 'ador', 'ancia', 'logía', 'encia', 'idad',
+    'ables', 'ibles', 'istas', 'able', 'ible', 'ista', 'osos', 'osas',
+    'oso', 'osa', 'ivas', 'ivos', 'iva', 'ivo', 'ismos', 'ismo',
+), key=len, reverse=True)
+
+# Sufijos verbales, del más largo al más corto
+SUFIJOS_VERBALES = sorted((
+    'aríamos', 'eríamos', 'iríamos', 'iéramos', 'iésemos', 'ábamos',
+    'aremos', 'eremos', 'iremos', 'aríais', 'eríais', 'iríais', 'ierais',
+    'ieseis', 'asteis', 'isteis', 'abais', 'arías', 'erías', 'irías',
+    'ieran', 'iesen', 'ieron', 'iendo', 'ieras', 'ieses', 'arían', 'erían',
+    'irían', 'aréis', 'eréis', 'iréis', 'aban', 'aran', 'asen', 'aron',
+    'ando', 'abas', 'adas', 'idas', 'aras', 'ases', 'aría', 'ería', 'iría',
+    'amos', 'emos', 'imos', 'ados', 'idos', 'aste', 'iste', 'aba', 'ada',
+    'ida', 'ara', 'ase', 'ado', 'ido', 'ará', 'erá', 'irá', 'ían',
+    'áis', 'éis', 'ía', 'ió', 'an', 'en', 'as', 'es', 'ar', 'er', 'ir',
+    'ás', 'és', 'ís',
+), key=len, reverse=True)
+
+RESIDUALES = ('os', 'a', 'o', 'e', 'á', 'í', 'ó', 'é')
+
+
+def _region_rv(palabra):
+    """Índice donde empieza la región RV de Snowball (español)."""
+    if len(palabra) < 2:
+        return len(palabra)
+    if palabra[1] not in VOCALES:
+        # Consonante en 2ª posición: RV empieza tras la siguiente vocal
+        for i in range(2, len(palabra)):
+            if palabra[i] in VOCALES:
+                return i + 1
+        return len(palabra)
+    if palabra[0] in VOCALES and palabra[1] in VOCALES:
+        # Dos vocales al inicio: RV empieza tras la siguiente consonante
+        for i in range(2, len(palabra)):
+            if palabra[i] not in VOCALES:
+                return i + 1
+        return len(palabra)
+    # Consonante + vocal: RV empieza en la 4ª letra
+    return 3
+
+
+def _quitar(palabra, rv, sufijos):
+    """Quita el sufijo más largo de la lista que caiga dentro de RV."""
+    for sufijo in sufijos:
+        if palabra.endswith(sufijo) and len(palabra) - len(sufijo) >= rv:
+            return palabra[:-len(sufijo)], True
+    return palabra, False
+
+
+def raiz(palabra):
+    """
+    Raíz de una palabra en español (stemmer ligero, sin caché).
+
+    Ejemplos:
+        raiz('corriendo') → 'corr'
+        raiz('rápidamente') → 'rapid'
+    """
+    if len(palabra) <= 3:
+        return palabra.translate(SIN_TILDES)
+
+    rv = _region_rv(palabra)
+
+    # Paso 0: pronombres enclíticos (comprándolo → comprando)
+    for pronombre in PRONOMBRES:
+        base = palabra[:-len(pronombre)]
+        if palabra.endswith(pronombre) and len(base) >= rv and \
+                base.endswith(ANTES_DE_PRONOMBRE):
+            palabra = base.translate(SIN_TILDES)
+            break
+
+    # Paso 1 y 2: sufijo derivativo; si no hay, sufijo verbal
+    palabra, quitado = _quitar(palabra, rv, SUFIJOS_DERIVATIVOS)
+    if not quitado:
+        palabra, quitado = _quitar(palabra, rv, SUFIJOS_VERBALES)
+
+    # Paso 3: vocal residual
+    palabra, _ = _quitar(palabra, rv, RESIDUALES)
+
+    return palabra.translate(SIN_TILDES)
+
+
+class StemmerEspanol:
+    """
+    Stemmer con caché LRU acotada por forma superficial.
+
+    Uso:
+        stemmer = StemmerEspanol(tam_cache=50_000)
+        stemmer.raiz('corriendo')            → 'corr'
+        stemmer.raices(['gatos', 'gata'])    → ['gat', 'gat']
+        stemmer.estadisticas()               → aciertos, fallos, tasa...
+    """
+
+    def __init__(self, tam_cache=50_000):
+        """
+        Args:
+            tam_cache: Máximo de palabras distintas memorizadas
+        """
+        self.tam_cache = tam_cache
+        self.raiz = lru_cache(maxsize=tam_cache)(raiz)
+
+    def raices(self, tokens):
+        """Aplica el stemmer a una lista de tokens."""
+        return list(map(self.raiz, tokens))
+
+    def estadisticas(self):
+        """Aciertos y fallos de la caché desde su creación."""
+        info = self.raiz.cache_info()
+        total = info.hits + info.misses
+        return {
+            'aciertos': info.hits,
+            'fallos': info.misses,
+            'tasa_aciertos': info.hits / total if total else 0.0,
+            'en_cache': info.currsize,
+            'tam_cache': self.tam_cache,
+        }
+
+    def limpiar_cache(self):
+        self.raiz.cache_clear()
+
+
+def preprocesar(texto, stemmer, stopwords=STOPWORDS_ES):
+    """
+    Cadena completa: limpiar → tokenizar → quitar stopwords → stemming.
+
+    El stemming va DESPUÉS de eliminar_stopwords: las stopwords son las
+    palabras más frecuentes y no tiene sentido procesarlas.
+    """
+    tokens = eliminar_stopwords(tokenizar(limpiar_texto(texto)), stopwords)
+    return stemmer.raices(tokens)
+
+
+# ==============================================================================
+# EJEMPLO 1: RAÍCES
+# ==============================================================================
+
+print("=" * 60)
+print("EJEMPLO 1: Stemming de palabras en español")
+print("=" * 60)
+
+palabras = [
+    'corriendo', 'corremos', 'corrió', 'rápidamente', 'rápidos',
+    'recomiendo', 'recomendamos', 'recomendaciones', 'comprándolo',
+    'gatos', 'gata', 'felicidad', 'felices', 'excelente', 'problemas',
+]
+stemmer = StemmerEspanol()
+for palabra in palabras:
+    print(f"  {palabra:>16} → {stemmer.raiz(palabra)}")
+
+texto = "Los productos llegaron rápidamente y funcionan perfectamente, ¡lo recomiendo!"
+print(f"\nTexto: {texto}")
+print(f"Preprocesado: {preprocesar(texto, stemmer)}")
+
+
+# ==============================================================================
+# EJEMPLO 2: TASA DE ACIERTOS Y GANANCIA DE LA CACHÉ
+# ==============================================================================
+
+print("\n" + "=" * 60)
+print("EJEMPLO 2: Caché LRU sobre un corpus con distribución Zipf")
+print("=" * 60)
+
+rng = random.Random(42)
+silabas = ['ca', 'me', 'ti', 'lo', 'pu', 'ra', 'se', 'no', 'ba', 'di', 'fe', 'go']
+terminaciones = ['ando', 'iendo', 'amos', 'aron', 'ación', 'mente', 'os', 'as',
+                 'ado', 'ida', 'ar', 'er', 'e', 'o', 'a', 'ista', 'idad']
+formas = list({''.join(rng.choices(silabas, k=rng.randint(2, 3))) + rng.choice(terminaciones)
+               for _ in range(30_000)})
+acumulados = list(itertools.accumulate(1 / (i + 1) for i in range(len(formas))))
+tokens_corpus = rng.choices(formas, cum_weights=acumulados, k=200_000)
+
+print(f"Corpus: {len(tokens_corpus):,} tokens, {len(set(tokens_corpus)):,} formas distintas")
+
+inicio = time.perf_counter()
+sin_cache = [raiz(t) for t in tokens_corpus]
+tiempo_sin = time.perf_counter() - inicio
+
+for tam in (1_000, 10_000, 50_000):
+    stemmer = StemmerEspanol(tam_cache=tam)
+    inicio = time.perf_counter()
+    con_cache = stemmer.raices(tokens_corpus)
+    tiempo_con = time.perf_counter() - inicio
+    est = stemmer.estadisticas()
+    assert con_cache == sin_cache
+    print(f"  caché {tam:>6}: aciertos {est['tasa_aciertos']:6.1%}, "
+          f"{len(tokens_corpus) / tiempo_con / 1e6:5.2f} M tokens/s, "
+          f"{tiempo_sin / tiempo_con:4.1f}x más rápido")
+
+print(f"  sin caché:   {len(tokens_corpus) / tiempo_sin / 1e6:5.2f} M tokens/s")
+
+
+print("\n" + "=" * 60)
+print("PRÓXIMO: 10_servicio_sentimiento_asyncio.py")
+print("=" * 60)
@@ -0,0 +1,415 @@
+"""
+================================================================================
+SERVICIO DE SENTIMIENTO CON ASYNCIO Y MICRO-LOTES
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (analizar_sentimiento)
+- 06_sentimiento_por_lotes.py (puntuación vectorizada)
+
+================================================================================
+EL PROBLEMA
+================================================================================
+
+Los clientes envían reseñas DE UNA EN UNA, pero puntuar por lotes es mucho
+más eficiente (06_sentimiento_por_lotes.py). ¿Cómo juntamos ambos mundos?
+
+================================================================================
+MICRO-LOTES (MICRO-BATCHING)
+================================================================================
+
+    cliente 1 ─┐
+    cliente 2 ─┼─→ [ COLA ] ─→ trabajador: junta hasta N reseñas
+    cliente 3 ─┘                o espera como máximo T milisegundos,
+                                puntúa el lote en UNA llamada
+                                y responde a cada cliente
+
+- TAMAÑO MÁXIMO: con mucho tráfico, los lotes se llenan enseguida
+- PLAZO MÁXIMO: con poco tráfico, nadie espera más de T ms por su lote
+- CONTRAPRESIÓN (backpressure): la cola tiene tamaño máximo; si se llena,
+  respondemos 503 de inmediato en lugar de acumular peticiones sin límite
+  (el cliente puede reintentar; el servidor no se queda sin memoria)
+
+Todo con la librería estándar: asyncio.start_server + un HTTP mínimo.
+
+    POST /sentimiento   (cuerpo = texto de la reseña)
+        → {"etiqueta": "POSITIVO", "score": 2}
+    GET /metricas
+        → rendimiento, tamaño medio de lote, latencias p50/p99...
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from importlib import import_module
+
+# ==============================================================================
+# PUNTUACIÓN POR LOTES (de 06_sentimiento_por_lotes.py)
+# ==============================================================================
+
+# El nombre empieza por un dígito: `from 06_sentimiento_por_lotes import ...`
+# no es sintaxis válida, así que lo importamos por nombre
+_por_lotes = import_module('06_sentimiento_por_lotes')
+PALABRAS_POSITIVAS = _por_lotes.PALABRAS_POSITIVAS
+PALABRAS_NEGATIVAS = _por_lotes.PALABRAS_NEGATIVAS
+PUNTUADOR = _por_lotes.PuntuadorSentimiento()
+
+
+def puntuar_lote(textos):
+    """
+    Puntúa un lote de reseñas en una sola llamada vectorizada.
+
+    Cada palabra del léxico cuenta una vez por reseña, como en
+    analizar_sentimiento.
+
+    Returns:
+        list: Tuplas (etiqueta, score) en el orden de entrada
+    """
+    return _por_lotes.como_tuplas(*PUNTUADOR.puntuar(textos))
+
+
+# ==============================================================================
+# MICRO-LOTES CON CONTRAPRESIÓN
+# ==============================================================================
+
+class ColaLlena(Exception):
+    """La cola de peticiones está llena: el cliente debe reintentar."""
+
+
+class MicroLotes:
+    """
+    Agrupa peticiones individuales en lotes por tamaño o por plazo.
+
+    Uso (dentro de un bucle asyncio):
+        lotes = MicroLotes(puntuar_lote, tam_lote=256, espera_ms=5)
+        lotes.iniciar()
+        etiqueta, score = await lotes.puntuar("me encanta")
+    """
+
+    def __init__(self, funcion_lote, tam_lote=256, espera_ms=5, tam_cola=10_000):
+        """
+        Args:
+            funcion_lote: Función que recibe una lista de textos y devuelve
+                          una lista de resultados del mismo largo
+            tam_lote: Máximo de peticiones por lote
+            espera_ms: Máximo que espera un lote a llenarse
+            tam_cola: Peticiones pendientes antes de rechazar (503)
+        """
+        self.funcion_lote = funcion_lote
+        self.tam_lote = tam_lote
+        self.espera = espera_ms / 1000
+        self.cola = asyncio.Queue(maxsize=tam_cola)
+        self._tarea = None
+
+        # Métricas
+        self.inicio = time.perf_counter()
+        self.procesadas = 0
+        self.rechazadas = 0
+        self.lotes = 0
+        self.latencias = deque(maxlen=10_000)   # segundos, últimas peticiones
+
+    def iniciar(self):
+        self._tarea = asyncio.get_running_loop().create_task(self._trabajador())
+
+    async def detener(self):
+        if self._tarea:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+
+    async def puntuar(self, texto):
+        """
+        Encola una reseña y espera su resultado.
+
+        Raises:
+            ColaLlena: Si hay demasiadas peticiones pendientes
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            self.cola.put_nowait((texto, futuro, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rechazadas += 1
+            raise ColaLlena() from None
+        return await futuro
+
+    async def _trabajador(self):
+        """Bucle: junta un lote (tamaño o plazo), lo puntúa y responde."""
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self.cola.get()]
+            limite = loop.time() + self.espera
+
+            while len(lote) < self.tam_lote:
+                # Primero lo que ya está en la cola, sin esperar
+                try:
+                    lote.append(self.cola.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self.cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                resultados = self.funcion_lote([texto for texto, _, _ in lote])
+            except Exception as error:
+                for _, futuro, _ in lote:
+                    if not futuro.done():
+                        futuro.set_exception(error)
+                continue
+
+            ahora = time.perf_counter()
+            for (_, futuro, llegada), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+                self.latencias.append(ahora - llegada)
+            self.procesadas += len(lote)
+            self.lotes += 1
+
+    def metricas(self):
+        """Rendimiento y latencia (percentiles de las últimas peticiones)."""
+        latencias = sorted(self.latencias)
+
+        def percentil(p):
+            if not latencias:
+                return 0.0
+            return latencias[min(len(latencias) - 1, int(len(latencias) * p))] * 1000
+
+        transcurrido = time.perf_counter() - self.inicio
+        return {
+            'procesadas': self.procesadas,
+            'rechazadas': self.rechazadas,
+            'lotes': self.lotes,
+            'tam_medio_lote': self.procesadas / self.lotes if self.lotes else 0.0,
+            'en_cola': self.cola.qsize(),
+            'por_segundo': self.procesadas / transcurrido if transcurrido else 0.0,
+            'latencia_p50_ms': percentil(0.50),
+            'latencia_p99_ms': percentil(0.99),
+        }
+
+
+# ==============================================================================
+# SERVIDOR HTTP MÍNIMO
+# ==============================================================================
+
+def _respuesta(estado, cuerpo):
+    """Respuesta HTTP/1.1 con cuerpo JSON (conexión persistente)."""
+    datos = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+    textos_estado = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+                     503: 'Service Unavailable'}
+    cabecera = (f"HTTP/1.1 {estado} {textos_estado[estado]}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(datos)}\r\n\r\n")
+    return cabecera.encode('ascii') + datos
+
+
+async def iniciar_servidor(lotes, host='127.0.0.1', puerto=8080):
+    """
+    Arranca el servidor HTTP sobre el micro-lote indicado.
+
+    Returns:
+        asyncio.Server (con puerto=0 el sistema elige uno libre)
+    """
+
+    async def atender(lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, ruta, _ = linea.decode('ascii').split(' ', 2)
+
+                    longitud = 0
+                    while True:
+                        cabecera = await lector.readline()
+                        if cabecera in (b'\r\n', b'\n', b''):
+                            break
+                        nombre, _, valor = cabecera.decode('latin-1').partition(':')
+                        if nombre.strip().lower() == 'content-length':
+                            longitud = int(valor)
+                            if longitud < 0:
+                                raise ValueError(f"Content-Length negativo: {longitud}")
+                except ValueError:
+                    # Línea de petición o Content-Length inválidos (incluye
+                    # UnicodeDecodeError): sin saber dónde acaba el cuerpo no
+                    # podemos seguir leyendo, respondemos 400 y cerramos
+                    escritor.write(_respuesta(400, {'error': 'petición mal formada'}))
+                    await escritor.drain()
+                    break
+                cuerpo = await lector.readexactly(longitud) if longitud else b''
+
+                if metodo == 'POST' and ruta == '/sentimiento':
+                    try:
+                        etiqueta, score = await lotes.puntuar(cuerpo.decode('utf-8'))
+                        escritor.write(_respuesta(200, {'etiqueta': etiqueta, 'score': score}))
+                    except UnicodeDecodeError:
+                        escritor.write(_respuesta(400, {'error': 'el cuerpo no es UTF-8'}))
+                    except ColaLlena:
+                        escritor.write(_respuesta(503, {'error': 'cola llena, reintente'}))
+                elif metodo == 'GET' and ruta == '/metricas':
+                    escritor.write(_respuesta(200, lotes.metricas()))
+                else:
+                    escritor.write(_respuesta(404, {'error': 'ruta desconocida'}))
+                await escritor.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    return await asyncio.start_server(atender, host, puerto)
+
+
+# ==============================================================================
+# GENERADOR DE CARGA
+# ==============================================================================
+
+async def generar_carga(host, puerto, textos, concurrencia=64):
+    """
+    Envía todas las reseñas usando `concurrencia` conexiones persistentes.
+
+    Returns:
+        dict: peticiones/s, rechazos y latencias p50/p99 vistas por el cliente
+    """
+    pendientes = deque(textos)
+    latencias = []
+    rechazos = 0
+
+    async def cliente():
+        nonlocal rechazos
+        lector, escritor = await asyncio.open_connection(host, puerto)
+        while pendientes:
+            texto = pendientes.popleft().encode('utf-8')
+            inicio = time.perf_counter()
+            escritor.write(b"POST /sentimiento HTTP/1.1\r\nHost: local\r\n"
+                           b"Content-Length: " + str(len(texto)).encode() + b"\r\n\r\n" + texto)
+            await escritor.drain()
+
+            estado = int((await lector.readline()).split()[1])
+            longitud = 0
+            while (cabecera := await lector.readline()) not in (b'\r\n', b''):
+                if cabecera.lower().startswith(b'content-length'):
+                    longitud = int(cabecera.split(b':')[1])
+            await lector.readexactly(longitud)
+
+            latencias.append(time.perf_counter() - inicio)
+            if estado == 503:
+                rechazos += 1
+        escritor.close()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(concurrencia)))
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'peticiones': len(latencias),
+        'por_segundo': len(latencias) / total,
+        'rechazos': rechazos,
+        'p50_ms': latencias[len(latencias) // 2] * 1000,
+        'p99_ms': latencias[int(len(latencias) * 0.99)] * 1000,
+    }
+
+
+async def enviar_crudo(host, puerto, datos):
+    """Envía bytes tal cual y devuelve el código de estado de la respuesta."""
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    escritor.write(datos)
+    await escritor.drain()
+    estado = int((await lector.readline()).split()[1])
+    escritor.close()
+    return estado
+
+
+async def consultar_metricas(host, puerto):
+    """GET /metricas y devuelve el JSON como dict."""
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    escritor.write(b"GET /metricas HTTP/1.1\r\nHost: local\r\n\r\n")
+    await escritor.drain()
+    await lector.readline()
+    longitud = 0
+    while (cabecera := await lector.readline()) not in (b'\r\n', b''):
+        if cabecera.lower().startswith(b'content-length'):
+            longitud = int(cabecera.split(b':')[1])
+    cuerpo = await lector.readexactly(longitud)
+    escritor.close()
+    return json.loads(cuerpo)
+
+
+# ==============================================================================
+# EJEMPLO: SERVIDOR + CARGA EN EL MISMO PROCESO
+# ==============================================================================
+
+async def demo():
+    print("=" * 60)
+    print("Servicio de sentimiento con micro-lotes")
+    print("=" * 60)
+
+    lotes = MicroLotes(puntuar_lote, tam_lote=256, espera_ms=5, tam_cola=10_000)
+    lotes.iniciar()
+    servidor = await iniciar_servidor(lotes, puerto=0)
+    host, puerto = servidor.sockets[0].getsockname()[:2]
+    print(f"Escuchando en http://{host}:{puerto}")
+
+    rng = random.Random(42)
+    lexico = sorted(PALABRAS_POSITIVAS | PALABRAS_NEGATIVAS)
+    relleno = ['el', 'producto', 'llegó', 'muy', 'servicio', 'precio', 'calidad']
+    reseñas = [' '.join(rng.choices(relleno, k=12) + rng.choices(lexico, k=2))
+               for _ in range(20_000)]
+
+    for concurrencia in (1, 16, 128):
+        resultado = await generar_carga(host, puerto, reseñas[:5_000], concurrencia)
+        print(f"\nConcurrencia {concurrencia:>3}: {resultado['por_segundo']:8.0f} pet/s, "
+              f"p50 = {resultado['p50_ms']:.2f} ms, p99 = {resultado['p99_ms']:.2f} ms, "
+              f"rechazos = {resultado['rechazos']}")
+
+    # Contrapresión: una cola minúscula rechaza en vez de acumular
+    lotes_pequeños = MicroLotes(puntuar_lote, tam_lote=32, espera_ms=5, tam_cola=16)
+    lotes_pequeños.iniciar()
+    servidor_pequeño = await iniciar_servidor(lotes_pequeños, puerto=0)
+    puerto_pequeño = servidor_pequeño.sockets[0].getsockname()[1]
+    resultado = await generar_carga(host, puerto_pequeño, reseñas[:2_000], 128)
+    print(f"\nCola de 16 con 128 clientes: {resultado['rechazos']} de "
+          f"{resultado['peticiones']} peticiones rechazadas con 503")
+
+    # Peticiones mal formadas: 400 en vez de cortar la conexión sin respuesta
+    print("\nPeticiones mal formadas:")
+    for descripcion, datos in [
+        ("línea sin versión", b"POST /sentimiento\r\n\r\n"),
+        ("Content-Length no numérico", b"POST /sentimiento HTTP/1.1\r\n"
+                                       b"Content-Length: diez\r\n\r\n"),
+        ("cuerpo no UTF-8", b"POST /sentimiento HTTP/1.1\r\n"
+                            b"Content-Length: 2\r\n\r\n\xff\xfe"),
+    ]:
+        print(f"  {descripcion:>28}: {await enviar_crudo(host, puerto, datos)}")
+
+    print("\nMétricas del servidor principal (GET /metricas):")
+    for clave, valor in (await consultar_metricas(host, puerto)).items():
+        print(f"  {clave:>16}: {valor:.2f}" if isinstance(valor, float)
+              else f"  {clave:>16}: {valor}")
+
+    for srv, ml in ((servidor, lotes), (servidor_pequeño, lotes_pequeños)):
+        srv.close()
+        await srv.wait_closed()
+        await ml.detener()
+
+
+if __name__ == "__main__":
+    asyncio.run(demo())
+
+    print("\n" + "=" * 60)
+    print("PRÓXIMO: 11_vocabulario_podado.py")
+    print("=" * 60)
@@ -0,0 +1,324 @@
+"""
+================================================================================
+VOCABULARIO PODADO: min_df, max_df Y max_features
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (crear_vocabulario, bow)
+
+================================================================================
+EL PROBLEMA
+================================================================================
+
+crear_vocabulario guarda TODAS las palabras distintas del corpus. En texto
+real (reseñas, tweets) la mayoría son ruido: erratas, nombres propios,
+números... Una palabra que aparece en un solo documento no ayuda a
+comparar documentos, pero ocupa una columna en CADA vector de bow.
+
+Con 1 millón de reseñas es fácil llegar a 500.000 palabras distintas:
+vectores de 500.000 posiciones casi todas a cero.
+
+================================================================================
+LÍMITES DEL VOCABULARIO (igual que scikit-learn)
+================================================================================
+
+- min_df: descartar palabras que aparecen en MENOS documentos
+          (entero = número de documentos, decimal = proporción)
+- max_df: descartar palabras que aparecen en MÁS documentos
+          (son casi stopwords: "producto" en un feed de productos)
+- max_features: quedarse solo con las N palabras de mayor DF
+
+================================================================================
+CONTEO CON PÉRDIDA (LOSSY COUNTING)
+================================================================================
+
+Para aplicar min_df necesitamos contar el DF de cada palabra... y ese
+Counter es justamente lo que no cabe en memoria.
+
+Lossy Counting (Manku y Motwani, 2002) cuenta con memoria acotada:
+
+1. Dividimos el flujo de documentos en CUBETAS de w = 1/ε documentos
+2. Cada palabra guarda (frecuencia, Δ) donde Δ es el máximo que pudo
+   contarse antes de que la palabra entrara al contador
+3. Al cerrar la cubeta b, BORRAMOS las palabras con frecuencia + Δ ≤ b
+   (son raras: aparecen menos de una vez por cubeta)
+
+Garantías para N documentos:
+- Nunca sobreestima: df_contado ≤ df_real
+- Error máximo: df_real - df_contado ≤ ε·N
+- Toda palabra con df_real > ε·N sigue en el contador
+- Memoria: O((1/ε) · log(ε·N)) palabras, sin importar el tamaño del corpus
+
+Si elegimos ε < min_df (en proporción), ninguna palabra que llegue a
+min_df se pierde.
+
+================================================================================
+DOS PASADAS: PODA CON MEMORIA ACOTADA, RESULTADO EXACTO
+================================================================================
+
+El DF contado se queda corto hasta ε·N, así que filtrar por él cambiaría
+lo que significa min_df. crear_vocabulario hace por defecto:
+
+1. Lossy Counting con ε = min_df / 2 (proporción): memoria acotada
+2. CANDIDATOS: palabras cuya cota superior frecuencia + Δ ≥ min_df
+   (ninguna palabra que llegue a min_df se queda fuera)
+3. Segunda pasada contando de forma EXACTA solo los candidatos, y ahí
+   aplicamos min_df, max_df y max_features
+
+El vocabulario es idéntico al del conteo exacto; solo la memoria cambia.
+
+================================================================================
+"""
+
+import itertools
+import math
+import random
+import time
+from collections import Counter
+
+# ==============================================================================
+# CONTADOR DE DF CON PÉRDIDA
+# ==============================================================================
+
+
+class ContadorDFConPerdida:
+    """
+    Cuenta la frecuencia de documento (DF) de cada palabra con memoria
+    acotada usando Lossy Counting.
+
+    Uso:
+        contador = ContadorDFConPerdida(error=0.001)
+        for tokens in documentos_tokenizados:
+            contador.procesar(tokens)
+        contador.frecuencias()   → dict palabra → df (aproximado por debajo)
+    """
+
+    def __init__(self, error=0.001):
+        """
+        Args:
+            error: ε, error máximo como proporción de los documentos vistos
+        """
+        self.error = error
+        self.ancho_cubeta = math.ceil(1 / error)
+        self.n_docs = 0
+        self.cubeta = 1
+        self._conteos = {}          # palabra → [frecuencia, delta]
+        self.max_entradas = 0       # pico de palabras guardadas a la vez
+
+    def procesar(self, tokens):
+        """Cuenta un documento (cada palabra una vez)."""
+        conteos = self._conteos
+        delta = self.cubeta - 1
+        for palabra in set(tokens):
+            entrada = conteos.get(palabra)
+            if entrada is None:
+                conteos[palabra] = [1, delta]
+            else:
+                entrada[0] += 1
+
+        self.n_docs += 1
+        if self.n_docs % self.ancho_cubeta == 0:
+            self.max_entradas = max(self.max_entradas, len(conteos))
+            self._podar()
+            self.cubeta += 1
+
+    def _podar(self):
+        """Borra las palabras que no pueden superar el umbral de error."""
+        b = self.cubeta
+        self._conteos = {p: e for p, e in self._conteos.items() if e[0] + e[1] > b}
+
+    def frecuencias(self):
+        """DF contado de cada palabra superviviente."""
+        self.max_entradas = max(self.max_entradas, len(self._conteos))
+        return {palabra: entrada[0] for palabra, entrada in self._conteos.items()}
+
+    def cotas_superiores(self):
+        """Máximo DF real posible (frecuencia + Δ) de cada palabra superviviente."""
+        self.max_entradas = max(self.max_entradas, len(self._conteos))
+        return {palabra: f + delta for palabra, (f, delta) in self._conteos.items()}
+
+    def __len__(self):
+        return len(self._conteos)
+
+
+# ==============================================================================
+# crear_vocabulario CON LÍMITES
+# ==============================================================================
+
+def _umbral(valor, n_docs):
+    """Entero = número de documentos; decimal = proporción de n_docs."""
+    if isinstance(valor, float):
+        return valor * n_docs
+    return valor
+
+
+def crear_vocabulario(documentos, min_df=1, max_df=1.0, max_features=None, error=None):
+    """
+    Crea un vocabulario de todos los documentos, aplicando límites.
+
+    Con los valores por defecto se comporta como la versión de
+    01_introduccion_nlp.py (todas las palabras, ordenadas).
+
+    Si min_df supera un documento, cuenta en dos pasadas: Lossy Counting
+    para quedarse con los candidatos y conteo exacto de esos candidatos.
+    El resultado es el mismo que contando todo de forma exacta.
+
+    Args:
+        documentos: Colección de textos (lista...). Con poda se recorre
+                    dos veces, así que no vale un generador
+        min_df: Mínimo de documentos (int) o proporción (float)
+        max_df: Máximo de documentos (int) o proporción (float)
+        max_features: Máximo de palabras (las de mayor DF)
+        error: ε de Lossy Counting, menor que min_df en proporción
+               (si ε·N alcanza min_df, ValueError).
+               None = la mitad de min_df;
+               0 = sin poda (un solo Counter exacto de todo el corpus)
+
+    Returns:
+        list: Vocabulario ordenado alfabéticamente
+    """
+    # Antes de len(): un generador no lo tiene y daría un TypeError críptico
+    podar = error if error is not None else isinstance(min_df, float) or min_df > 1
+    if podar and iter(documentos) is documentos:
+        raise TypeError("Con poda los documentos se recorren dos veces: "
+                        "pasa una lista, no un iterador")
+
+    if error is None and podar:
+        n_docs = len(documentos)
+        minimo = _umbral(min_df, n_docs)
+        # ε estrictamente menor que min_df: con df_real = ε·N justo, Lossy
+        # Counting puede borrar la palabra. Con min_df ≤ 1 documento se
+        # conservan todas las palabras y no hay nada que podar
+        error = minimo / 2 / n_docs if minimo > 1 and n_docs else 0
+
+    if not error:
+        df = Counter()
+        n_docs = 0
+        for doc in documentos:
+            df.update(set(doc.lower().split()))
+            n_docs += 1
+        minimo, maximo = _umbral(min_df, n_docs), _umbral(max_df, n_docs)
+    else:
+        # Pasada 1: candidatos con memoria acotada. La cota superior nunca
+        # se queda corta, así que no perdemos ninguna palabra válida
+        contador = ContadorDFConPerdida(error)
+        for doc in documentos:
+            contador.procesar(doc.lower().split())
+        n_docs = contador.n_docs
+        minimo, maximo = _umbral(min_df, n_docs), _umbral(max_df, n_docs)
+        if error * n_docs >= minimo:
+            raise ValueError(f"error·N = {error * n_docs:g} debe ser menor que min_df "
+                             f"({minimo:g} documentos): Lossy Counting podría "
+                             f"descartar palabras que lo alcanzan")
+        candidatos = {p for p, cota in contador.cotas_superiores().items() if cota >= minimo}
+
+        # Pasada 2: DF exacto, solo de los candidatos
+        df = Counter()
+        for doc in documentos:
+            df.update(candidatos.intersection(doc.lower().split()))
+
+    palabras = [(p, f) for p, f in df.items() if minimo <= f <= maximo]
+
+    if max_features is not None and len(palabras) > max_features:
+        # Mayor DF primero; a igual DF, orden alfabético (resultado estable)
+        palabras.sort(key=lambda x: (-x[1], x[0]))
+        palabras = palabras[:max_features]
+
+    return sorted(p for p, _ in palabras)
+
+
+def bow(documento, vocabulario):
+    """Convierte un documento en vector Bag of Words."""
+    tokens = documento.lower().split()
+    conteo = Counter(tokens)
+    return [conteo.get(palabra, 0) for palabra in vocabulario]
+
+
+# ==============================================================================
+# EJEMPLO 1: LÍMITES SOBRE UN CORPUS PEQUEÑO
+# ==============================================================================
+
+print("=" * 60)
+print("EJEMPLO 1: min_df, max_df y max_features")
+print("=" * 60)
+
+documentos = [
+    "el gato come pescado",
+    "el perro come carne",
+    "el gato y el perro juegan",
+    "el gato duerme",
+]
+
+print(f"Sin límites:        {crear_vocabulario(documentos)}")
+print(f"min_df=2:           {crear_vocabulario(documentos, min_df=2)}")
+print(f"min_df=2, max_df=0.9: {crear_vocabulario(documentos, min_df=2, max_df=0.9)}")
+print(f"max_features=3:     {crear_vocabulario(documentos, max_features=3)}")
+
+vocabulario = crear_vocabulario(documentos, min_df=2, max_df=0.9)
+for doc in documentos:
+    print(f"  '{doc}' → {bow(doc, vocabulario)}")
+
+
+# ==============================================================================
+# EJEMPLO 2: MEMORIA ACOTADA EN UN CORPUS RUIDOSO
+# ==============================================================================
+
+print("\n" + "=" * 60)
+print("EJEMPLO 2: Conteo exacto vs Lossy Counting")
+print("=" * 60)
+
+rng = random.Random(42)
+vocab = [f"pal{i}" for i in range(5_000)]
+acumulados = list(itertools.accumulate(1 / (i + 1) for i in range(len(vocab))))
+
+
+def reseña_ruidosa(i):
+    """Zipf + una errata única por reseña (ruido que nunca se repite)."""
+    tokens = rng.choices(vocab, cum_weights=acumulados, k=20)
+    tokens.append(f"errata{i}")
+    return ' '.join(tokens)
+
+
+corpus = [reseña_ruidosa(i) for i in range(100_000)]
+
+exacto = Counter()
+for doc in corpus:
+    exacto.update(set(doc.split()))
+
+contador = ContadorDFConPerdida(error=0.0005)
+for doc in corpus:
+    contador.procesar(doc.split())
+aproximado = contador.frecuencias()
+
+min_df = 0.001
+umbral = min_df * len(corpus)
+relevantes = {p for p, f in exacto.items() if f >= umbral}
+
+print(f"Palabras distintas en el corpus:     {len(exacto):>8,}")
+print(f"Entradas máximas con Lossy Counting: {contador.max_entradas:>8,} (ε = {contador.error})")
+print(f"Palabras con df ≥ {umbral:.0f} (min_df={min_df}): {len(relevantes):,}, "
+      f"todas conservadas: {relevantes <= aproximado.keys()}")
+error_max = max(exacto[p] - f for p, f in aproximado.items())
+print(f"Error máximo de DF: {error_max} (garantía: ≤ {contador.error * len(corpus):.0f})")
+
+inicio = time.perf_counter()
+voc_completo = crear_vocabulario(corpus)
+t_completo = time.perf_counter() - inicio
+inicio = time.perf_counter()
+voc_exacto = crear_vocabulario(corpus, min_df=min_df, max_df=0.5, error=0)
+t_exacto = time.perf_counter() - inicio
+inicio = time.perf_counter()
+voc_podado = crear_vocabulario(corpus, min_df=min_df, max_df=0.5)
+t_podado = time.perf_counter() - inicio
+
+print(f"\nAncho de los vectores bow:")
+print(f"  sin límites:                              {len(voc_completo):>7,} ({t_completo:.2f} s)")
+print(f"  min_df=0.001, max_df=0.5, Counter exacto: {len(voc_exacto):>7,} ({t_exacto:.2f} s)")
+print(f"  min_df=0.001, max_df=0.5, dos pasadas:    {len(voc_podado):>7,} ({t_podado:.2f} s, "
+      f"ε = {min_df / 2})")
+print(f"  Mismo vocabulario: {voc_podado == voc_exacto}")
+
+
+print("\n" + "=" * 60)
+print("PRÓXIMO: 12_naive_bayes_streaming.py")
+print("=" * 60)
@@ -0,0 +1,351 @@
+"""
+================================================================================
+CLASIFICADOR NAIVE BAYES MULTINOMIAL EN STREAMING
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (bow, analizar_sentimiento)
+- 11_vocabulario_podado.py (vocabulario con límites)
+
+================================================================================
+DEL LÉXICO AL APRENDIZAJE
+================================================================================
+
+analizar_sentimiento usa una lista fija de palabras. No sabe que "devolví"
+o "se rompió" son negativas, porque nadie las puso en la lista.
+
+Los Transformers lo aprenden todo, pero cuestan ~10-100 ms por reseña en
+CPU: con millones de reseñas al día no es viable.
+
+Naive Bayes Multinomial APRENDE el léxico de datos etiquetados y es
+rapidísimo: entrenar es CONTAR y predecir es SUMAR.
+
+================================================================================
+CÓMO FUNCIONA
+================================================================================
+
+Para cada clase c (POSITIVO, NEGATIVO) contamos cuántas veces aparece
+cada palabra w en sus documentos:
+
+    P(w | c) = (conteo(w, c) + α) / (total_palabras(c) + α·|V|)
+
+(α = suavizado de Laplace: una palabra nunca vista no da probabilidad 0)
+
+Para un documento d con conteos x_w:
+
+    log P(c | d) ∝ log P(c) + Σ_w x_w · log P(w | c)
+
+¡Es un producto matriz-vector! Con la matriz BoW dispersa (CSR):
+
+    scores = X · log_P(w|c)ᵀ + log_P(c)
+
+================================================================================
+APRENDIZAJE EN STREAMING (partial_fit)
+================================================================================
+
+Como entrenar es contar, podemos procesar los datos en MINI-LOTES:
+cada lote suma sus conteos y se descarta. Una sola pasada sobre millones
+de reseñas, con memoria constante (una matriz clases × vocabulario).
+
+El modelo entrenado son solo dos arrays (conteos por clase y palabra,
+documentos por clase): se guarda con np.savez y pesa unos pocos MB.
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import os
+import random
+import re
+import tempfile
+import time
+
+import numpy as np
+
+# ==============================================================================
+# BOW DISPERSO (CSR)
+# ==============================================================================
+
+PATRON_TOKEN = re.compile(r'[a-záéíóúñü0-9]+')
+
+
+def bow_csr(documentos, vocabulario):
+    """
+    Bag of Words de un lote de documentos en formato CSR.
+
+    Las palabras fuera del vocabulario se ignoran.
+
+    Returns:
+        tuple: (indptr int64, indices int32, data float32)
+    """
+    get = vocabulario.get
+    indptr = [0]
+    indices = []
+    for doc in documentos:
+        ids = [i for i in map(get, PATRON_TOKEN.findall(doc.lower())) if i is not None]
+        indices.extend(ids)
+        indptr.append(len(indices))
+    indices = np.asarray(indices, dtype=np.int32)
+    return (np.asarray(indptr, dtype=np.int64), indices,
+            np.ones(len(indices), dtype=np.float32))
+
+
+# ==============================================================================
+# NAIVE BAYES MULTINOMIAL
+# ==============================================================================
+
+class NaiveBayesMultinomial:
+    """
+    Naive Bayes multinomial entrenable por mini-lotes.
+
+    Uso:
+        modelo = NaiveBayesMultinomial(n_caracteristicas=len(vocabulario),
+                                       clases=['NEGATIVO', 'POSITIVO'])
+        for X, y in lotes:
+            modelo.partial_fit(X, y)
+        modelo.predecir(X)
+
+    X es siempre una tupla CSR (indptr, indices, data) con los conteos
+    de cada palabra; y son índices de clase (enteros).
+
+    Atributos:
+        conteo_palabras: float64 (n_clases × n_caracteristicas)
+        conteo_clases: float64 (n_clases), documentos vistos por clase
+    """
+
+    def __init__(self, n_caracteristicas, clases, alfa=1.0):
+        """
+        Args:
+            n_caracteristicas: Tamaño del vocabulario
+            clases: Nombres de las clases (y usa su posición)
+            alfa: Suavizado de Laplace
+        """
+        self.n_caracteristicas = n_caracteristicas
+        self.clases = list(clases)
+        self.alfa = alfa
+        self.conteo_palabras = np.zeros((len(self.clases), n_caracteristicas))
+        self.conteo_clases = np.zeros(len(self.clases))
+        self._log_probs = None    # caché, se invalida en cada partial_fit
+
+    def partial_fit(self, X, y):
+        """
+        Suma los conteos de un mini-lote.
+
+        Un solo np.bincount acumula todas las (clase, palabra) del lote.
+        Lanza ValueError si alguna etiqueta no es un índice de clase.
+        """
+        indptr, indices, data = X
+        y = np.asarray(y, dtype=np.intp)
+        n_clases = len(self.clases)
+        if len(y) and (y.min() < 0 or y.max() >= n_clases):
+            raise ValueError(f"Etiquetas fuera de rango: deben estar en [0, {n_clases})")
+
+        clase_de_cada_valor = np.repeat(y, np.diff(indptr))
+        celda = clase_de_cada_valor * self.n_caracteristicas + indices
+        self.conteo_palabras += np.bincount(
+            celda, weights=data, minlength=n_clases * self.n_caracteristicas
+        ).reshape(n_clases, self.n_caracteristicas)
+        self.conteo_clases += np.bincount(y, minlength=n_clases)
+
+        self._log_probs = None
+        return self
+
+    def _parametros(self):
+        """
+        log P(w|c) (float32) y log P(c), calculados una vez por cambio.
+        P(c) también lleva suavizado de Laplace: una clase sin documentos
+        tiene una probabilidad pequeña, no log(0) = -inf.
+        """
+        if self._log_probs is None:
+            suavizado = self.conteo_palabras + self.alfa
+            log_p_palabra = np.log(suavizado) - np.log(suavizado.sum(axis=1, keepdims=True))
+            clases_suavizado = self.conteo_clases + self.alfa
+            log_p_clase = np.log(clases_suavizado) - np.log(clases_suavizado.sum())
+            self._log_probs = (log_p_palabra.astype(np.float32), log_p_clase)
+        return self._log_probs
+
+    def log_probabilidades(self, X):
+        """
+        Log-probabilidad conjunta (sin normalizar) de cada clase.
+
+        Returns:
+            float64 (n_documentos × n_clases)
+        """
+        indptr, indices, data = X
+        log_p_palabra, log_p_clase = self._parametros()
+        n_docs = len(indptr) - 1
+        fila = np.repeat(np.arange(n_docs), np.diff(indptr))
+
+        scores = np.empty((n_docs, len(self.clases)))
+        for c in range(len(self.clases)):
+            scores[:, c] = np.bincount(fila, weights=data * log_p_palabra[c, indices],
+                                       minlength=n_docs)
+        scores += log_p_clase
+        return scores
+
+    def predecir_indices(self, X):
+        return self.log_probabilidades(X).argmax(axis=1)
+
+    def predecir(self, X):
+        """Nombre de la clase más probable de cada documento."""
+        return [self.clases[i] for i in self.predecir_indices(X)]
+
+    def guardar(self, ruta):
+        """
+        Guarda el modelo como arrays (.npz); se puede seguir entrenando.
+        Los conteos van en float64: en float32 dejan de ser exactos a
+        partir de 2²⁴ y un modelo recargado acumularía mal.
+        """
+        np.savez(ruta, conteo_palabras=self.conteo_palabras,
+                 conteo_clases=self.conteo_clases, clases=np.array(self.clases),
+                 alfa=self.alfa)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with np.load(ruta) as datos:
+            modelo = cls(datos['conteo_palabras'].shape[1],
+                         datos['clases'].tolist(), float(datos['alfa']))
+            modelo.conteo_palabras[:] = datos['conteo_palabras']
+            modelo.conteo_clases[:] = datos['conteo_clases']
+        return modelo
+
+
+# ==============================================================================
+# DATOS DE EJEMPLO
+# ==============================================================================
+
+PALABRAS_POSITIVAS = {
+    'bueno', 'excelente', 'genial', 'increíble', 'fantástico',
+    'amor', 'feliz', 'alegre', 'mejor', 'maravilloso', 'encanta',
+    'recomiendo', 'perfecto', 'útil', 'fácil'
+}
+
+PALABRAS_NEGATIVAS = {
+    'malo', 'terrible', 'horrible', 'pésimo', 'peor',
+    'odio', 'triste', 'difícil', 'problema', 'error',
+    'lento', 'caro', 'feo', 'aburrido', 'inútil'
+}
+
+
+def analizar_sentimiento(texto):
+    """Análisis de sentimiento basado en diccionario (01_introduccion_nlp.py)."""
+    tokens = set(texto.lower().split())
+    positivas = len(tokens & PALABRAS_POSITIVAS)
+    negativas = len(tokens & PALABRAS_NEGATIVAS)
+    if positivas > negativas:
+        return 'POSITIVO', positivas - negativas
+    elif negativas > positivas:
+        return 'NEGATIVO', negativas - positivas
+    return 'NEUTRAL', 0
+
+
+rng = random.Random(42)
+neutras = [f"pal{i}" for i in range(3_000)]
+# Palabras que el léxico no conoce pero que tienen polaridad en los datos
+pistas_pos = ['llegó', 'rápido', 'calidad', 'volvería', 'cómodo', 'funciona']
+pistas_neg = ['devolví', 'roto', 'tarde', 'nunca', 'reclamo', 'falla']
+
+
+def generar_reseñas(n):
+    """Reseñas sintéticas etiquetadas (0 = NEGATIVO, 1 = POSITIVO)."""
+    textos, etiquetas = [], []
+    for _ in range(n):
+        clase = rng.random() < 0.5
+        lexico = sorted(PALABRAS_POSITIVAS if clase else PALABRAS_NEGATIVAS)
+        tokens = rng.choices(neutras, k=15)
+        for _ in range(2):
+            # Ruido: una de cada cuatro pistas es de la clase contraria
+            acierta = rng.random() < 0.75
+            tokens.append(rng.choice(pistas_pos if acierta == clase else pistas_neg))
+        if rng.random() < 0.5:
+            tokens.append(rng.choice(lexico))
+        rng.shuffle(tokens)
+        textos.append(' '.join(tokens))
+        etiquetas.append(int(clase))
+    return textos, etiquetas
+
+
+vocabulario = {p: i for i, p in enumerate(
+    sorted(set(neutras) | set(pistas_pos) | set(pistas_neg)
+           | PALABRAS_POSITIVAS | PALABRAS_NEGATIVAS))}
+
+
+# ==============================================================================
+# EJEMPLO 1: ENTRENAMIENTO EN UNA PASADA POR MINI-LOTES
+# ==============================================================================
+
+print("=" * 60)
+print("EJEMPLO 1: Entrenamiento con partial_fit")
+print("=" * 60)
+
+modelo = NaiveBayesMultinomial(len(vocabulario), ['NEGATIVO', 'POSITIVO'])
+
+n_lotes, tam_lote = 20, 10_000
+tiempo_vectorizar = tiempo_entrenar = 0.0
+for _ in range(n_lotes):
+    textos, etiquetas = generar_reseñas(tam_lote)   # llega un lote del stream
+    inicio = time.perf_counter()
+    X = bow_csr(textos, vocabulario)
+    tiempo_vectorizar += time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    modelo.partial_fit(X, etiquetas)
+    tiempo_entrenar += time.perf_counter() - inicio
+
+n_entrenamiento = n_lotes * tam_lote
+print(f"{n_entrenamiento:,} reseñas en {n_lotes} mini-lotes")
+print(f"  Vectorizar (bow_csr): {tiempo_vectorizar:.2f} s")
+print(f"  partial_fit:          {tiempo_entrenar:.3f} s")
+
+textos_test, etiquetas_test = generar_reseñas(50_000)
+X_test = bow_csr(textos_test, vocabulario)
+predichas = modelo.predecir_indices(X_test)
+precision_nb = np.mean(predichas == np.asarray(etiquetas_test))
+
+lexico = [analizar_sentimiento(t)[0] for t in textos_test]
+precision_lexico = np.mean([
+    (p == 'POSITIVO') == bool(e) and p != 'NEUTRAL'
+    for p, e in zip(lexico, etiquetas_test)
+])
+
+print(f"\nPrecisión en 50.000 reseñas nuevas:")
+print(f"  analizar_sentimiento (léxico): {precision_lexico:.1%}")
+print(f"  Naive Bayes:                   {precision_nb:.1%}")
+
+log_p_palabra, _ = modelo._parametros()
+diferencia = log_p_palabra[1] - log_p_palabra[0]
+palabras = sorted(vocabulario, key=vocabulario.get)
+print("\nPalabras más POSITIVAS aprendidas:",
+      [palabras[i] for i in np.argsort(-diferencia)[:6]])
+print("Palabras más NEGATIVAS aprendidas:",
+      [palabras[i] for i in np.argsort(diferencia)[:6]])
+
+
+# ==============================================================================
+# EJEMPLO 2: VELOCIDAD DE PREDICCIÓN Y SERIALIZACIÓN
+# ==============================================================================
+
+print("\n" + "=" * 60)
+print("EJEMPLO 2: Predicción masiva y guardado")
+print("=" * 60)
+
+inicio = time.perf_counter()
+modelo.log_probabilidades(X_test)
+tiempo = time.perf_counter() - inicio
+print(f"Puntuar {len(textos_test):,} reseñas ya vectorizadas: {tiempo * 1000:.1f} ms "
+      f"→ {len(textos_test) / tiempo * 60 / 1e6:.0f} millones/minuto")
+
+ruta = os.path.join(tempfile.mkdtemp(), "naive_bayes.npz")
+modelo.guardar(ruta)
+cargado = NaiveBayesMultinomial.cargar(ruta)
+print(f"\nModelo guardado: {os.path.getsize(ruta) / 1024:.0f} KB")
+print(f"¿Predice igual tras cargar? "
+      f"{np.array_equal(cargado.predecir_indices(X_test), predichas)}")
+os.remove(ruta)
+os.rmdir(os.path.dirname(ruta))
+
+
+print("\n" + "=" * 60)
+print("PRÓXIMO: 13_vectores_ppmi.py")
+print("=" * 60)
@@ -0,0 +1,348 @@
+"""
+================================================================================
+VECTORES DE PALABRAS CON CO-OCURRENCIAS, PPMI Y SVD
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (EMBEDDINGS en los conceptos fundamentales)
+- 04_similitud_coseno_topk.py (matrices CSR)
+
+================================================================================
+"DIME CON QUIÉN ANDAS Y TE DIRÉ QUIÉN ERES"
+================================================================================
+
+Hipótesis distribucional: las palabras que aparecen en contextos
+parecidos tienen significados parecidos. "gato" y "perro" aparecen cerca
+de "come", "duerme", "mascota"... "teclado" no.
+
+Sin descargar modelos (word2vec, GloVe) podemos construir vectores así:
+
+1. MATRIZ DE CO-OCURRENCIA: C[i, j] = cuántas veces la palabra j aparece
+   a menos de `ventana` palabras de la palabra i
+2. PPMI (Positive Pointwise Mutual Information): ¿co-ocurren MÁS de lo que
+   esperaríamos por azar?
+
+       PMI(i, j) = log( P(i, j) / (P(i) · P(j)) )
+       PPMI(i, j) = max(0, PMI(i, j))
+
+   Así "gato"–"el" (muy frecuentes ambas) pesa poco y "gato"–"maúlla" mucho
+3. SVD TRUNCADA: comprimimos las |V| columnas a d = 100 dimensiones densas
+   que capturan la estructura principal. Esos son los vectores.
+
+================================================================================
+MEMORIA ACOTADA
+================================================================================
+
+100 millones de tokens no caben como lista de pares. Procesamos el corpus
+en TROZOS: cada trozo genera sus pares (i, j) y los agrupa con np.unique.
+Los trozos agrupados esperan en un BÚFER y se FUSIONAN con el acumulado
+(formato COO ordenado) cuando el búfer iguala al acumulado: cada fusión
+cuesta lo mismo que lo que fusiona, no se re-ordena todo en cada trozo.
+La memoria depende del número de pares DISTINTOS (limitado por |V|²),
+no del número de tokens.
+
+Al final convertimos COO → CSR y aplicamos una SVD ALEATORIZADA
+(Halko, Martinsson y Tropp, 2011) solo con NumPy: proyectamos la matriz
+sobre d + p direcciones aleatorias, ortogonalizamos (QR) y hacemos una SVD
+exacta de una matriz pequeña.
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+# ==============================================================================
+# CO-OCURRENCIAS POR TROZOS
+# ==============================================================================
+
+
+class ContadorCoocurrencias:
+    """
+    Acumula la matriz de co-ocurrencia de palabras por trozos de corpus.
+
+    Uso:
+        contador = ContadorCoocurrencias(vocabulario, ventana=4)
+        for trozo in trozos_de_documentos:
+            contador.agregar(trozo)
+        matriz = contador.a_csr()
+
+    Internamente guarda la matriz en COO ordenado: claves int64
+    (fila · |V| + columna) y conteos float32.
+    """
+
+    def __init__(self, vocabulario, ventana=4, ponderar_distancia=True,
+                 tam_buffer=1_000_000):
+        """
+        Args:
+            vocabulario: dict palabra → id (las demás palabras se ignoran)
+            ventana: Distancia máxima entre palabras que co-ocurren
+            ponderar_distancia: Si True, un par a distancia d suma 1/d
+            tam_buffer: Pares pendientes mínimos antes de fusionar
+        """
+        self.vocabulario = vocabulario
+        self.n = len(vocabulario)
+        self.ventana = ventana
+        self.ponderar_distancia = ponderar_distancia
+        self.claves = np.empty(0, dtype=np.int64)
+        self.conteos = np.empty(0, dtype=np.float32)
+        self.n_tokens = 0
+        self.tam_buffer = tam_buffer
+        self._pendientes = []       # (claves, conteos) agrupados por trozo
+        self._n_pendientes = 0
+
+    def agregar(self, documentos):
+        """Cuenta las co-ocurrencias de un trozo de documentos."""
+        get = self.vocabulario.get
+        ids, docs = [], []
+        for d, doc in enumerate(documentos):
+            tokens = [i for i in map(get, doc.lower().split()) if i is not None]
+            ids.extend(tokens)
+            docs.extend([d] * len(tokens))
+        ids = np.asarray(ids, dtype=np.int64)
+        docs = np.asarray(docs, dtype=np.int64)
+        self.n_tokens += len(ids)
+
+        claves, pesos = [], []
+        for distancia in range(1, self.ventana + 1):
+            # Pares (token i, token i + distancia) del mismo documento
+            mismo_doc = docs[:-distancia] == docs[distancia:]
+            a = ids[:-distancia][mismo_doc]
+            b = ids[distancia:][mismo_doc]
+            peso = 1.0 / distancia if self.ponderar_distancia else 1.0
+            # Simétrica: (a, b) y (b, a)
+            claves.extend([a * self.n + b, b * self.n + a])
+            pesos.append(np.full(2 * len(a), peso, dtype=np.float32))
+
+        if claves:
+            claves, inversa = np.unique(np.concatenate(claves), return_inverse=True)
+            pesos = np.bincount(inversa, weights=np.concatenate(pesos)).astype(np.float32)
+            self._pendientes.append((claves, pesos))
+            self._n_pendientes += len(claves)
+            if self._n_pendientes >= max(len(self.claves), self.tam_buffer):
+                self._fusionar()
+
+    def _fusionar(self):
+        """Suma los trozos pendientes al acumulado ordenado, de una vez."""
+        if not self._pendientes:
+            return
+        claves, pesos = zip(*self._pendientes)
+        todas = np.concatenate([self.claves, *claves])
+        todos_pesos = np.concatenate([self.conteos, *pesos])
+        self.claves, inversa = np.unique(todas, return_inverse=True)
+        self.conteos = np.bincount(inversa, weights=todos_pesos).astype(np.float32)
+        self._pendientes, self._n_pendientes = [], 0
+
+    def a_csr(self):
+        """Matriz de co-ocurrencia en CSR: (indptr, indices, data, n)."""
+        self._fusionar()
+        filas = self.claves // self.n
+        indices = (self.claves % self.n).astype(np.int32)
+        indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(filas, minlength=self.n), out=indptr[1:])
+        return indptr, indices, self.conteos.copy(), self.n
+
+    def memoria_bytes(self):
+        return (self.claves.nbytes + self.conteos.nbytes
+                + sum(c.nbytes + p.nbytes for c, p in self._pendientes))
+
+
+# ==============================================================================
+# PPMI
+# ==============================================================================
+
+def ppmi(matriz, alfa=0.75):
+    """
+    PPMI de una matriz de co-ocurrencia CSR.
+
+    Args:
+        matriz: (indptr, indices, data, n)
+        alfa: Suavizado de la distribución de contextos (Levy et al., 2015):
+              elevar los conteos de contexto a 0.75 reduce el sesgo de PMI
+              hacia palabras raras
+
+    Returns:
+        (indptr, indices, data, n) solo con los valores positivos
+    """
+    indptr, indices, data, n = matriz
+    filas = np.repeat(np.arange(n), np.diff(indptr))
+
+    total = data.sum()
+    p_fila = np.bincount(filas, weights=data, minlength=n) / total
+    contexto = np.bincount(indices, weights=data, minlength=n) ** alfa
+    p_contexto = contexto / contexto.sum()
+
+    pmi = np.log(data / total) - np.log(p_fila[filas]) - np.log(p_contexto[indices])
+    positivos = pmi > 0
+
+    nuevo_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(filas[positivos], minlength=n), out=nuevo_indptr[1:])
+    return nuevo_indptr, indices[positivos], pmi[positivos].astype(np.float32), n
+
+
+# ==============================================================================
+# SVD ALEATORIZADA (solo NumPy)
+# ==============================================================================
+
+def _csr_por_densa(indptr, indices, data, densa, memoria_bytes=64 * 1024**2):
+    """
+    Producto CSR × denso: suma por fila de data · densa[columna].
+
+    Recorre las filas por bloques cuyo producto intermedio (nnz_bloque ×
+    columnas) cabe en memoria_bytes, en vez de materializar nnz × columnas.
+    """
+    n_filas = len(indptr) - 1
+    resultado = np.zeros((n_filas, densa.shape[1]), dtype=densa.dtype)
+    max_nnz = max(1, memoria_bytes // (densa.itemsize * densa.shape[1]))
+    inicio = 0
+    while inicio < n_filas:
+        fin = int(np.searchsorted(indptr, indptr[inicio] + max_nnz, side='right')) - 1
+        fin = min(max(fin, inicio + 1), n_filas)
+        a, b = indptr[inicio], indptr[fin]
+        if b > a:
+            productos = densa[indices[a:b]] * data[a:b, None]
+            no_vacias = np.flatnonzero(np.diff(indptr[inicio:fin + 1]) > 0)
+            resultado[inicio + no_vacias] = np.add.reduceat(
+                productos, indptr[inicio:fin][no_vacias] - a, axis=0)
+        inicio = fin
+    return resultado
+
+
+def _traspuesta(indptr, indices, data, n):
+    """Traspuesta de una matriz CSR cuadrada (CSR de Aᵀ)."""
+    filas = np.repeat(np.arange(n), np.diff(indptr))
+    orden = np.argsort(indices, kind='stable')
+    nuevo_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n), out=nuevo_indptr[1:])
+    return nuevo_indptr, filas[orden].astype(np.int32), data[orden]
+
+
+def svd_aleatorizada(matriz, k=100, sobremuestreo=10, iteraciones=3, semilla=0):
+    """
+    SVD truncada aproximada: A ≈ U · diag(S) · Vᵀ con k componentes.
+
+    Args:
+        matriz: CSR cuadrada (indptr, indices, data, n)
+        k: Componentes a conservar
+        sobremuestreo: Direcciones aleatorias extra (mejora la precisión)
+        iteraciones: Iteraciones de potencia (separan mejor los valores
+                     singulares cuando decaen lentamente)
+
+    Returns:
+        tuple: (U n × k, S k)
+    """
+    indptr, indices, data, n = matriz
+    traspuesta = _traspuesta(indptr, indices, data, n)
+    rng = np.random.default_rng(semilla)
+
+    k_total = min(k + sobremuestreo, n)
+    Y = _csr_por_densa(indptr, indices, data, rng.standard_normal((n, k_total)))
+    Q, _ = np.linalg.qr(Y)
+    for _ in range(iteraciones):
+        Z, _ = np.linalg.qr(_csr_por_densa(*traspuesta, Q))
+        Q, _ = np.linalg.qr(_csr_por_densa(indptr, indices, data, Z))
+
+    # B = Qᵀ · A  (k_total × n), pequeña: SVD exacta
+    B = _csr_por_densa(*traspuesta, Q).T
+    U_b, S, _ = np.linalg.svd(B, full_matrices=False)
+    return (Q @ U_b)[:, :k], S[:k]
+
+
+# ==============================================================================
+# VECTORES DE PALABRAS
+# ==============================================================================
+
+class VectoresPalabras:
+    """Vectores densos normalizados + búsqueda de vecinos por coseno."""
+
+    def __init__(self, vocabulario, U, S):
+        self.vocabulario = vocabulario
+        self.palabras = sorted(vocabulario, key=vocabulario.get)
+        vectores = U * np.sqrt(S)
+        normas = np.linalg.norm(vectores, axis=1, keepdims=True)
+        normas[normas == 0] = 1.0
+        self.vectores = (vectores / normas).astype(np.float32)
+
+    def similitud(self, a, b):
+        return float(self.vectores[self.vocabulario[a]] @ self.vectores[self.vocabulario[b]])
+
+    def similares(self, palabra, n=5):
+        """Las n palabras más parecidas (coseno)."""
+        n = min(n, len(self.palabras) - 1)
+        if n <= 0:
+            return []
+        sims = self.vectores @ self.vectores[self.vocabulario[palabra]]
+        mejores = np.argpartition(-sims, n)[:n + 1]
+        mejores = mejores[np.argsort(-sims[mejores])]
+        return [(self.palabras[i], float(sims[i])) for i in mejores
+                if self.palabras[i] != palabra][:n]
+
+
+# ==============================================================================
+# EJEMPLO: CORPUS CON TEMAS
+# ==============================================================================
+
+print("=" * 60)
+print("EJEMPLO: Vectores PPMI + SVD sobre un corpus sintético")
+print("=" * 60)
+
+rng = random.Random(42)
+temas = {
+    'mascotas': ['gato', 'perro', 'loro', 'hámster', 'mascota', 'veterinario',
+                 'maúlla', 'ladra', 'correa', 'pienso'],
+    'comida': ['pizza', 'pasta', 'ensalada', 'postre', 'restaurante', 'camarero',
+               'sabrosa', 'receta', 'horno', 'queso'],
+    'tecnología': ['teclado', 'ratón', 'pantalla', 'portátil', 'batería', 'cargador',
+                   'software', 'pulgadas', 'procesador', 'memoria'],
+}
+comunes = ['el', 'la', 'muy', 'es', 'con', 'mi', 'un', 'una', 'bueno', 'nuevo']
+ruido = [f"pal{i}" for i in range(2_000)]
+
+
+def frase():
+    palabras_tema = temas[rng.choice(list(temas))]
+    tokens = (rng.choices(palabras_tema, k=6) + rng.choices(comunes, k=4)
+              + rng.choices(ruido, k=4))
+    rng.shuffle(tokens)
+    return ' '.join(tokens)
+
+
+corpus = [frase() for _ in range(60_000)]
+
+frecuencias = Counter(t for doc in corpus for t in doc.split())
+vocabulario = {p: i for i, (p, _) in enumerate(frecuencias.most_common(1_500))}
+
+inicio = time.perf_counter()
+contador = ContadorCoocurrencias(vocabulario, ventana=4)
+for i in range(0, len(corpus), 5_000):
+    contador.agregar(corpus[i:i + 5_000])
+tiempo_conteo = time.perf_counter() - inicio
+
+coocurrencias = contador.a_csr()
+print(f"{contador.n_tokens:,} tokens, vocabulario {len(vocabulario):,}")
+print(f"Co-ocurrencias distintas: {len(coocurrencias[2]):,} "
+      f"({contador.memoria_bytes() / 1e6:.1f} MB) en {tiempo_conteo:.2f} s")
+
+inicio = time.perf_counter()
+matriz_ppmi = ppmi(coocurrencias)
+U, S = svd_aleatorizada(matriz_ppmi, k=50)
+print(f"PPMI + SVD aleatorizada (k=50): {time.perf_counter() - inicio:.2f} s")
+
+vectores = VectoresPalabras(vocabulario, U, S)
+for palabra in ('gato', 'pizza', 'teclado'):
+    vecinos = ', '.join(f"{p} ({s:.2f})" for p, s in vectores.similares(palabra, 5))
+    print(f"\n  {palabra} → {vecinos}")
+
+print(f"\nsimilitud(gato, perro)   = {vectores.similitud('gato', 'perro'):.2f}")
+print(f"similitud(gato, teclado) = {vectores.similitud('gato', 'teclado'):.2f}")
+
+
+print("\n" + "=" * 60)
+print("PRÓXIMO: 14_lexico_difuso_symspell.py")
+print("=" * 60)
@@ -0,0 +1,366 @@
+"""
+================================================================================
+BÚSQUEDA DIFUSA EN EL LÉXICO: ÍNDICE DE BORRADOS (SYMSPELL)
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (analizar_sentimiento, PALABRAS_POSITIVAS/NEGATIVAS)
+- 09_stemmer_espanol.py (memorización con lru_cache)
+
+================================================================================
+EL PROBLEMA
+================================================================================
+
+analizar_sentimiento busca palabras EXACTAS. En reseñas reales:
+
+    "producto exelente, lo recomiendo"    → 'exelente' no está en el léxico
+    "servicio horible y muy lento"        → 'horible' tampoco
+
+DISTANCIA DE EDICIÓN: mínimo de inserciones, borrados, sustituciones
+(y transposiciones) para convertir una palabra en otra.
+    exelente → excelente: 1 (insertar 'c')
+    horible  → horrible:  1
+
+Comparar cada token con TODO el vocabulario cuesta O(|V| · n²) por token.
+Con un vocabulario de 50.000 palabras es inviable.
+
+================================================================================
+LA IDEA DE SYMSPELL (Wolf Garbe, 2012)
+================================================================================
+
+Si dist(a, b) ≤ 2, entonces quitando ≤ 2 letras de a y ≤ 2 letras de b
+llegamos a una cadena COMÚN. Por ejemplo:
+
+    excelente --quitar 'c'--> exelente <--(sin quitar nada)-- exelente
+    horrible  --quitar 'r'--> horible  <--(sin quitar nada)-- horible
+    perfecto  --quitar 'c'--> perfeto  <--quitar 'c'-------- perfetco
+
+1. PRECÁLCULO: para cada palabra del diccionario, generamos todos sus
+   BORRADOS (variantes con 1 y 2 letras menos) y los guardamos en un
+   dict: borrado → [palabras que lo generan]
+2. BÚSQUEDA: generamos los borrados del token y los buscamos en el dict.
+   Solo calculamos la distancia real con esos pocos CANDIDATOS.
+
+Solo hay borrados (no inserciones ni sustituciones), así que el número de
+variantes por palabra es pequeño: ~n²/2 para distancia 2.
+Para acotar memoria, los borrados se generan sobre un PREFIJO de 7 letras.
+
+Cada token distinto se corrige UNA vez (caché LRU): por la ley de Zipf,
+casi todas las búsquedas son aciertos de caché.
+
+================================================================================
+"""
+
+import itertools
+import random
+import time
+from functools import lru_cache
+
+# ==============================================================================
+# LÉXICO DE SENTIMIENTO (de 01_introduccion_nlp.py)
+# ==============================================================================
+
+PALABRAS_POSITIVAS = {
+    'bueno', 'excelente', 'genial', 'increíble', 'fantástico',
+    'amor', 'feliz', 'alegre', 'mejor', 'maravilloso', 'encanta',
+    'recomiendo', 'perfecto', 'útil', 'fácil'
+}
+
+PALABRAS_NEGATIVAS = {
+    'malo', 'terrible', 'horrible', 'pésimo', 'peor',
+    'odio', 'triste', 'difícil', 'problema', 'error',
+    'lento', 'caro', 'feo', 'aburrido', 'inútil'
+}
+
+
+def analizar_sentimiento(texto):
+    """Análisis de sentimiento basado en diccionario (coincidencia exacta)."""
+    texto = texto.lower()
+    tokens = set(texto.split())
+
+    positivas = len(tokens & PALABRAS_POSITIVAS)
+    negativas = len(tokens & PALABRAS_NEGATIVAS)
+
+    if positivas > negativas:
+        return 'POSITIVO', positivas - negativas
+    elif negativas > positivas:
+        return 'NEGATIVO', negativas - positivas
+    else:
+        return 'NEUTRAL', 0
+
+
+# ==============================================================================
+# DISTANCIA DE EDICIÓN CON CORTE TEMPRANO
+# ==============================================================================
+
+def distancia_edicion(a, b, maximo=None):
+    """
+    Distancia de Damerau-Levenshtein restringida (OSA): inserción, borrado,
+    sustitución y transposición de letras vecinas cuestan 1.
+
+    Si se indica `maximo`, devuelve maximo + 1 en cuanto la distancia
+    seguro lo supera (no termina la tabla).
+    """
+    if maximo is not None and abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+
+    anterior2 = None
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        actual = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            coste = 0 if a[i - 1] == b[j - 1] else 1
+            actual[j] = min(anterior[j] + 1,          # borrado
+                            actual[j - 1] + 1,        # inserción
+                            anterior[j - 1] + coste)  # sustitución
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                actual[j] = min(actual[j], anterior2[j - 2] + 1)  # transposición
+        if maximo is not None and min(actual) > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, actual
+    return anterior[-1]
+
+
+# ==============================================================================
+# ÍNDICE DE BORRADOS
+# ==============================================================================
+
+def borrados(palabra, distancia_max):
+    """Todas las variantes de `palabra` con hasta `distancia_max` letras menos."""
+    resultado = {palabra}
+    frontera = {palabra}
+    for _ in range(distancia_max):
+        frontera = {v[:i] + v[i + 1:] for v in frontera if len(v) > 1 for i in range(len(v))}
+        resultado |= frontera
+    return resultado
+
+
+class IndiceSymSpell:
+    """
+    Corrector ortográfico por índice de borrados.
+
+    Uso:
+        indice = IndiceSymSpell(distancia_max=2)
+        indice.agregar_vocabulario(PALABRAS_POSITIVAS | PALABRAS_NEGATIVAS)
+        indice.corregir('exelente')     → ('excelente', 1)
+        indice.corregir('zzz')          → None
+    """
+
+    def __init__(self, distancia_max=2, longitud_prefijo=7, tam_cache=100_000):
+        """
+        Args:
+            distancia_max: Distancia de edición máxima (1 o 2 es lo habitual)
+            longitud_prefijo: Letras de cada palabra usadas para los borrados
+            tam_cache: Máximo de tokens distintos memorizados por corregir()
+        """
+        self.distancia_max = distancia_max
+        self.longitud_prefijo = longitud_prefijo
+        self.frecuencias = {}       # palabra → frecuencia (desempata)
+        self._borrados = {}         # borrado → [palabras]
+        self.corregir = lru_cache(maxsize=tam_cache)(self._corregir)
+
+    def agregar(self, palabra, frecuencia=1):
+        """Añade (o suma frecuencia a) una palabra del diccionario."""
+        # Las correcciones memorizadas pueden cambiar
+        self.corregir.cache_clear()
+        if palabra in self.frecuencias:
+            self.frecuencias[palabra] += frecuencia
+            return
+        self.frecuencias[palabra] = frecuencia
+        prefijo = palabra[:self.longitud_prefijo]
+        for variante in borrados(prefijo, self.distancia_max):
+            self._borrados.setdefault(variante, []).append(palabra)
+
+    def agregar_vocabulario(self, palabras):
+        """Añade palabras (iterable) o un dict palabra → frecuencia."""
+        if isinstance(palabras, dict):
+            for palabra, frecuencia in palabras.items():
+                self.agregar(palabra, frecuencia)
+        else:
+            for palabra in palabras:
+                self.agregar(palabra)
+
+    def distancia_permitida(self, termino):
+        """Palabras cortas admiten menos errores ('feo' no debe ser 'fea')."""
+        if len(termino) <= 3:
+            return 0
+        if len(termino) <= 5:
+            return min(1, self.distancia_max)
+        return self.distancia_max
+
+    def sugerencias(self, termino, distancia_max=None):
+        """
+        Todas las palabras del diccionario a distancia ≤ distancia_max.
+
+        Returns:
+            list: [(palabra, distancia, frecuencia)] de mejor a peor
+        """
+        if distancia_max is None:
+            distancia_max = self.distancia_permitida(termino)
+        if termino in self.frecuencias:
+            exacta = [(termino, 0, self.frecuencias[termino])]
+            if distancia_max == 0:
+                return exacta
+        elif distancia_max == 0:
+            return []
+
+        revisadas = set()
+        resultado = []
+        prefijo = termino[:self.longitud_prefijo]
+        for variante in borrados(prefijo, distancia_max):
+            for palabra in self._borrados.get(variante, ()):
+                if palabra in revisadas:
+                    continue
+                revisadas.add(palabra)
+                d = distancia_edicion(termino, palabra, distancia_max)
+                if d <= distancia_max:
+                    resultado.append((palabra, d, self.frecuencias[palabra]))
+
+        resultado.sort(key=lambda s: (s[1], -s[2], s[0]))
+        return resultado
+
+    def _corregir(self, termino):
+        """Mejor corrección de un token: (palabra, distancia) o None."""
+        sugerencias = self.sugerencias(termino)
+        if not sugerencias:
+            return None
+        palabra, distancia, _ = sugerencias[0]
+        return palabra, distancia
+
+    def estadisticas(self):
+        info = self.corregir.cache_info()
+        return {
+            'palabras': len(self.frecuencias),
+            'borrados': len(self._borrados),
+            'aciertos_cache': info.hits,
+            'fallos_cache': info.misses,
+        }
+
+
+# ==============================================================================
+# SENTIMIENTO CON LÉXICO DIFUSO
+# ==============================================================================
+
+def analizar_sentimiento_difuso(texto, indice):
+    """
+    Como analizar_sentimiento, pero cada token se corrige con el índice
+    antes de compararlo con el léxico.
+    """
+    tokens = set()
+    for token in texto.lower().split():
+        correccion = indice.corregir(token)
+        if correccion is not None:
+            tokens.add(correccion[0])
+
+    positivas = len(tokens & PALABRAS_POSITIVAS)
+    negativas = len(tokens & PALABRAS_NEGATIVAS)
+
+    if positivas > negativas:
+        return 'POSITIVO', positivas - negativas
+    elif negativas > positivas:
+        return 'NEGATIVO', negativas - positivas
+    else:
+        return 'NEUTRAL', 0
+
+
+# ==============================================================================
+# EJEMPLO 1: RESEÑAS CON ERRATAS
+# ==============================================================================
+
+print("=" * 60)
+print("EJEMPLO 1: Léxico exacto vs léxico difuso")
+print("=" * 60)
+
+indice_lexico = IndiceSymSpell(distancia_max=2)
+indice_lexico.agregar_vocabulario(PALABRAS_POSITIVAS | PALABRAS_NEGATIVAS)
+
+for token in ('exelente', 'horible', 'increible', 'recomeindo', 'pesimo', 'feo', 'fea', 'mesa'):
+    print(f"  {token:>12} → {indice_lexico.corregir(token)}")
+
+reseñas = [
+    "producto exelente lo recomeindo",
+    "servicio horible y muy lentto",
+    "fue increible y genial",
+    "la mesa es de madera",
+]
+print()
+for reseña in reseñas:
+    exacto = analizar_sentimiento(reseña)
+    difuso = analizar_sentimiento_difuso(reseña, indice_lexico)
+    print(f"  '{reseña}'")
+    print(f"      exacto: {exacto}   difuso: {difuso}")
+
+
+# ==============================================================================
+# EJEMPLO 2: VOCABULARIO GRANDE, FUERZA BRUTA VS ÍNDICE
+# ==============================================================================
+
+print("\n" + "=" * 60)
+print("EJEMPLO 2: Corrección sobre un vocabulario de 30.000 palabras")
+print("=" * 60)
+
+rng = random.Random(42)
+letras = 'abcdefghijlmnopqrstuvz'
+silabas = [c + v for c in 'bcdfglmnprstv' for v in 'aeiou']
+vocabulario = list({''.join(rng.choices(silabas, k=rng.randint(2, 4))) for _ in range(30_000)})
+
+
+def con_errata(palabra):
+    """Aplica 1 o 2 ediciones aleatorias."""
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(palabra))
+        tipo = rng.randrange(3)
+        if tipo == 0:
+            palabra = palabra[:i] + palabra[i + 1:]
+        elif tipo == 1:
+            palabra = palabra[:i] + rng.choice(letras) + palabra[i:]
+        else:
+            palabra = palabra[:i] + rng.choice(letras) + palabra[i + 1:]
+    return palabra
+
+
+largas = [p for p in vocabulario if len(p) >= 6]
+acumulados = list(itertools.accumulate(1 / (i + 1) for i in range(len(largas))))
+# Cada palabra tiene su errata habitual; las palabras frecuentes se
+# equivocan más veces (Zipf), así que los tokens erróneos se repiten
+erratas = [con_errata(p) for p in largas]
+consultas = rng.choices(erratas, cum_weights=acumulados, k=20_000)
+
+inicio = time.perf_counter()
+indice = IndiceSymSpell(distancia_max=2)
+indice.agregar_vocabulario(vocabulario)
+tiempo_indice = time.perf_counter() - inicio
+est = indice.estadisticas()
+print(f"Índice: {est['palabras']:,} palabras, {est['borrados']:,} borrados "
+      f"({tiempo_indice:.2f} s)")
+
+muestra = list(dict.fromkeys(consultas))[:10]
+inicio = time.perf_counter()
+bruta = []
+for token in muestra:
+    d_max = indice.distancia_permitida(token)
+    distancias = [(distancia_edicion(token, p, d_max), p) for p in vocabulario]
+    d, p = min(distancias)
+    bruta.append(d if d <= d_max else None)
+tiempo_bruta = (time.perf_counter() - inicio) / len(muestra)
+
+coinciden = sum((c[1] if c else None) == d
+                for c, d in zip(map(indice.corregir, muestra), bruta))
+print(f"Fuerza bruta: {tiempo_bruta * 1e3:8.2f} ms/token "
+      f"(mismas distancias en {coinciden}/{len(muestra)})")
+
+indice.corregir.cache_clear()
+inicio = time.perf_counter()
+corregidas = [indice.corregir(t) for t in consultas]
+tiempo_indice = (time.perf_counter() - inicio) / len(consultas)
+est = indice.estadisticas()
+print(f"SymSpell:     {tiempo_indice * 1e3:8.3f} ms/token "
+      f"({tiempo_bruta / tiempo_indice:,.0f}x más rápido, "
+      f"{est['aciertos_cache'] / len(consultas):.0%} aciertos de caché, "
+      f"{est['fallos_cache']:,} tokens distintos)")
+print(f"Tokens corregidos: {sum(c is not None for c in corregidas) / len(consultas):.1%}")
+
+
+print("\n" + "=" * 60)
+print("PRÓXIMO: 15_benchmark_pipeline.py")
+print("=" * 60)
@@ -0,0 +1,452 @@
+"""
+================================================================================
+BENCHMARK DEL PIPELINE NLP CON UN CORPUS SINTÉTICO
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (limpiar_texto, tokenizar, bow, calcular_tfidf,
+  analizar_sentimiento)
+- 01-Fundamentos-Python/14_archivos.py (json)
+
+================================================================================
+¿POR QUÉ MEDIR?
+================================================================================
+
+"Esto es lento" no es un dato. Antes de optimizar (y después, para
+comprobar que no hemos empeorado nada) necesitamos NÚMEROS repetibles:
+
+- docs/s y tokens/s de cada etapa y del pipeline completo
+- PICO DE MEMORIA (RSS: memoria residente del proceso)
+- cómo ESCALA cada etapa al crecer el corpus (bow, por ejemplo, cuesta
+  O(documentos × vocabulario), no O(tokens))
+
+================================================================================
+CORPUS SINTÉTICO
+================================================================================
+
+No necesitamos datos reales para medir rendimiento, pero sí datos con la
+FORMA del texto real:
+
+- LEY DE ZIPF: la palabra de rango r aparece con probabilidad ∝ 1/r^s.
+  Las stopwords ocupan los primeros rangos, como en español real
+- Palabras "con pinta de español" construidas con sílabas
+- Mayúsculas y puntuación, para que limpiar_texto tenga trabajo
+- Palabras del léxico de sentimiento repartidas por el ranking
+- Semilla fija: el mismo corpus en cada ejecución
+
+================================================================================
+MEDICIÓN Y LÍNEA BASE
+================================================================================
+
+Cada (tamaño, etapa) se mide en un PROCESO NUEVO: así el pico de RSS de
+una etapa no arrastra la memoria de las anteriores. Cada etapa se repite
+varias veces (más cuanto más rápida es) y nos quedamos con el MEJOR
+tiempo (el menos afectado por otros procesos de la máquina).
+
+Los resultados se guardan en JSON como LÍNEA BASE. En ejecuciones
+posteriores se comparan y se marcan las REGRESIONES (más lento o más
+memoria que la base, por encima de una tolerancia).
+
+Uso:
+    python 15_benchmark_pipeline.py                     # solo medir
+    python 15_benchmark_pipeline.py base.json           # guardar (si no existe)
+                                                        # o comparar (si existe)
+
+================================================================================
+"""
+
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ==============================================================================
+# PIPELINE (de 01_introduccion_nlp.py)
+# ==============================================================================
+
+
+def limpiar_texto(texto):
+    """Minúsculas, sin caracteres especiales y sin espacios extra."""
+    texto = texto.lower()
+    texto = re.sub(r'[^a-záéíóúñü0-9\s]', '', texto)
+    return ' '.join(texto.split())
+
+
+def tokenizar(texto):
+    """Tokenización simple: dividir por espacios."""
+    return texto.split()
+
+
+def crear_vocabulario(documentos):
+    """Crea un vocabulario único de todos los documentos."""
+    vocabulario = set()
+    for doc in documentos:
+        tokens = doc.lower().split()
+        vocabulario.update(tokens)
+    return sorted(list(vocabulario))
+
+
+def bow(documento, vocabulario):
+    """Convierte un documento en vector Bag of Words."""
+    tokens = documento.lower().split()
+    conteo = Counter(tokens)
+    return [conteo.get(palabra, 0) for palabra in vocabulario]
+
+
+def calcular_tfidf(documentos):
+    """Calcula TF-IDF para una colección de documentos."""
+    docs_tokens = [doc.lower().split() for doc in documentos]
+    n_docs = len(documentos)
+
+    df = Counter()
+    for tokens in docs_tokens:
+        df.update(set(tokens))
+
+    idf = {palabra: math.log(n_docs / freq) for palabra, freq in df.items()}
+
+    tfidf_docs = []
+    for tokens in docs_tokens:
+        tf = Counter(tokens)
+        total_tokens = len(tokens)
+        tfidf_docs.append({palabra: (freq / total_tokens) * idf[palabra]
+                           for palabra, freq in tf.items()})
+
+    return tfidf_docs, idf
+
+
+PALABRAS_POSITIVAS = {
+    'bueno', 'excelente', 'genial', 'increíble', 'fantástico',
+    'amor', 'feliz', 'alegre', 'mejor', 'maravilloso', 'encanta',
+    'recomiendo', 'perfecto', 'útil', 'fácil'
+}
+
+PALABRAS_NEGATIVAS = {
+    'malo', 'terrible', 'horrible', 'pésimo', 'peor',
+    'odio', 'triste', 'difícil', 'problema', 'error',
+    'lento', 'caro', 'feo', 'aburrido', 'inútil'
+}
+
+
+def analizar_sentimiento(texto):
+    """Análisis de sentimiento basado en diccionario."""
+    texto = texto.lower()
+    tokens = set(texto.split())
+
+    positivas = len(tokens & PALABRAS_POSITIVAS)
+    negativas = len(tokens & PALABRAS_NEGATIVAS)
+
+    if positivas > negativas:
+        return 'POSITIVO', positivas - negativas
+    elif negativas > positivas:
+        return 'NEGATIVO', negativas - positivas
+    else:
+        return 'NEUTRAL', 0
+
+
+# ==============================================================================
+# GENERADOR DE CORPUS
+# ==============================================================================
+
+STOPWORDS_ES = [
+    'de', 'la', 'que', 'el', 'en', 'y', 'a', 'los', 'se', 'del',
+    'las', 'un', 'por', 'con', 'no', 'una', 'su', 'para', 'es', 'al',
+    'lo', 'como', 'más', 'pero', 'sus', 'le', 'ya', 'o', 'este', 'muy',
+]
+
+SILABAS = [c + v for c in ['', 'b', 'c', 'd', 'f', 'g', 'l', 'm', 'n', 'p',
+                           'r', 's', 't', 'v', 'ch', 'tr', 'pr', 'br']
+           for v in 'aeiou'] + ['ción', 'mente', 'dad', 'ña', 'ís', 'ón']
+
+PUNTUACION = ['.', ',', '!', '?', ';', '...']
+
+
+def generar_vocabulario(tam_vocabulario, semilla=42):
+    """
+    Palabras ordenadas por rango: stopwords, luego palabras sintéticas con
+    las del léxico de sentimiento intercaladas entre los rangos 50 y 2.000.
+    """
+    rng = random.Random(semilla)
+    lexico = sorted(PALABRAS_POSITIVAS | PALABRAS_NEGATIVAS)
+    usadas = set(STOPWORDS_ES) | set(lexico)
+    # Se calcula una vez: `usadas` crece con cada palabra nueva
+    n_sinteticas = tam_vocabulario - len(usadas)
+    sinteticas = []
+    while len(sinteticas) < n_sinteticas:
+        palabra = ''.join(rng.choices(SILABAS, k=rng.choice((2, 2, 3, 3, 3, 4))))
+        if palabra not in usadas:
+            usadas.add(palabra)
+            sinteticas.append(palabra)
+
+    vocabulario = STOPWORDS_ES + sinteticas
+    for palabra in lexico:
+        vocabulario.insert(rng.randint(50, min(2_000, len(vocabulario))), palabra)
+    return vocabulario
+
+
+def generar_corpus(n_docs, longitud_media=30, tam_vocabulario=5_000,
+                   exponente_zipf=1.0, semilla=42):
+    """
+    Genera reseñas sintéticas con vocabulario Zipf.
+
+    Args:
+        n_docs: Número de documentos
+        longitud_media: Palabras por documento (media; desviación = media/3)
+        tam_vocabulario: Palabras distintas posibles
+        exponente_zipf: s en P(rango r) ∝ 1/r^s (≈1 en lenguaje natural)
+        semilla: Misma semilla → mismo corpus
+
+    Returns:
+        list[str]: Documentos con mayúsculas y puntuación
+    """
+    rng = random.Random(semilla)
+    vocabulario = generar_vocabulario(tam_vocabulario, semilla)
+    acumulados = list(itertools.accumulate(
+        1 / (r + 1) ** exponente_zipf for r in range(len(vocabulario))))
+
+    documentos = []
+    for _ in range(n_docs):
+        n = max(1, round(rng.gauss(longitud_media, longitud_media / 3)))
+        palabras = rng.choices(vocabulario, cum_weights=acumulados, k=n)
+        palabras[0] = palabras[0].capitalize()
+        for i in range(4, n, rng.randint(5, 12)):
+            palabras[i] += rng.choice(PUNTUACION)
+        documentos.append(' '.join(palabras) + rng.choice(PUNTUACION))
+    return documentos
+
+
+# ==============================================================================
+# ETAPAS A MEDIR
+# ==============================================================================
+
+def _pipeline_completo(documentos, _limpios, _vocabulario):
+    """
+    Todas las etapas desde los documentos originales. Los limpios y el
+    vocabulario ya preparados no se usan: su coste es parte del pipeline.
+    """
+    limpios = [limpiar_texto(d) for d in documentos]
+    tokens = [tokenizar(d) for d in limpios]
+    vocabulario = crear_vocabulario(limpios)
+    vectores = [bow(d, vocabulario) for d in limpios]
+    tfidf = calcular_tfidf(limpios)
+    sentimientos = [analizar_sentimiento(d) for d in limpios]
+    return tokens, vectores, tfidf, sentimientos
+
+
+# Cada etapa recibe (documentos originales, documentos limpios, vocabulario):
+# lo que no se quiere medir en la etapa se prepara antes
+ETAPAS = {
+    'limpiar_texto': lambda docs, limpios, voc: [limpiar_texto(d) for d in docs],
+    'tokenizar': lambda docs, limpios, voc: [tokenizar(d) for d in limpios],
+    'bow': lambda docs, limpios, voc: [bow(d, voc) for d in limpios],
+    'calcular_tfidf': lambda docs, limpios, voc: calcular_tfidf(limpios),
+    'analizar_sentimiento': lambda docs, limpios, voc: [analizar_sentimiento(d) for d in limpios],
+    'pipeline': _pipeline_completo,
+}
+
+
+TIEMPO_MINIMO_S = 0.5
+
+
+def pico_rss_mb():
+    """Pico de memoria residente del proceso actual (MB), o None."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KB; macOS en bytes
+    return pico / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _medir_etapa(etapa, n_docs, parametros_corpus, repeticiones):
+    """Se ejecuta en un proceso nuevo: genera el corpus y mide una etapa."""
+    documentos = generar_corpus(n_docs, **parametros_corpus)
+    limpios = [limpiar_texto(d) for d in documentos]
+    n_tokens = sum(len(d.split()) for d in limpios)
+    vocabulario = crear_vocabulario(limpios) if etapa == 'bow' else None
+    rss_corpus = pico_rss_mb()
+
+    # Al menos `repeticiones` y al menos TIEMPO_MINIMO_S en total: las
+    # etapas que tardan milisegundos necesitan más muestras para ser estables
+    tiempos = []
+    while len(tiempos) < repeticiones or \
+            (sum(tiempos) < TIEMPO_MINIMO_S and len(tiempos) < 100):
+        inicio = time.perf_counter()
+        resultado = ETAPAS[etapa](documentos, limpios, vocabulario)
+        tiempos.append(time.perf_counter() - inicio)
+        del resultado
+
+    segundos = min(tiempos)
+    rss = pico_rss_mb()
+    return {
+        'segundos': segundos,
+        'docs_s': n_docs / segundos,
+        'tokens_s': n_tokens / segundos,
+        'tokens': n_tokens,
+        'rss_mb': rss,
+        'rss_etapa_mb': None if rss is None else rss - rss_corpus,
+    }
+
+
+def ejecutar_benchmark(tamanos=(500, 2_000, 8_000), etapas=None, repeticiones=3,
+                       **parametros_corpus):
+    """
+    Mide cada etapa para cada tamaño de corpus.
+
+    Args:
+        tamanos: Números de documentos a probar
+        etapas: Nombres de ETAPAS (por defecto, todas)
+        repeticiones: Se guarda el mejor tiempo de estas repeticiones
+        **parametros_corpus: Se pasan a generar_corpus
+
+    Returns:
+        dict: {'meta': {...}, 'resultados': {n_docs: {etapa: métricas}}}
+    """
+    etapas = list(etapas or ETAPAS)
+    contexto = multiprocessing.get_context('spawn')
+    resultados = {}
+    for n_docs in tamanos:
+        resultados[str(n_docs)] = {}
+        for etapa in etapas:
+            # Un proceso por medición: RSS aislado, sin cachés calientes
+            with contexto.Pool(1) as pool:
+                metricas = pool.apply(_medir_etapa,
+                                      (etapa, n_docs, parametros_corpus, repeticiones))
+            resultados[str(n_docs)][etapa] = metricas
+            rss = '' if metricas['rss_mb'] is None else \
+                f"{metricas['rss_mb']:8.1f} MB (etapa {metricas['rss_etapa_mb']:+6.1f} MB)"
+            print(f"  {n_docs:>7,} docs  {etapa:<22} {metricas['docs_s']:>11,.0f} docs/s "
+                  f"{metricas['tokens_s']:>13,.0f} tokens/s  {rss}")
+
+    return {
+        'meta': {
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'procesador': platform.processor() or platform.machine(),
+            'repeticiones': repeticiones,
+            'corpus': parametros_corpus,
+        },
+        'resultados': resultados,
+    }
+
+
+# ==============================================================================
+# LÍNEA BASE Y REGRESIONES
+# ==============================================================================
+
+def guardar_linea_base(benchmark, ruta):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(benchmark, f, indent=2, ensure_ascii=False)
+
+
+def cargar_linea_base(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def comparar(actual, base, tolerancia=0.15):
+    """
+    Compara dos benchmarks etapa a etapa.
+
+    Una etapa es REGRESIÓN si su velocidad (docs/s) cae más de `tolerancia`
+    o su pico de RSS sube más de `tolerancia` respecto a la base. En
+    máquinas compartidas (CI, contenedores) el ruido de tiempos puede
+    superar el 15%: conviene subir la tolerancia o repetir la medición.
+
+    Returns:
+        list: [(n_docs, etapa, cambio_velocidad, cambio_rss, es_regresion)]
+    """
+    if actual['meta']['corpus'] != base['meta']['corpus']:
+        print("  AVISO: los parámetros del corpus no coinciden con la base")
+
+    filas = []
+    for n_docs, etapas in actual['resultados'].items():
+        for etapa, metricas in etapas.items():
+            referencia = base['resultados'].get(n_docs, {}).get(etapa)
+            if referencia is None:
+                continue
+            cambio_velocidad = metricas['docs_s'] / referencia['docs_s'] - 1
+            cambio_rss = None
+            if metricas['rss_mb'] and referencia['rss_mb']:
+                cambio_rss = metricas['rss_mb'] / referencia['rss_mb'] - 1
+            regresion = (cambio_velocidad < -tolerancia or
+                         (cambio_rss is not None and cambio_rss > tolerancia))
+            filas.append((n_docs, etapa, cambio_velocidad, cambio_rss, regresion))
+    return filas
+
+
+# ==============================================================================
+# EJEMPLOS
+# ==============================================================================
+
+# Los ejemplos van bajo __main__: las mediciones arrancan procesos con
+# "spawn", que vuelven a importar este archivo.
+if __name__ == "__main__":
+
+    print("=" * 60)
+    print("EJEMPLO 1: Corpus sintético")
+    print("=" * 60)
+
+    vocabulario = generar_vocabulario(5_000)
+    assert len(vocabulario) == len(set(vocabulario)) == 5_000
+    muestra = generar_corpus(2_000)
+    frecuencias = Counter(t for d in muestra for t in tokenizar(limpiar_texto(d)))
+    total = sum(frecuencias.values())
+    print(f"Documento de ejemplo:\n  {muestra[0][:150]}...")
+    print(f"\n2.000 docs: {total:,} tokens, {len(frecuencias):,} palabras distintas "
+          f"de {len(vocabulario):,} posibles")
+    print("Rango × frecuencia (≈ constante si sigue la ley de Zipf):")
+    for rango, (palabra, freq) in enumerate(frecuencias.most_common(), 1):
+        if rango in (1, 2, 5, 10, 50, 100, 500):
+            print(f"  rango {rango:>4} {palabra:>12}: {freq:>6} × {rango} = {freq * rango:,}")
+    sentimientos = Counter(analizar_sentimiento(d)[0] for d in muestra)
+    print(f"Sentimiento: {dict(sentimientos)}")
+
+    print("\n" + "=" * 60)
+    print("EJEMPLO 2: Benchmark por etapa y tamaño")
+    print("=" * 60)
+
+    benchmark = ejecutar_benchmark(tamanos=(500, 2_000, 8_000), repeticiones=3)
+
+    print("\nEscalado (docs/s con 8.000 docs / docs/s con 500 docs):")
+    for etapa in ETAPAS:
+        pequeno = benchmark['resultados']['500'][etapa]['docs_s']
+        grande = benchmark['resultados']['8000'][etapa]['docs_s']
+        print(f"  {etapa:<22} {grande / pequeno:5.2f}")
+
+    if len(sys.argv) > 1:
+        ruta = sys.argv[1]
+        print("\n" + "=" * 60)
+        print("EJEMPLO 3: Línea base")
+        print("=" * 60)
+
+        if not os.path.exists(ruta):
+            guardar_linea_base(benchmark, ruta)
+            print(f"Línea base guardada en {ruta}")
+        else:
+            base = cargar_linea_base(ruta)
+            print(f"Comparando con la línea base del {base['meta']['fecha']}:")
+            filas = comparar(benchmark, base)
+            for n_docs, etapa, velocidad, rss, regresion in filas:
+                rss = '' if rss is None else f"RSS {rss:+6.1%}"
+                marca = '  ← REGRESIÓN' if regresion else ''
+                print(f"  {int(n_docs):>7,} docs  {etapa:<22} velocidad {velocidad:+6.1%}  "
+                      f"{rss}{marca}")
+            n_regresiones = sum(f[4] for f in filas)
+            print(f"\n{n_regresiones} regresiones de {len(filas)} mediciones")
+
+    print("\n" + "=" * 60)
+    print("PRÓXIMO: 16_tokens_offsets.py")
+    print("=" * 60)
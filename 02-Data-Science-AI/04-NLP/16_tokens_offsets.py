@@ -0,0 +1,313 @@
+"""
+================================================================================
+TOKENS COMO OFFSETS: (inicio, fin) SIN COPIAR SUBCADENAS
+================================================================================
+
+PREREQUISITOS:
+- 01_introduccion_nlp.py (limpiar_texto, tokenizar)
+- 02-Data-Science-AI/01-Analisis-Datos (NumPy)
+
+================================================================================
+EL PROBLEMA
+================================================================================
+
+    tokenizar("el gato come pescado") → ['el', 'gato', 'come', 'pescado']
+
+1. Cada token es un objeto str NUEVO: ~50 bytes de cabecera + el texto.
+   1 millón de tokens ≈ 55 MB solo en objetos str, más la lista
+2. Se PIERDE la posición: para resaltar "gato" en el texto o extraer una
+   entidad hay que volver a buscarla (y si aparece dos veces, ¿cuál era?)
+
+================================================================================
+LA SOLUCIÓN: SPANS
+================================================================================
+
+En vez de copiar cada token guardamos DÓNDE está:
+
+    texto:    e l   g a t o   c o m e   p e s c a d o
+    índice:   0 1 2 3 4 5 6 7 8 9 ...
+    inicios:  [0, 3, 8, 13]      (int32)
+    fines:    [2, 7, 12, 20]     (int32, exclusivo: texto[inicio:fin])
+
+- 8 bytes por token, sin importar su longitud
+- El str del token solo se crea si se pide (texto[inicio:fin])
+- Resaltar = cortar el texto original por esos offsets
+
+Calculamos los spans SIN bucles de Python: convertimos el texto a un
+array de puntos de código (una sola copia, 4 bytes por carácter) y
+buscamos dónde cambia "espacio / no espacio" con NumPy.
+
+Además, limpiar_con_mapa devuelve para cada carácter del texto limpio su
+posición en el texto ORIGINAL: así un token encontrado en el texto limpio
+se puede resaltar en el texto que escribió el usuario.
+
+INSTALACIÓN:
+    pip install numpy
+
+================================================================================
+"""
+
+import re
+import sys
+import time
+
+import numpy as np
+
+# ==============================================================================
+# PREPROCESAMIENTO (de 01_introduccion_nlp.py)
+# ==============================================================================
+
+
+def limpiar_texto(texto):
+    """Minúsculas, sin caracteres especiales y sin espacios extra."""
+    texto = texto.lower()
+    texto = re.sub(r'[^a-záéíóúñü0-9\s]', '', texto)
+    return ' '.join(texto.split())
+
+
+def tokenizar(texto):
+    """Tokenización simple: dividir por espacios."""
+    return texto.split()
+
+
+# ==============================================================================
+# TEXTO ↔ PUNTOS DE CÓDIGO
+# ==============================================================================
+
+# Tablas de consulta por punto de código (todos los espacios Unicode son
+# < 0x3001). ES_ESPACIO: los mismos caracteres que str.split() y \s
+_TAM_TABLA = 0x3001
+ES_ESPACIO = np.array([chr(c).isspace() for c in range(_TAM_TABLA)])
+ES_PERMITIDO = np.zeros(_TAM_TABLA, dtype=bool)
+ES_PERMITIDO[[ord(c) for c in 'abcdefghijklmnopqrstuvwxyzáéíóúñü0123456789']] = True
+
+
+def _consultar(tabla, puntos):
+    """tabla[punto] para cada punto; False fuera de la tabla."""
+    return tabla[np.minimum(puntos, _TAM_TABLA - 1)] & (puntos < _TAM_TABLA)
+
+
+def puntos_de_codigo(texto):
+    """Array uint32 con un elemento por carácter (índices = índices del str)."""
+    return np.frombuffer(texto.encode('utf-32-le'), dtype=np.uint32)
+
+
+def desde_puntos_de_codigo(puntos):
+    return puntos.astype(np.uint32, copy=False).tobytes().decode('utf-32-le')
+
+
+# ==============================================================================
+# TOKENIZACIÓN POR OFFSETS
+# ==============================================================================
+
+def tokenizar_offsets(texto):
+    """
+    Equivalente a tokenizar() pero devuelve posiciones, no subcadenas.
+
+    Returns:
+        tuple: (inicios, fines) int32 con texto[inicios[i]:fines[i]] == token i
+    """
+    if len(texto) >= 2 ** 31:
+        raise ValueError("Texto demasiado largo para offsets int32")
+    es_token = np.zeros(len(texto) + 2, dtype=bool)
+    es_token[1:-1] = ~_consultar(ES_ESPACIO, puntos_de_codigo(texto))
+    # Bordes: posiciones donde cambia espacio ↔ token; alternan inicio, fin
+    bordes = np.flatnonzero(es_token[1:] != es_token[:-1]).astype(np.int32)
+    return bordes[0::2], bordes[1::2]
+
+
+class TextoTokenizado:
+    """
+    Texto + spans de sus tokens. Los str de los tokens se crean bajo demanda.
+
+    Uso:
+        tt = TextoTokenizado.desde_texto("el gato come pescado")
+        len(tt)                → 4
+        tt[1]                  → 'gato'
+        tt.span(1)             → (3, 7)
+        tt.buscar('gato')      → array([1])
+        tt.resaltar([1])       → 'el [gato] come pescado'
+    """
+
+    def __init__(self, texto, inicios, fines):
+        self.texto = texto
+        self.inicios = inicios
+        self.fines = fines
+        self._puntos = None     # puntos de código, solo si se usa buscar()
+
+    @classmethod
+    def desde_texto(cls, texto):
+        return cls(texto, *tokenizar_offsets(texto))
+
+    def __len__(self):
+        return len(self.inicios)
+
+    def __getitem__(self, i):
+        return self.texto[self.inicios[i]:self.fines[i]]
+
+    def __iter__(self):
+        texto = self.texto
+        for inicio, fin in zip(self.inicios.tolist(), self.fines.tolist()):
+            yield texto[inicio:fin]
+
+    def span(self, i):
+        return int(self.inicios[i]), int(self.fines[i])
+
+    def tokens(self):
+        """Lista de str, igual que tokenizar() (materializa todos)."""
+        return list(self)
+
+    @property
+    def longitudes(self):
+        return self.fines - self.inicios
+
+    def buscar(self, palabra):
+        """
+        Índices de los tokens iguales a `palabra`, sin crear sus str:
+        filtramos por longitud y comparamos puntos de código en bloque.
+        """
+        objetivo = puntos_de_codigo(palabra)
+        candidatos = np.flatnonzero(self.longitudes == len(objetivo))
+        if len(candidatos) == 0 or len(objetivo) == 0:
+            return candidatos[:0]
+        if self._puntos is None:
+            self._puntos = puntos_de_codigo(self.texto)
+        puntos = self._puntos
+        posiciones = self.inicios[candidatos][:, None] + np.arange(len(objetivo))
+        iguales = (puntos[posiciones] == objetivo).all(axis=1)
+        return candidatos[iguales]
+
+    def resaltar(self, indices, apertura='[', cierre=']', spans=None, texto=None):
+        """
+        Envuelve los tokens indicados con apertura/cierre.
+
+        Args:
+            indices: Tokens a resaltar
+            spans: (inicios, fines) alternativos, p. ej. en el texto original
+            texto: Texto sobre el que se aplican esos spans
+        """
+        inicios, fines = spans if spans is not None else (self.inicios, self.fines)
+        texto = self.texto if texto is None else texto
+        partes = []
+        anterior = 0
+        for i in sorted(indices):
+            inicio, fin = int(inicios[i]), int(fines[i])
+            partes.extend((texto[anterior:inicio], apertura, texto[inicio:fin], cierre))
+            anterior = fin
+        partes.append(texto[anterior:])
+        return ''.join(partes)
+
+
+# ==============================================================================
+# LIMPIEZA CON MAPA AL TEXTO ORIGINAL
+# ==============================================================================
+
+def limpiar_con_mapa(texto):
+    """
+    Igual que limpiar_texto, y además devuelve de dónde viene cada carácter.
+
+    Returns:
+        tuple: (limpio, mapa) con mapa[i] = posición en `texto` del
+               carácter i de `limpio` (int32)
+    """
+    minusculas = texto.lower()
+    if len(minusculas) == len(texto):
+        puntos = puntos_de_codigo(minusculas)
+        origen = np.arange(len(texto), dtype=np.int32)
+    else:
+        # Algún carácter cambia de longitud al pasar a minúsculas ('İ' → 'i̇'):
+        # lo hacemos carácter a carácter
+        trozos = [c.lower() for c in texto]
+        puntos = puntos_de_codigo(''.join(trozos))
+        origen = np.repeat(np.arange(len(texto), dtype=np.int32), [len(t) for t in trozos])
+
+    es_espacio = _consultar(ES_ESPACIO, puntos)
+    conservar = _consultar(ES_PERMITIDO, puntos) | es_espacio
+    puntos, origen, es_espacio = puntos[conservar], origen[conservar], es_espacio[conservar]
+
+    # Un espacio sobrevive si le precede una letra y detrás queda alguna letra
+    # (equivale a ' '.join(texto.split()))
+    letras_antes = np.cumsum(~es_espacio)
+    hay_letra_antes = np.concatenate(([False], ~es_espacio[:-1]))
+    hay_letra_despues = letras_antes < letras_antes[-1] if len(puntos) else es_espacio
+    conservar = ~es_espacio | (hay_letra_antes & hay_letra_despues)
+
+    puntos = np.where(es_espacio, ord(' '), puntos)[conservar]
+    return desde_puntos_de_codigo(puntos), origen[conservar]
+
+
+def spans_originales(inicios, fines, mapa):
+    """Traduce spans del texto limpio a spans del texto original."""
+    if len(inicios) == 0:
+        return inicios, fines
+    return mapa[inicios], mapa[fines - 1] + 1
+
+
+# ==============================================================================
+# EJEMPLO 1: SPANS Y RESALTADO
+# ==============================================================================
+
+print("=" * 60)
+print("EJEMPLO 1: Tokens como (inicio, fin)")
+print("=" * 60)
+
+original = "¡El GATO come pescado!   Y el perro... ¿también come   pescado?"
+limpio, mapa = limpiar_con_mapa(original)
+assert limpio == limpiar_texto(original)
+
+tt = TextoTokenizado.desde_texto(limpio)
+assert tt.tokens() == tokenizar(limpio)
+
+print(f"Original: {original!r}")
+print(f"Limpio:   {limpio!r}")
+print(f"inicios:  {tt.inicios}")
+print(f"fines:    {tt.fines}")
+print(f"tt[1] = {tt[1]!r}, span {tt.span(1)}")
+
+encontrados = tt.buscar('pescado')
+print(f"\nbuscar('pescado') → tokens {encontrados.tolist()}")
+print(f"En el texto limpio:    {tt.resaltar(encontrados)}")
+spans = spans_originales(tt.inicios, tt.fines, mapa)
+print(f"En el texto original:  {tt.resaltar(tt.buscar('gato'), spans=spans, texto=original)}")
+
+
+# ==============================================================================
+# EJEMPLO 2: MEMORIA Y VELOCIDAD
+# ==============================================================================
+
+print("\n" + "=" * 60)
+print("EJEMPLO 2: tokenizar() vs tokenizar_offsets() en 2 millones de tokens")
+print("=" * 60)
+
+rng = np.random.default_rng(42)
+palabras = np.array(['producto', 'excelente', 'envío', 'rápido', 'el', 'la', 'muy',
+                     'bueno', 'calidad', 'precio', 'recomiendo', 'caja', 'dañada'])
+texto_grande = ' '.join(rng.choice(palabras, size=2_000_000).tolist())
+
+inicio = time.perf_counter()
+lista = tokenizar(texto_grande)
+t_lista = time.perf_counter() - inicio
+bytes_lista = sys.getsizeof(lista) + sum(map(sys.getsizeof, lista))
+
+inicio = time.perf_counter()
+tt_grande = TextoTokenizado.desde_texto(texto_grande)
+t_offsets = time.perf_counter() - inicio
+bytes_offsets = tt_grande.inicios.nbytes + tt_grande.fines.nbytes
+
+print(f"tokenizar():         {t_lista:6.3f} s, {bytes_lista / 1e6:7.1f} MB (lista + str)")
+print(f"tokenizar_offsets(): {t_offsets:6.3f} s, {bytes_offsets / 1e6:7.1f} MB (2 × int32)")
+del lista
+
+inicio = time.perf_counter()
+n_buscar = len(tt_grande.buscar('recomiendo'))
+t_buscar = time.perf_counter() - inicio
+print(f"\nbuscar('recomiendo'): {n_buscar:,} apariciones en {t_buscar * 1e3:.1f} ms "
+      f"sin crear ningún str")
+
+print(f"Longitud media de token: {tt_grande.longitudes.mean():.2f} caracteres "
+      f"(sin materializar tokens)")
+
+
+print("\n" + "=" * 60)
+print("PRÓXIMO: ../03-Deep-Learning/07_red_neuronal_numpy.py")
+print("=" * 60)